@@ -1,11 +1,11 @@
 import { useEffect, useRef } from "react";
 
-export default function LiveTranslationCard({ chunks = [] }) {
+export default function LiveTranslationCard({ chunks = [], partial = "" }) {
   const bottomRef = useRef(null);
 
   useEffect(() => {
     bottomRef.current?.scrollIntoView({ behavior: "smooth" });
-  }, [chunks]);
+  }, [chunks, partial]);
 
   return (
     <div className="relative h-[60vh]">
@@ -54,6 +54,19 @@ export default function LiveTranslationCard({ chunks = [] }) {
             </div>
           ))}
 
+          {partial && (
+            <div className="rounded-2xl border border-dashed border-neutral-800 bg-neutral-900/50 px-3 py-3">
+              <div className="ml-3 space-y-1.5">
+                <div className="text-[11px] text-neutral-500 uppercase tracking-wide">
+                  Listening…
+                </div>
+                <div className="text-sm text-neutral-400 italic leading-snug">
+                  {partial}
+                </div>
+              </div>
+            </div>
+          )}
+
           <div ref={bottomRef} />
         </div>
       </div>
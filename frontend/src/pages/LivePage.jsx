@@ -4,17 +4,24 @@ import ParticipantsCard from "../components/ParticipantsCard.jsx";
 import LiveTranslationCard from "../components/LiveTranslationCard.jsx";
 import ChatbotCard from "../components/ChatbotCard.jsx";
 
+// nombre max de segments gardés en mémoire dans la vue live
+const MAX_CHUNKS = 200;
+
 export default function LivePage() {
   const [live, setLive] = useState({
     status: "stopped",
     meet_link: null,
     participants: [],
     recent_chunks: [],
+    partial: "",
+    summary: "",
   });
 
-  // Polling de l'état live
+  // Flux live (SSE) : seules les nouveautés arrivent, reprise automatique
+  // après coupure via Last-Event-ID. Polling en secours si le flux est indisponible.
   useEffect(() => {
     let cancelled = false;
+    let pollId = null;
 
     async function fetchState() {
       try {
@@ -28,11 +35,56 @@ export default function LivePage() {
       }
     }
 
-    fetchState();
-    const id = setInterval(fetchState, 1500);
+    function startPolling() {
+      if (pollId) return;
+      fetchState();
+      pollId = setInterval(fetchState, 1500);
+    }
+
+    if (typeof EventSource === "undefined") {
+      startPolling();
+      return () => {
+        cancelled = true;
+        clearInterval(pollId);
+      };
+    }
+
+    const source = new EventSource("/api/live/stream");
+    const data = (e) => JSON.parse(e.data);
+
+    source.addEventListener("state", (e) => {
+      const s = data(e);
+      setLive(prev => ({ ...prev, ...s }));
+    });
+    source.addEventListener("chunk", (e) => {
+      const c = data(e);
+      setLive(prev => ({
+        ...prev,
+        recent_chunks: [...prev.recent_chunks, c].slice(-MAX_CHUNKS),
+      }));
+    });
+    source.addEventListener("partial", (e) => {
+      const { text } = data(e);
+      setLive(prev => ({ ...prev, partial: text }));
+    });
+    source.addEventListener("summary", (e) => {
+      const { summary } = data(e);
+      setLive(prev => ({ ...prev, summary }));
+    });
+    source.addEventListener("reset", () => {
+      setLive(prev => ({ ...prev, recent_chunks: [], partial: "", summary: "" }));
+    });
+    source.onerror = () => {
+      // le navigateur se reconnecte tout seul ; si le flux est fermé pour de bon, on poll
+      if (source.readyState === EventSource.CLOSED) {
+        startPolling();
+      }
+    };
+
     return () => {
       cancelled = true;
-      clearInterval(id);
+      source.close();
+      clearInterval(pollId);
     };
   }, []);
 
@@ -134,7 +186,7 @@ export default function LivePage() {
 
         {/* MIDDLE COLUMN : transcription / traduction */}
         <div className="flex flex-col gap-4">
-          <LiveTranslationCard chunks={live.recent_chunks} />
+          <LiveTranslationCard chunks={live.recent_chunks} partial={live.partial} />
         </div>
 
         {/* RIGHT COLUMN : chatbot */}
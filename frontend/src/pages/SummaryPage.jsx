@@ -5,9 +5,22 @@ export default function SummaryPage() {
 
   async function loadReport() {
     try {
-      const res = await fetch("/api/meeting/export");
+      // résumé d'abord (affiché tout de suite), puis le transcript par pages
+      const res = await fetch("/api/meeting/export/summary");
       const json = await res.json();
-      setReport(json);
+      setReport({ ...json, raw_transcript: [] });
+
+      let cursor = null;
+      do {
+        const params = new URLSearchParams({ limit: "500" });
+        if (cursor) params.set("cursor", cursor);
+        const page = await (await fetch(`/api/meeting/export?${params}`)).json();
+        setReport((prev) => ({
+          ...prev,
+          raw_transcript: [...(prev?.raw_transcript || []), ...page.chunks],
+        }));
+        cursor = page.next_cursor;
+      } while (cursor);
     } catch (e) {
       console.error(e);
     }
@@ -1,22 +1,119 @@
-import sounddevice as sd
+import bisect
+import threading
+import time
+
 import soundfile as sf
 import numpy as np
-from faster_whisper import WhisperModel
+import faster_whisper
+from faster_whisper import WhisperModel, decode_audio
 from typing import Optional
 
+from config import (
+    WHISPER_MODEL,
+    WHISPER_COMPUTE_TYPE,
+    WHISPER_BEAM_SIZE,
+    ASR_CPU_THREADS,
+    ASR_NUM_WORKERS,
+    ASR_WORD_TIMESTAMPS,
+)
+
+try:
+    # faster-whisper >= 1.1
+    from faster_whisper import BatchedInferencePipeline
+except ImportError:
+    BatchedInferencePipeline = None
+
 _MODEL: Optional[WhisperModel] = None
+_BATCHED = None
+# the ASR stage runs several worker threads: only one of them may load the model
+_MODEL_LOCK = threading.Lock()
+
+SAMPLE_RATE = 16000
+MAX_CLIP_SECONDS = 30.0   # Whisper decodes at most 30 s per window
+BATCH_GAP_SECONDS = 0.5   # silence inserted between segments of a batch
+
+# BatchedInferencePipeline clip_timestamps: sample indices up to faster-whisper 1.1
+# (sliced as audio[start:end]), seconds from 1.2 on (converted to samples internally)
+_CLIPS_IN_SECONDS = tuple(int(v) for v in faster_whisper.__version__.split(".")[:2]) >= (1, 2)
+
+
+def _clip(start: float, end: float) -> dict:
+    """clip_timestamps entry for [start, end) seconds of the batch audio."""
+    if _CLIPS_IN_SECONDS:
+        return {"start": start, "end": end}
+    return {"start": int(start * SAMPLE_RATE), "end": int(end * SAMPLE_RATE)}
 
 
 def get_model():
-    """Load and cache the Whisper model (base version)."""
+    """Load and cache the Whisper model (WHISPER_MODEL / WHISPER_COMPUTE_TYPE)."""
     global _MODEL
     if _MODEL is None:
-        _MODEL = WhisperModel("base", compute_type="auto")
+        with _MODEL_LOCK:
+            if _MODEL is None:
+                _MODEL = _load_model(ASR_CPU_THREADS, ASR_NUM_WORKERS)
     return _MODEL
 
 
+def get_batched_model():
+    """Batched pipeline over the cached model (None if faster-whisper is too old)."""
+    global _BATCHED
+    if BatchedInferencePipeline is None:
+        return None
+    model = get_model()
+    batched = _BATCHED
+    if batched is None or batched.model is not model:
+        with _MODEL_LOCK:
+            if _BATCHED is None or _BATCHED.model is not model:
+                _BATCHED = BatchedInferencePipeline(model=model)
+            batched = _BATCHED
+    return batched
+
+
+def init_model(cpu_threads: int = 0, num_workers: int = 1):
+    """
+    Load the model of this process with explicit CTranslate2 threading
+    (used by the ASR worker processes, see asr_pool.py).
+
+    cpu_threads: intra-op threads per model (0 = CTranslate2 default)
+    num_workers: concurrent transcriptions the model instance accepts
+    """
+    global _MODEL
+    with _MODEL_LOCK:
+        _MODEL = _load_model(cpu_threads, num_workers)
+        return _MODEL
+
+
+def _load_model(cpu_threads: int, num_workers: int) -> WhisperModel:
+    return WhisperModel(
+        WHISPER_MODEL,
+        compute_type=WHISPER_COMPUTE_TYPE,
+        cpu_threads=cpu_threads,
+        num_workers=num_workers,
+    )
+
+
+def warmup() -> float:
+    """
+    Load the model and run one dummy inference (1 s of silence) so the first real
+    chunk does not pay the download / load / first-call latency.
+    Returns the time spent, in seconds.
+    """
+    started = time.monotonic()
+    model = get_model()
+    segments, info = model.transcribe(
+        np.zeros(SAMPLE_RATE, dtype=np.float32),
+        language="en",
+        beam_size=WHISPER_BEAM_SIZE,
+        vad_filter=False,
+    )
+    list(segments)  # transcribe() is lazy: decoding happens while iterating
+    return time.monotonic() - started
+
+
 def pick_input_device(preferred_index: int | None = None) -> int:
     """Pick the input microphone device automatically or by index."""
+    import sounddevice as sd  # only needed to record (not in the ASR worker processes)
+
     devices = sd.query_devices()
     if preferred_index is not None:
         return preferred_index
@@ -33,6 +130,8 @@ def pick_input_device(preferred_index: int | None = None) -> int:
 
 def record_to_wav(path: str, seconds: int = 10, fs: int | None = None, device_index: int | None = None):
     """Record audio from the microphone and save to a WAV file."""
+    import sounddevice as sd
+
     dev = pick_input_device(device_index)
     dev_info = sd.query_devices(dev)
 
@@ -59,43 +158,127 @@ def transcribe_file(path: str, language: str = None, vad_filter: bool = False) -
     more words (safer if you notice missing text).
     """
     model = get_model()
-    segments, info = model.transcribe(path, language=language, vad_filter=vad_filter)
+    segments, info = model.transcribe(path, language=language, vad_filter=vad_filter,
+                                      beam_size=WHISPER_BEAM_SIZE)
     text = " ".join(seg.text.strip() for seg in segments)
     return text.strip()
 
 
-def transcribe_with_confidence(path: str, language: str = None, vad_filter: bool = False):
+def _segment_dump(seg, offset: float = 0.0) -> dict:
+    """
+    Plain-dict view of a faster-whisper segment (picklable, sent back by the ASR pool).
+    Times are shifted by -offset. "words" is only present with word_timestamps=True.
     """
+    # Some faster-whisper versions expose these fields:
+    # seg.no_speech_prob, seg.avg_logprob, seg.compression_ratio
+    dump = {
+        "start": max(0.0, seg.start - offset),
+        "end": max(0.0, seg.end - offset),
+        "text": seg.text.strip(),
+        "no_speech_prob": getattr(seg, "no_speech_prob", None),
+        "avg_logprob": getattr(seg, "avg_logprob", None),
+    }
+    words = getattr(seg, "words", None)
+    if words:
+        dump["words"] = [
+            {"start": max(0.0, w.start - offset), "end": max(0.0, w.end - offset),
+             "word": w.word, "probability": w.probability}
+            for w in words
+        ]
+    return dump
+
+
+def transcribe_with_confidence(path, language: str = None, vad_filter: bool = False, **options):
+    """
+    `path` is either a WAV file path or a 16 kHz mono float32 numpy array
+    (memory capture mode of AlternatingRecorder).
+    Extra `options` (beam_size, initial_prompt, word_timestamps, ...) are passed to model.transcribe.
+
     Returns:
     - text: the full concatenated transcription
     - avg_no_speech_prob: estimated probability that it was not speech
     - segments_info: raw list of segments if you want to log or analyze them
     """
+    options.setdefault("beam_size", WHISPER_BEAM_SIZE)
+    options.setdefault("word_timestamps", ASR_WORD_TIMESTAMPS)
     model = get_model()
-    segments, info = model.transcribe(path, language=language, vad_filter=vad_filter)
+    segments, info = model.transcribe(path, language=language, vad_filter=vad_filter, **options)
 
     texts = []
     no_speech_scores = []
     seg_dump = []
 
     for seg in segments:
-        seg_text = seg.text.strip()
-        texts.append(seg_text)
-
-        # Some faster-whisper versions expose these fields:
-        # seg.no_speech_prob, seg.avg_logprob, seg.compression_ratio
-        ns = getattr(seg, "no_speech_prob", None)
-        if ns is not None:
-            no_speech_scores.append(ns)
-
-        seg_dump.append({
-            "start": seg.start,
-            "end": seg.end,
-            "text": seg_text,
-            "no_speech_prob": ns
-        })
+        dump = _segment_dump(seg)
+        texts.append(dump["text"])
+        if dump["no_speech_prob"] is not None:
+            no_speech_scores.append(dump["no_speech_prob"])
+        seg_dump.append(dump)
 
     full_text = " ".join(t for t in texts).strip()
     avg_no_speech = sum(no_speech_scores) / len(no_speech_scores) if no_speech_scores else 0.0
 
     return full_text, avg_no_speech, seg_dump
+
+
+def _summarize_segments(segments):
+    """seg_dump list -> (text, avg_no_speech_prob, seg_dump), same shape as transcribe_with_confidence."""
+    texts = [s["text"] for s in segments if s["text"]]
+    scores = [s["no_speech_prob"] for s in segments if s["no_speech_prob"] is not None]
+    full_text = " ".join(texts).strip()
+    avg_no_speech = sum(scores) / len(scores) if scores else 0.0
+    return full_text, avg_no_speech, segments
+
+
+def transcribe_batch(audios: list, language: str = None, batch_size: int = 8, **options):
+    """
+    Transcribe several pending segments in one batched pass (backlog catch-up,
+    re-processing a recorded meeting).
+
+    `audios` are WAV paths or 16 kHz mono float32 arrays. They are laid end to end
+    (separated by a short silence) and every segment becomes one or more <= 30 s clips
+    decoded together by faster-whisper's BatchedInferencePipeline, `batch_size` clips
+    at a time. Returns one (text, avg_no_speech, seg_dump) per input, timestamps
+    relative to that input. Falls back to one transcribe_with_confidence call per
+    segment when the batched pipeline is not available.
+
+    Note: with language=None the language is detected once for the whole batch.
+    """
+    options.setdefault("beam_size", WHISPER_BEAM_SIZE)
+    options.setdefault("word_timestamps", ASR_WORD_TIMESTAMPS)
+    pipeline = get_batched_model()
+    if pipeline is None or len(audios) <= 1:
+        return [transcribe_with_confidence(a, language=language, **options) for a in audios]
+
+    gap = np.zeros(int(BATCH_GAP_SECONDS * SAMPLE_RATE), dtype=np.float32)
+    parts, clips, offsets = [], [], []
+    position = 0.0
+    for audio in audios:
+        if isinstance(audio, str):
+            audio = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+        audio = np.asarray(audio, dtype=np.float32)
+        duration = len(audio) / SAMPLE_RATE
+        offsets.append(position)
+        start = 0.0
+        while start < duration:
+            end = min(duration, start + MAX_CLIP_SECONDS)
+            clips.append(_clip(position + start, position + end))
+            start = end
+        parts.extend((audio, gap))
+        position += duration + BATCH_GAP_SECONDS
+
+    segments, info = pipeline.transcribe(
+        np.concatenate(parts),
+        language=language,
+        vad_filter=False,
+        clip_timestamps=clips,
+        batch_size=batch_size,
+        **options,
+    )
+
+    per_input = [[] for _ in audios]
+    for seg in segments:
+        # le segment appartient à l'entrée qui contient son milieu
+        index = max(0, bisect.bisect_right(offsets, (seg.start + seg.end) / 2) - 1)
+        per_input[index].append(_segment_dump(seg, offsets[index]))
+    return [_summarize_segments(segs) for segs in per_input]
@@ -0,0 +1,186 @@
+# asr_pool.py
+"""
+Service ASR multi-process : chaque process du pool charge son propre WhisperModel
+(cpu_threads / num_workers réglés), le débit de transcription suit donc le nombre de cœurs,
+y compris avec plusieurs réunions en parallèle.
+
+Les jobs sont des arrays audio 16 kHz (ou des chemins WAV) ; submit() retourne un
+concurrent.futures.Future de (text, avg_no_speech, seg_dump), comme transcribe_with_confidence.
+ASR_PROCESSES = 0 => pas de pool, transcription dans le thread appelant (comportement historique).
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import asr
+from config import ASR_PROCESSES, ASR_CPU_THREADS, ASR_NUM_WORKERS, WHISPER_MODEL, WHISPER_COMPUTE_TYPE
+
+
+def _init_worker(cpu_threads: int, num_workers: int):
+    """Initializer des process : le modèle est chargé (et chauffé) une fois par process."""
+    asr.init_model(cpu_threads=cpu_threads, num_workers=num_workers)
+    asr.warmup()
+
+
+def _ping():
+    # job vide : il ne démarre qu'une fois l'initializer (chargement + warmup) terminé
+    return os.getpid()
+
+
+def _transcribe(audio, language, vad_filter, options):
+    return asr.transcribe_with_confidence(audio, language=language, vad_filter=vad_filter, **options)
+
+
+def _transcribe_batch(audios, language, batch_size, options):
+    return asr.transcribe_batch(audios, language=language, batch_size=batch_size, **options)
+
+
+class ASRPool:
+    """
+    Pool de process de transcription avec métriques de file :
+    - pending : jobs soumis pas encore terminés (en file + en cours)
+    - submitted / completed / failed, latence moyenne (soumission -> résultat)
+    """
+
+    def __init__(self, processes: int, cpu_threads: int = 0, num_workers: int = 1):
+        self.processes = max(0, processes)
+        if cpu_threads <= 0 and self.processes > 0:
+            # on répartit les cœurs entre les process plutôt que de les sursouscrire
+            cpu_threads = max(1, (os.cpu_count() or 1) // self.processes)
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+
+        self._executor: ProcessPoolExecutor | None = None
+        if self.processes > 0:
+            # "spawn" : pas de fork d'un process qui a déjà des threads (PortAudio, Redis, ...)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.cpu_threads, self.num_workers),
+            )
+
+        self._lock = threading.Lock()
+        self.ready = False
+        self.warmup_error: str | None = None
+        self.warmup_seconds: float | None = None
+        self.pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self._latency_total = 0.0
+
+    def submit(self, audio, language: str | None = None, vad_filter: bool = False,
+               **options) -> Future:
+        """Planifie la transcription de `audio` ; retourne un Future."""
+        return self._submit(_transcribe, audio, language, vad_filter, options)
+
+    def submit_batch(self, audios: list, language: str | None = None, batch_size: int = 8,
+                     **options) -> Future:
+        """
+        Planifie la transcription groupée de plusieurs segments (asr.transcribe_batch) ;
+        le Future donne une liste de (text, avg_no_speech, seg_dump), une par segment.
+        """
+        return self._submit(_transcribe_batch, list(audios), language, batch_size, options)
+
+    def _submit(self, fn, *args) -> Future:
+        created = time.monotonic()
+        with self._lock:
+            self.pending += 1
+            self.submitted += 1
+
+        if self._executor is None:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            future = self._executor.submit(fn, *args)
+
+        future.add_done_callback(lambda f: self._done(f, created))
+        return future
+
+    def transcribe(self, audio, language: str | None = None, vad_filter: bool = False, **options):
+        """Version bloquante (threads du pipeline)."""
+        return self.submit(audio, language, vad_filter, **options).result()
+
+    def transcribe_batch(self, audios: list, language: str | None = None, batch_size: int = 8,
+                         **options) -> list:
+        return self.submit_batch(audios, language, batch_size, **options).result()
+
+    def _done(self, future: Future, created: float):
+        with self._lock:
+            self.pending -= 1
+            if future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+                self._latency_total += time.monotonic() - created
+
+    def warmup(self):
+        """
+        Charge le(s) modèle(s) et fait une inférence factice ; `ready` passe à True
+        quand chaque process (ou le modèle local sans pool) est chaud. Bloquant.
+        """
+        started = time.monotonic()
+        try:
+            if self._executor is None:
+                asr.warmup()
+            else:
+                # un job vide par process : chaque soumission démarre un process dont
+                # l'initializer charge et chauffe le modèle (une seule fois par process)
+                futures = [self._executor.submit(_ping) for _ in range(self.processes)]
+                for f in futures:
+                    f.result()
+        except Exception as e:
+            self.warmup_error = f"{type(e).__name__}: {e}"
+            print("[asr_pool] warmup error:", e)
+            return
+        self.warmup_seconds = round(time.monotonic() - started, 2)
+        self.ready = True
+        print(f"[asr_pool] modèle {WHISPER_MODEL} prêt en {self.warmup_seconds}s")
+
+    def readiness(self) -> dict:
+        return {
+            "ready": self.ready,
+            "model": WHISPER_MODEL,
+            "compute_type": WHISPER_COMPUTE_TYPE,
+            "processes": self.processes,
+            "warmup_seconds": self.warmup_seconds,
+            "error": self.warmup_error,
+        }
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "processes": self.processes,
+                "cpu_threads": self.cpu_threads,
+                "num_workers": self.num_workers,
+                "pending": self.pending,
+                "queued": max(0, self.pending - max(self.processes, 1) * self.num_workers),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avg_latency_ms": round(1000 * self._latency_total / self.completed, 1)
+                if self.completed else 0.0,
+            }
+
+
+_pool: ASRPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_asr_pool() -> ASRPool:
+    """Pool partagé par toutes les réunions du process serveur."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ASRPool(ASR_PROCESSES, ASR_CPU_THREADS, ASR_NUM_WORKERS)
+    return _pool
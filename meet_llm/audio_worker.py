@@ -1,33 +1,57 @@
 # audio_worker.py
 import os
+import bisect
+import math
+import time
+import datetime
 import threading
-import queue
 import tempfile
 import sys
 
-from asr import transcribe_with_confidence
-from recorder import AlternatingRecorder
-from mistral_client import translate_and_summarize
-from redis_client import append_chunk, set_summary, get_summary
+import numpy as np
+import soundfile as sf
+
+from asr_pool import get_asr_pool
+from speech_gate import get_speech_gate
+from recorder import AlternatingRecorder, ASR_SAMPLERATE
+from mistral_client import translate_batch
+from meeting_store import get_meeting_store, CHUNK_META_FIELDS
+from live_summary import LiveSummarizer
+from retrieval import get_meeting_index
+from segmenter import EnergySegmenter
+from streaming_asr import StreamingTranscriber
+from pipeline import Pipeline, Stage
+from config import (
+    AUDIO_CAPTURE_MODE,
+    ASR_MODE,
+    STREAMING_STEP_SECONDS,
+    STREAMING_MAX_WINDOW_SECONDS,
+    SEGMENT_MODE,
+    CHUNK_SECONDS,
+    SEGMENT_MIN_SECONDS,
+    SEGMENT_MAX_SECONDS,
+    SEGMENT_SILENCE_SECONDS,
+    SEGMENT_SILENCE_RMS,
+    ASR_WORKERS,
+    ASR_QUEUE_SIZE,
+    ASR_QUEUE_POLICY,
+    ASR_BATCH_SIZE,
+    TRANSLATION_WORKERS,
+    TRANSLATION_QUEUE_SIZE,
+    TRANSLATION_QUEUE_POLICY,
+    TRANSLATION_BATCH_SIZE,
+    PERSIST_QUEUE_SIZE,
+)
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 PARENT_DIR = os.path.dirname(CURRENT_DIR)
 if PARENT_DIR not in sys.path:
     sys.path.insert(0, PARENT_DIR)
 
-# État global exposé à l'API
-state = {
-    "status": "stopped",   # "listening" | "stopped"
-    "speaker": None,
-    "participants": [],
-}
-
-_stop_event = threading.Event()
-_worker_thread = None
-_meeting_flag = {"active": False}  # True => on traduit / résume
-_out_q: queue.Queue[str] = queue.Queue()
-
-_recorder_obj: AlternatingRecorder | None = None
+_sessions: dict[str, "MeetingSession"] = {}
+_sessions_lock = threading.Lock()
+# attente max de la fin d'une session arrêtée avant de la relancer (drain du pipeline + résumé final)
+SESSION_RESTART_TIMEOUT = 90.0
 
 
 def _load_meeting_info():
@@ -38,132 +62,463 @@ def _load_meeting_info():
     pass
 
 
-def _recording_loop(seconds_per_chunk: int, device_index: int | None):
+def _recording_loop(seconds_per_chunk: float, device_index: int | None, out_queue,
+                    stop_event: threading.Event):
     """
-    Thread qui enregistre l'audio en fichiers alternés dans /tmp
-    et pousse le nom du fichier terminé dans _out_q.
+    Enregistre l'audio et pousse chaque chunk dans out_queue (l'entrée du pipeline) :
+    - mode "memory" : ring buffer en RAM, arrays float32 (16 kHz),
+                      coupés aux pauses si SEGMENT_MODE == "vad" (silences jetés)
+    - mode "wav"    : fichiers alternés dans /tmp, nom du fichier terminé
+    En ASR_MODE "streaming", on pousse des petits blocs de STREAMING_STEP_SECONDS.
+    Bloque jusqu'à stop_event.
     """
-    global _recorder_obj
     tmp_dir = os.path.abspath(tempfile.gettempdir())
     base_name = "chunk"
 
-    _recorder_obj = AlternatingRecorder(
+    recorder = AlternatingRecorder(
         device_index=device_index,
         channels=1,
+        capture_mode=AUDIO_CAPTURE_MODE,
     )
-    _recorder_obj.start_stream()
+    recorder.start_stream()
 
     try:
-        _recorder_obj.alternate_recording(
-            seconds_per_chunk,
-            tmp_dir,
-            base_name,
-            _out_q,
-            _stop_event,
-        )
+        if AUDIO_CAPTURE_MODE == "memory" and ASR_MODE == "streaming":
+            recorder.buffered_recording(STREAMING_STEP_SECONDS, out_queue, stop_event)
+        elif AUDIO_CAPTURE_MODE == "memory" and SEGMENT_MODE == "vad":
+            segmenter = EnergySegmenter(
+                min_seconds=SEGMENT_MIN_SECONDS,
+                max_seconds=SEGMENT_MAX_SECONDS,
+                silence_seconds=SEGMENT_SILENCE_SECONDS,
+                silence_rms=SEGMENT_SILENCE_RMS,
+            )
+            recorder.segmented_recording(segmenter, out_queue, stop_event)
+        elif AUDIO_CAPTURE_MODE == "memory":
+            recorder.buffered_recording(seconds_per_chunk, out_queue, stop_event)
+        else:
+            recorder.alternate_recording(
+                seconds_per_chunk,
+                tmp_dir,
+                base_name,
+                out_queue,
+                stop_event,
+            )
     finally:
         try:
-            _recorder_obj.stop_stream()
+            recorder.stop_stream()
         except Exception:
             pass
 
 
-def _summarize_incrementally(latest_text, latest_translation):
+def _audio_seconds(audio) -> float:
+    if isinstance(audio, str):
+        try:
+            return sf.info(audio).duration
+        except Exception:
+            return 0.0
+    return len(audio) / ASR_SAMPLERATE
+
+
+class _CaptureClock:
     """
-    Logique simple :
-    - lire le résumé actuel depuis Redis
-    - demander à Mistral une mise à jour du résumé (en FR)
-    - sauvegarder
+    Entrée du pipeline donnée à l'enregistrement : chaque chunk audio part avec la position
+    (secondes depuis `origin`, le début de la réunion) de son premier échantillon.
+    Le chunk vient d'être terminé => il commence `durée` secondes avant maintenant.
     """
-    current_summary = get_summary()
-    prompt = (
-        "Résumé de la réunion jusqu'à présent (en français) :\n"
-        f"{current_summary}\n\n"
-        "Nouveau contenu (texte brut) :\n"
-        f"{latest_text}\n\n"
-        "Nouveau contenu (traduction en français) :\n"
-        f"{latest_translation}\n\n"
-        "Mets à jour le résumé de la réunion, de manière claire et concise, "
-        "EN FRANÇAIS UNIQUEMENT, en gardant seulement les informations importantes."
-    )
 
-    updated = translate_and_summarize(prompt)  # on force FR
-    set_summary(updated)
+    def __init__(self, pipeline: Pipeline, origin: float):
+        self.pipeline = pipeline
+        self.origin = origin
 
+    def put(self, audio):
+        end = time.time() - self.origin
+        self.pipeline.put({"audio": audio, "start": max(0.0, end - _audio_seconds(audio))})
 
-def _main_worker(seconds_per_chunk: int = 20, device_index: int | None = None):
-    record_thread = threading.Thread(
-        target=_recording_loop,
-        args=(seconds_per_chunk, device_index),
-        daemon=True,
-    )
-    record_thread.start()
 
-    while not _stop_event.is_set():
+# ---------- Étapes du pipeline : capture -> ASR -> traduction -> persistance ----------
+
+def _coalesce_audio(a, b):
+    """
+    Politique "coalesce" de l'étape ASR : deux chunks audio en attente => un seul.
+    Les silences entre les deux ont pu être jetés (segmenter) : chaque partie garde sa
+    position dans la réunion, "parts" = [(début dans l'audio fusionné, début dans la réunion)].
+    """
+    offset = len(a["audio"]) / ASR_SAMPLERATE
+    parts = _parts(a) + [(offset + local, start) for local, start in _parts(b)]
+    return {"audio": np.concatenate((a["audio"], b["audio"])), "start": a["start"], "parts": parts}
+
+
+def _parts(item):
+    return item.get("parts") or [(0.0, item["start"])]
+
+
+def _timeline(item):
+    """Temps dans l'audio de l'item (s) -> temps depuis le début de la réunion (s)."""
+    parts = _parts(item)
+    local_starts = [local for local, _ in parts]
+
+    def to_meeting(t: float) -> float:
+        local, start = parts[max(0, bisect.bisect_right(local_starts, t) - 1)]
+        return start + (t - local)
+
+    return to_meeting
+
+
+def _coalesce_text(a, b):
+    """Politique "coalesce" de l'étape traduction : deux textes en attente => un seul."""
+    merged = {"text": f"{a['text']} {b['text']}".strip()}
+    if "start" in a and "start" in b:
+        merged.update(start=a["start"], end=b["end"], segments=a["segments"] + b["segments"])
+        if a.get("words") or b.get("words"):
+            merged["words"] = a.get("words", []) + b.get("words", [])
+    return merged
+
+
+def _chunk_item(segments, to_meeting):
+    """
+    Segments Whisper -> item du pipeline : texte des segments gardés par le speech gate
+    + métadonnées (cf. CHUNK_META_FIELDS), temps convertis par `to_meeting` (cf. _timeline).
+    None => rien de parlé.
+    """
+    kept = get_speech_gate().keep_segments(segments)
+    if not kept:
+        return None
+    segs, words = [], []
+    for seg in kept:
+        logprob, ns = seg.get("avg_logprob"), seg.get("no_speech_prob")
+        segs.append({
+            "start": round(to_meeting(seg["start"]), 2),
+            "end": round(to_meeting(seg["end"]), 2),
+            "conf": round(math.exp(logprob), 3) if logprob is not None else None,
+            "no_speech": round(ns, 3) if ns is not None else None,
+        })
+        for w in seg.get("words") or []:
+            words.append([w["word"].strip(), round(to_meeting(w["start"]), 2), round(to_meeting(w["end"]), 2)])
+    item = {
+        "text": " ".join(seg["text"] for seg in kept).strip(),
+        "start": segs[0]["start"],
+        "end": segs[-1]["end"],
+        "segments": segs,
+    }
+    if words:
+        item["words"] = words
+    return item
+
+
+def _remove_wav(audio):
+    if isinstance(audio, str):
+        # le fichier temporaire n'est plus utile
         try:
-            filename = _out_q.get(timeout=0.5)
-        except queue.Empty:
-            continue
+            os.remove(audio)
+        except OSError:
+            pass
+
 
-        if not filename or not os.path.exists(filename):
-            continue
+def _asr_step(item):
+    """
+    Transcription brute d'un chunk ({"audio": chemin WAV ou array, "start": position}).
+    None => silence, rien à traduire.
+    Les chunks sans parole (filtre RMS / VAD) ne passent pas par Whisper.
+    """
+    audio = item["audio"]
+    if isinstance(audio, str):
+        if not audio or not os.path.exists(audio):
+            return None
+    elif audio is None or len(audio) == 0:
+        return None
 
-        # Transcription brute
+    gate = get_speech_gate()
+    try:
+        if not gate.has_speech(audio):
+            return None
+        text, avg_no_speech, segs = get_asr_pool().transcribe(
+            audio,
+            language=None,
+            vad_filter=False,
+        )
+    finally:
+        _remove_wav(audio)
+
+    # segments probablement sans parole (bruit, hallucinations) => pas de traduction
+    return _chunk_item(segs, _timeline(item))
+
+
+def _asr_batch_step(items):
+    """
+    Étape ASR en mode batch : quand plusieurs chunks attendent (retard à rattraper),
+    ils sont transcrits en une seule passe groupée. Un seul chunk => chemin normal.
+    """
+    if len(items) == 1:
+        return [_asr_step(items[0])]
+
+    audios = [item["audio"] for item in items]
+    gate = get_speech_gate()
+    results = [None] * len(audios)
+    try:
+        valid = [
+            i for i, a in enumerate(audios)
+            if (os.path.exists(a) if isinstance(a, str) else a is not None and len(a) > 0)
+            and gate.has_speech(a)
+        ]
+        outputs = get_asr_pool().transcribe_batch(
+            [audios[i] for i in valid],
+            language=None,
+            batch_size=ASR_BATCH_SIZE,
+        ) if valid else []
+    finally:
+        for a in audios:
+            _remove_wav(a)
+
+    for i, (text, avg_no_speech, segs) in zip(valid, outputs):
+        results[i] = _chunk_item(segs, _timeline(items[i]))
+    return results
+
+
+class MeetingSession:
+    """
+    Une réunion = son propre recorder, pipeline (ASR -> traduction -> persistance)
+    et résumé live. Toutes les écritures passent par le meeting store, sous cet ID.
+    """
+
+    def __init__(self, meeting_id: str, device_index: int | None = None,
+                 seconds_per_chunk: float = CHUNK_SECONDS):
+        self.meeting_id = meeting_id
+        self.device_index = device_index
+        self.seconds_per_chunk = seconds_per_chunk
+        # État exposé à l'API
+        self.state = {
+            "status": "stopped",   # "listening" | "stopped"
+            "speaker": None,
+            "participants": [],
+        }
+        self.store = get_meeting_store()
+        self.active = False  # True => on traduit / résume
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lifecycle_lock = threading.Lock()
+        self.pipeline: Pipeline | None = None
+        self.summarizer: LiveSummarizer | None = None
+
+    # ---------- étapes liées à la réunion ----------
+
+    def _make_streaming_asr(self):
+        """
+        ASR incrémental : les blocs audio alimentent une fenêtre glissante,
+        les segments stables partent vers la traduction, le partiel va dans Redis.
+        Retourne (step, flush) pour l'étape ASR.
+        """
+        transcriber = StreamingTranscriber(
+            language=None,
+            step_seconds=STREAMING_STEP_SECONDS,
+            max_window_seconds=STREAMING_MAX_WINDOW_SECONDS,
+            gate=get_speech_gate(),  # même filtre que le chemin par chunks
+        )
+        last_partial = {"text": ""}
+        # les blocs sont contigus : temps du flux + position du premier bloc = temps de réunion
+        stream = {"origin": None}
+
+        def step(item):
+            if stream["origin"] is None:
+                stream["origin"] = item["start"]
+            committed, partial = transcriber.feed(item["audio"])
+            if partial != last_partial["text"]:
+                self.store.set_partial(partial, mid=self.meeting_id)
+                last_partial["text"] = partial
+            origin = stream["origin"]
+            return _chunk_item(committed, lambda t: origin + t)
+
+        def flush():
+            committed = transcriber.flush()
+            self.store.set_partial("", mid=self.meeting_id)
+            origin = stream["origin"] or 0.0
+            item = _chunk_item(committed, lambda t: origin + t)
+            return [item] if item else []
+
+        return step, flush
+
+    def _translate_step(self, items):
+        """
+        Traduit (si le meeting est actif) tous les segments en attente dans la file
+        en une seule requête. Appel réseau => plusieurs workers possibles.
+        """
+        if not self.active:
+            return [{**item, "translated": None} for item in items]
+
+        texts = [item["text"] for item in items]
+        # Traduction (toujours en français)
         try:
-            text, avg_no_speech, segs = transcribe_with_confidence(
-                filename,
-                language=None,
-                vad_filter=False,
-            )
+            print(f"[worker {self.meeting_id}] calling translate_batch (FR) x{len(texts)}")
+            translations = translate_batch(texts)  # FR par défaut
+            print(f"[worker {self.meeting_id}] translated snippet:", repr(str(translations[-1])[:120]))
         except Exception as e:
-            print(f"[worker] transcription error: {e}")
-            continue
+            print(f"[worker {self.meeting_id}] translation error:", e)
+            translations = texts  # fallback = texte original
+        return [{**item, "translated": tr} for item, tr in zip(items, translations)]
 
-        if not text:
-            continue  # silence
+    def _persist_step(self, item):
+        """
+        Sauvegarde du chunk pour le dashboard (LiveTranslationCard), dans l'ordre de capture.
+        """
+        meta = {k: item[k] for k in CHUNK_META_FIELDS if k in item}
+        chunk_id = self.store.append_chunk(item["text"], item.get("translated"), mid=self.meeting_id,
+                                           meta=meta)
+        # index de recherche du Q&A, mis à jour au fil de l'eau
+        get_meeting_index(self.meeting_id).add({
+            "id": chunk_id,
+            "text": item["text"],
+            "translated": item.get("translated"),
+        })
+        if self.summarizer is not None:
+            self.summarizer.notify()
+        return item
 
-        # Traduction (toujours en français)
-        translated = None
-        if _meeting_flag["active"]:
-            try:
-                print("[worker] calling translate_and_summarize (FR)")
-                translated = translate_and_summarize(text)  # FR par défaut
-                print("[worker] translated snippet:", repr(str(translated)[:120]))
-            except Exception as e:
-                print("[worker] translation error:", e)
-                translated = text  # fallback = texte original
+    def _build_pipeline(self) -> Pipeline:
+        if ASR_MODE == "streaming" and AUDIO_CAPTURE_MODE == "memory":
+            # le transcripteur streaming a un état => un seul worker
+            step, flush = self._make_streaming_asr()
+            asr_stage = Stage("asr", step, workers=1, maxsize=ASR_QUEUE_SIZE,
+                              policy="coalesce", coalesce=_coalesce_audio, flush=flush)
+        else:
+            policy = ASR_QUEUE_POLICY
+            if policy == "coalesce" and AUDIO_CAPTURE_MODE != "memory":
+                policy = "block"  # on ne fusionne pas des fichiers WAV
+            if ASR_BATCH_SIZE > 1:
+                asr_stage = Stage("asr", _asr_batch_step, workers=ASR_WORKERS, maxsize=ASR_QUEUE_SIZE,
+                                  policy=policy, coalesce=_coalesce_audio, batch_size=ASR_BATCH_SIZE)
+            else:
+                asr_stage = Stage("asr", _asr_step, workers=ASR_WORKERS, maxsize=ASR_QUEUE_SIZE,
+                                  policy=policy, coalesce=_coalesce_audio)
+
+        return Pipeline([
+            asr_stage,
+            Stage("translation", self._translate_step, workers=TRANSLATION_WORKERS,
+                  maxsize=TRANSLATION_QUEUE_SIZE, policy=TRANSLATION_QUEUE_POLICY,
+                  coalesce=_coalesce_text, batch_size=TRANSLATION_BATCH_SIZE),
+            Stage("persistence", self._persist_step, workers=1, maxsize=PERSIST_QUEUE_SIZE,
+                  policy="block"),
+        ])
+
+    # ---------- cycle de vie ----------
+
+    def _meeting_origin(self) -> float:
+        """Début de la réunion (timestamp) : origine des temps stockés avec les chunks."""
+        start = self.store.load_meeting(self.meeting_id).get("start")
+        try:
+            return datetime.datetime.fromisoformat(start).timestamp()
+        except (TypeError, ValueError):
+            return time.time()
+
+    def _run(self):
+        self.summarizer = LiveSummarizer(self.meeting_id)
+        self.summarizer.start()
+        self.pipeline = self._build_pipeline()
+        self.pipeline.start()
+
+        clock = _CaptureClock(self.pipeline, self._meeting_origin())
+        try:
+            _recording_loop(self.seconds_per_chunk, self.device_index, clock, self._stop_event)
+        except Exception as e:
+            print(f"[worker {self.meeting_id}] recording error:", e)
+        finally:
+            # on termine les chunks déjà capturés avant de couper la traduction,
+            # puis on intègre les derniers chunks au résumé live
+            self.pipeline.stop()
+            self.active = False
+            self.summarizer.stop(final_update=True)
+            print(f"[worker {self.meeting_id}] audio loop ended")
 
-        # Sauvegarde du chunk pour le dashboard (LiveTranslationCard)
-        append_chunk(text, translated)
+    def start(self):
+        """
+        Démarre / redémarre la capture audio.
+        Après un stop(), attend que l'ancienne boucle ait fini de vider son pipeline :
+        deux _run en parallèle écriraient les chunks de la réunion dans le désordre.
+        """
+        with self._lifecycle_lock:
+            self._start()
 
-    print("[worker] audio loop ended")
+    def _start(self):
+        if self.state["status"] == "stopped":
+            if self._thread is not None and self._thread.is_alive():
+                self._thread.join(timeout=SESSION_RESTART_TIMEOUT)
+                if self._thread.is_alive():
+                    raise RuntimeError(f"meeting {self.meeting_id}: previous session still draining")
+            self.active = True
+            self._stop_event.clear()
+            self.state["status"] = "listening"
+            self._thread = threading.Thread(
+                target=self._run, name=f"meeting-{self.meeting_id}", daemon=True
+            )
+            self._thread.start()
+        else:
+            self.active = True
+            self.state["status"] = "listening"
 
+    def stop(self):
+        """
+        Arrête la capture (les chunks en cours sont terminés par le pipeline avant l'arrêt).
+        """
+        self.state["status"] = "stopped"
+        self._stop_event.set()
 
-def start_session():
+    def stats(self):
+        """
+        Profondeur des files et latences par étape.
+        """
+        if self.pipeline is None:
+            return {"stages": [], "completed": 0, "avg_end_to_end_ms": 0.0}
+        return self.pipeline.stats()
+
+
+# ---------- Registre des sessions ----------
+
+def start_session(meeting_id: str, device_index: int | None = None) -> MeetingSession:
     """
-    Démarre / redémarre la capture audio.
+    Démarre (ou relance) la session audio de la réunion `meeting_id`.
     """
-    global _worker_thread
-    if state["status"] == "stopped":
-        _stop_event.clear()
-        _meeting_flag["active"] = True
-        state["status"] = "listening"
+    with _sessions_lock:
+        session = _sessions.get(meeting_id)
+        if session is None:
+            session = MeetingSession(meeting_id, device_index=device_index)
+            _sessions[meeting_id] = session
+    session.start()
+    return session
 
-        _worker_thread = threading.Thread(
-            target=_main_worker,
-            kwargs={"seconds_per_chunk": 20, "device_index": None},
-            daemon=True,
-        )
-        _worker_thread.start()
-    else:
-        _meeting_flag["active"] = True
-        state["status"] = "listening"
+
+def stop_session(meeting_id: str):
+    """
+    Arrête la session audio de la réunion `meeting_id` (sans effet si inconnue).
+    """
+    session = _sessions.get(meeting_id)
+    if session is not None:
+        session.stop()
+
+
+def get_session(meeting_id: str) -> MeetingSession | None:
+    return _sessions.get(meeting_id)
+
+
+def get_state(meeting_id: str) -> dict:
+    """
+    État live d'une réunion ("stopped" si aucune session dans ce process).
+    """
+    session = _sessions.get(meeting_id)
+    if session is None:
+        return {"status": "stopped", "speaker": None, "participants": []}
+    return session.state
+
+
+def list_sessions() -> list[dict]:
+    return [
+        {"meeting_id": mid, "status": s.state["status"]}
+        for mid, s in list(_sessions.items())
+    ]
 
 
-def stop_session():
+def get_pipeline_stats(meeting_id: str):
     """
-    Arrête tout.
+    Profondeur des files et latences par étape (pour /api/pipeline/stats).
     """
-    _meeting_flag["active"] = False
-    state["status"] = "stopped"
-    _stop_event.set()
+    session = _sessions.get(meeting_id)
+    if session is None:
+        return {"stages": [], "completed": 0, "avg_end_to_end_ms": 0.0}
+    return session.stats()
@@ -0,0 +1,75 @@
+# background.py
+"""
+Exécuteur dédié et borné pour le travail lourd de l'API (rendu PDF, résumé final,
+export) : ces tâches ne prennent pas les threads du pool par défaut d'asyncio /
+Starlette, donc un endpoint LLM lent ne peut pas bloquer la vue live.
+
+Au-delà de `max_pending` tâches (en cours + en attente), run() refuse (ExecutorBusy)
+au lieu d'empiler sans fin.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from config import HEAVY_WORKERS, HEAVY_MAX_PENDING
+
+
+class ExecutorBusy(Exception):
+    """Trop de tâches lourdes en attente."""
+
+
+class BoundedExecutor:
+    def __init__(self, workers: int, max_pending: int, name: str = "heavy"):
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Planifie fn ; lève ExecutorBusy si la file est pleine."""
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise ExecutorBusy(f"{self.pending} tâches en attente")
+            self.pending += 1
+        future = self._pool.submit(fn, *args, **kwargs)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future: Future):
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+
+    async def run(self, fn, *args, **kwargs):
+        """Version awaitable, depuis un endpoint async."""
+        return await asyncio.wrap_future(self.submit(functools.partial(fn, *args, **kwargs)))
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+_executor: BoundedExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_heavy_executor() -> BoundedExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = BoundedExecutor(HEAVY_WORKERS, HEAVY_MAX_PENDING)
+    return _executor
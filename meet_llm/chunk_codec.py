@@ -0,0 +1,116 @@
+# chunk_codec.py
+"""
+Encodage des chunks du transcript dans le Redis Stream. Le nom du champ de l'entrée
+sert de tag de format, ce qui permet de lire un stream qui mélange les formats :
+
+- "data" : JSON (format historique, toujours relu)
+- "m1"   : msgpack, version 1 : tableau positionnel
+           [text, translated, start, end, segments, words, extra]
+           segments en [start, end, conf, no_speech], words en [mot, start, end],
+           extra = autres champs (ou None) ; temps en centièmes de seconde et
+           probabilités en millièmes, stockés en entiers (1 à 3 octets au lieu de 9)
+
+Le format d'écriture se choisit par CHUNK_CODEC ("msgpack" | "json") ;
+sans le paquet msgpack on écrit en JSON.
+"""
+import json
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from config import CHUNK_CODEC
+
+
+class JsonChunkCodec:
+    field = "data"
+
+    def encode(self, entry: dict) -> bytes:
+        return json.dumps(entry, ensure_ascii=False).encode("utf-8")
+
+    def decode(self, raw) -> dict:
+        return json.loads(raw)
+
+
+def _to_int(value, scale):
+    return None if value is None else int(round(value * scale))
+
+
+def _from_int(value, scale):
+    return None if value is None else value / scale
+
+
+class MsgpackChunkCodec:
+    field = "m1"
+    _KNOWN = {"text", "translated", "start", "end", "segments", "words"}
+    _TIME, _PROB = 100, 1000
+
+    def encode(self, entry: dict) -> bytes:
+        t, p = self._TIME, self._PROB
+        segments = entry.get("segments")
+        if segments is not None:
+            segments = [
+                [_to_int(s.get("start"), t), _to_int(s.get("end"), t),
+                 _to_int(s.get("conf"), p), _to_int(s.get("no_speech"), p)]
+                for s in segments
+            ]
+        words = entry.get("words")
+        if words is not None:
+            words = [[w, _to_int(start, t), _to_int(end, t)] for w, start, end in words]
+        extra = {k: v for k, v in entry.items() if k not in self._KNOWN} or None
+        return msgpack.packb(
+            [entry.get("text"), entry.get("translated"),
+             _to_int(entry.get("start"), t), _to_int(entry.get("end"), t),
+             segments, words, extra],
+            use_bin_type=True,
+        )
+
+    def decode(self, raw) -> dict:
+        t, p = self._TIME, self._PROB
+        text, translated, start, end, segments, words, extra = msgpack.unpackb(raw, raw=False)
+        entry = {"text": text, "translated": translated}
+        if start is not None:
+            entry.update(start=_from_int(start, t), end=_from_int(end, t))
+        if segments is not None:
+            entry["segments"] = [
+                {"start": _from_int(s0, t), "end": _from_int(s1, t),
+                 "conf": _from_int(conf, p), "no_speech": _from_int(ns, p)}
+                for s0, s1, conf, ns in segments
+            ]
+        if words is not None:
+            entry["words"] = [[w, _from_int(start, t), _from_int(end, t)] for w, start, end in words]
+        if extra:
+            entry.update(extra)
+        return entry
+
+
+_CODECS = {JsonChunkCodec.field: JsonChunkCodec()}
+if msgpack is not None:
+    _CODECS[MsgpackChunkCodec.field] = MsgpackChunkCodec()
+
+
+def get_chunk_codec():
+    """Codec d'écriture (CHUNK_CODEC), JSON si msgpack n'est pas installé."""
+    if CHUNK_CODEC == "msgpack" and msgpack is not None:
+        return _CODECS[MsgpackChunkCodec.field]
+    return _CODECS[JsonChunkCodec.field]
+
+
+def encode_chunk(entry: dict) -> dict:
+    """Champs de l'entrée Redis Stream : {tag de format: octets}."""
+    codec = get_chunk_codec()
+    return {codec.field: codec.encode(entry)}
+
+
+def decode_chunk(fields: dict) -> dict | None:
+    """Champs d'une entrée (clés str ou bytes) -> chunk ; None si format inconnu ou illisible."""
+    for key, raw in fields.items():
+        codec = _CODECS.get(key.decode() if isinstance(key, bytes) else key)
+        if codec is None:
+            continue
+        try:
+            return codec.decode(raw)
+        except Exception:
+            return None
+    return None
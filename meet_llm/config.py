@@ -4,8 +4,124 @@ load_dotenv()
 
 MISTRAL_API_KEY = os.environ.get("MISTRAL_API_KEY")
 
+# Client Mistral : requêtes en vol, débit (req/s + rafale), retries 429/5xx, timeout (s)
+MISTRAL_MAX_IN_FLIGHT = int(os.environ.get("MISTRAL_MAX_IN_FLIGHT", "4"))
+MISTRAL_RATE_PER_SEC = float(os.environ.get("MISTRAL_RATE_PER_SEC", "2"))
+MISTRAL_BURST = int(os.environ.get("MISTRAL_BURST", "4"))
+MISTRAL_MAX_RETRIES = int(os.environ.get("MISTRAL_MAX_RETRIES", "5"))
+MISTRAL_BACKOFF_BASE = float(os.environ.get("MISTRAL_BACKOFF_BASE", "0.5"))
+MISTRAL_BACKOFF_MAX = float(os.environ.get("MISTRAL_BACKOFF_MAX", "30"))
+MISTRAL_TIMEOUT = float(os.environ.get("MISTRAL_TIMEOUT", "60"))
+
 # ✅ Always use French
 TARGET_LANG = "fr"
 
+# Audio capture: "memory" (ring buffer, arrays handed to ASR) or "wav" (temp files)
+AUDIO_CAPTURE_MODE = os.environ.get("AUDIO_CAPTURE_MODE", "memory")
+
+# Découpage des chunks : "vad" (coupure aux pauses, mode memory uniquement) ou "fixed"
+SEGMENT_MODE = os.environ.get("SEGMENT_MODE", "vad")
+CHUNK_SECONDS = float(os.environ.get("CHUNK_SECONDS", "20"))           # mode fixed
+SEGMENT_MIN_SECONDS = float(os.environ.get("SEGMENT_MIN_SECONDS", "2"))
+SEGMENT_MAX_SECONDS = float(os.environ.get("SEGMENT_MAX_SECONDS", "20"))
+SEGMENT_SILENCE_SECONDS = float(os.environ.get("SEGMENT_SILENCE_SECONDS", "0.6"))
+SEGMENT_SILENCE_RMS = float(os.environ.get("SEGMENT_SILENCE_RMS", "0.01"))
+
+# Filtre avant ASR : seuil RMS par trame, VAD webrtcvad optionnel (mode 0-3, -1 = désactivé)
+# et part minimale de trames parlées ; après ASR : segments au-delà de ce no_speech_prob jetés
+ASR_GATE_RMS = float(os.environ.get("ASR_GATE_RMS", os.environ.get("SEGMENT_SILENCE_RMS", "0.01")))
+ASR_GATE_VAD_MODE = int(os.environ.get("ASR_GATE_VAD_MODE", "-1"))
+ASR_GATE_MIN_SPEECH_RATIO = float(os.environ.get("ASR_GATE_MIN_SPEECH_RATIO", "0.1"))
+ASR_MAX_NO_SPEECH_PROB = float(os.environ.get("ASR_MAX_NO_SPEECH_PROB", "0.6"))
+
+# ASR : "chunk" (un appel Whisper par chunk) ou "streaming" (fenêtre glissante + partiels)
+ASR_MODE = os.environ.get("ASR_MODE", "chunk")
+STREAMING_STEP_SECONDS = float(os.environ.get("STREAMING_STEP_SECONDS", "1"))
+STREAMING_MAX_WINDOW_SECONDS = float(os.environ.get("STREAMING_MAX_WINDOW_SECONDS", "15"))
+
+# Modèle Whisper (faster-whisper) : taille ("tiny", "base", "small", "medium", "large-v3"...),
+# type de calcul ("int8", "int8_float32", "float16", "auto"...), beam size, préchargement au démarrage
+WHISPER_MODEL = os.environ.get("WHISPER_MODEL", "base")
+WHISPER_COMPUTE_TYPE = os.environ.get("WHISPER_COMPUTE_TYPE", "auto")
+WHISPER_BEAM_SIZE = int(os.environ.get("WHISPER_BEAM_SIZE", "5"))
+ASR_WARMUP = os.environ.get("ASR_WARMUP", "1") == "1"
+# Horodatage mot à mot (plus lent) : stocké avec chaque chunk sous forme compacte
+ASR_WORD_TIMESTAMPS = os.environ.get("ASR_WORD_TIMESTAMPS", "0") == "1"
+
+# Pipeline capture -> ASR -> traduction -> persistance
+# politiques de débordement des files : "block" | "drop_oldest" | "coalesce"
+ASR_WORKERS = int(os.environ.get("ASR_WORKERS", "1"))
+# Pool de process ASR partagé par les réunions (0 = transcription dans le thread du pipeline).
+# Chaque process charge son WhisperModel ; ASR_CPU_THREADS = threads CTranslate2 par modèle
+# (0 => défaut CTranslate2, ou cœurs / ASR_PROCESSES avec le pool).
+# Mettre ASR_WORKERS >= ASR_PROCESSES pour occuper tous les process.
+ASR_PROCESSES = int(os.environ.get("ASR_PROCESSES", "0"))
+ASR_CPU_THREADS = int(os.environ.get("ASR_CPU_THREADS", "0"))
+ASR_NUM_WORKERS = int(os.environ.get("ASR_NUM_WORKERS", "1"))
+ASR_QUEUE_SIZE = int(os.environ.get("ASR_QUEUE_SIZE", "8"))
+ASR_QUEUE_POLICY = os.environ.get("ASR_QUEUE_POLICY", "coalesce")
+# chunks en attente transcrits ensemble en une passe Whisper groupée (1 = un par un)
+ASR_BATCH_SIZE = int(os.environ.get("ASR_BATCH_SIZE", "4"))
+TRANSLATION_WORKERS = int(os.environ.get("TRANSLATION_WORKERS", "2"))
+TRANSLATION_QUEUE_SIZE = int(os.environ.get("TRANSLATION_QUEUE_SIZE", "16"))
+TRANSLATION_QUEUE_POLICY = os.environ.get("TRANSLATION_QUEUE_POLICY", "coalesce")
+# nombre max de segments en attente envoyés dans une seule requête de traduction
+TRANSLATION_BATCH_SIZE = int(os.environ.get("TRANSLATION_BATCH_SIZE", "8"))
+PERSIST_QUEUE_SIZE = int(os.environ.get("PERSIST_QUEUE_SIZE", "64"))
+
+# Résumé live : mis à jour tous les N chunks ou toutes les T secondes (s'il y a du nouveau),
+# avec un prompt borné (nouveau contenu max + taille max du résumé, en caractères)
+LIVE_SUMMARY_EVERY_CHUNKS = int(os.environ.get("LIVE_SUMMARY_EVERY_CHUNKS", "5"))
+LIVE_SUMMARY_EVERY_SECONDS = float(os.environ.get("LIVE_SUMMARY_EVERY_SECONDS", "60"))
+LIVE_SUMMARY_MAX_INPUT_CHARS = int(os.environ.get("LIVE_SUMMARY_MAX_INPUT_CHARS", "6000"))
+LIVE_SUMMARY_MAX_CHARS = int(os.environ.get("LIVE_SUMMARY_MAX_CHARS", "2500"))
+
+# Résumé final hiérarchique (map-reduce) : taille d'une fenêtre de transcript en caractères
+SUMMARY_WINDOW_CHARS = int(os.environ.get("SUMMARY_WINDOW_CHARS", "6000"))
+
+# Stockage des réunions : "redis" (partagé entre workers uvicorn), "file" ou "memory" (tests)
+MEETING_STORE = os.environ.get("MEETING_STORE", "redis")
+MEETING_STORE_DIR = os.environ.get(
+    "MEETING_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "meetings"),
+)
+
+# Encodage des chunks dans Redis : "msgpack" (compact) | "json" ; les deux sont toujours relus
+CHUNK_CODEC = os.environ.get("CHUNK_CODEC", "msgpack")
+
+# Q&A : nb de chunks pertinents (BM25 EN+FR) + récents envoyés au LLM,
+# embeddings Mistral en plus de BM25 (recherche hybride) si RETRIEVAL_EMBEDDINGS=1
+RETRIEVAL_TOP_K = int(os.environ.get("RETRIEVAL_TOP_K", "6"))
+RETRIEVAL_RECENT_CHUNKS = int(os.environ.get("RETRIEVAL_RECENT_CHUNKS", "4"))
+RETRIEVAL_EMBEDDINGS = os.environ.get("RETRIEVAL_EMBEDDINGS", "0") == "1"
+# chunks par requête d'embeddings (limite d'entrée de l'API)
+RETRIEVAL_EMBED_BATCH_SIZE = int(os.environ.get("RETRIEVAL_EMBED_BATCH_SIZE", "64"))
+
+# API : exécuteur dédié au travail lourd (PDF, résumé final, export) et file max avant 503
+HEAVY_WORKERS = int(os.environ.get("HEAVY_WORKERS", "2"))
+HEAVY_MAX_PENDING = int(os.environ.get("HEAVY_MAX_PENDING", "8"))
+
+# Cache des PDF rendus (dossier partagé entre workers ; vide = mémoire seulement)
+PDF_CACHE_DIR = os.environ.get(
+    "PDF_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pdf_cache"),
+)
+
+# Transcription du PDF : chunks lus par pages de cette taille
+PDF_TRANSCRIPT_PAGE_SIZE = int(os.environ.get("PDF_TRANSCRIPT_PAGE_SIZE", "500"))
+
+# Export du transcript : taille de page par défaut / maximale (?limit=)
+EXPORT_PAGE_SIZE = int(os.environ.get("EXPORT_PAGE_SIZE", "500"))
+EXPORT_MAX_PAGE_SIZE = int(os.environ.get("EXPORT_MAX_PAGE_SIZE", "2000"))
+
+# Flux live SSE : intervalle de vérification (s) et nb de chunks envoyés à la 1re connexion
+LIVE_STREAM_INTERVAL = float(os.environ.get("LIVE_STREAM_INTERVAL", "0.25"))
+LIVE_STREAM_BACKLOG = int(os.environ.get("LIVE_STREAM_BACKLOG", "20"))
+
+# Cache des traductions (LRU mémoire + Redis optionnel avec TTL en secondes)
+TRANSLATION_CACHE_SIZE = int(os.environ.get("TRANSLATION_CACHE_SIZE", "2048"))
+TRANSLATION_CACHE_REDIS = os.environ.get("TRANSLATION_CACHE_REDIS", "1") == "1"
+TRANSLATION_CACHE_TTL = int(os.environ.get("TRANSLATION_CACHE_TTL", str(7 * 24 * 3600)))
+
 if not MISTRAL_API_KEY:
     raise ValueError("MISTRAL_API_KEY is not set in environment variables.")
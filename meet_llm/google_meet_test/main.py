@@ -1,4 +1,5 @@
 import os
+import sys
 import json
 import datetime
 import requests
@@ -11,8 +12,10 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 TOKEN_PATH = os.path.join(BASE_DIR, "token.json")
 CLIENT_SECRET_PATH = os.path.join(BASE_DIR, "client_secret.json")  # ✅ FIXED
 
-# Fichier partagé avec l'agent
-MEETING_STATE_PATH = os.path.join(BASE_DIR, "..", "current_meeting.json")
+# Meeting courant partagé avec l'agent : on passe par le même meeting store (même schéma)
+if os.path.dirname(BASE_DIR) not in sys.path:
+    sys.path.insert(0, os.path.dirname(BASE_DIR))
+from meeting_store import get_meeting_store
 
 # === Scopes ===
 SCOPES = [
@@ -112,19 +115,16 @@ def create_calendar_event_with_meet(creds, attendees_emails, duration_minutes=60
 
     data = r.json()
 
-    # Écriture du meeting courant dans current_meeting.json
-    meeting_state = {
-        "start": start_dt.isoformat(),
-        "end": end_dt.isoformat(),
-        "meet_link": data.get("hangoutLink"),
-        "calendar_link": data.get("htmlLink"),
-        "active_speakers": [],
-    }
-
-    with open(MEETING_STATE_PATH, "w", encoding="utf-8") as f:
-        json.dump(meeting_state, f, indent=2)
+    # Écriture du meeting courant (meeting store)
+    meeting_state = get_meeting_store().save_current_meeting(
+        start=start_dt.isoformat(),
+        end=end_dt.isoformat(),
+        meet_link=data.get("hangoutLink"),
+        calendar_link=data.get("htmlLink"),
+        participants=list(attendees_emails),
+    )
 
-    print("\n✅ Créneau meeting enregistré dans current_meeting.json")
+    print("\n✅ Créneau meeting enregistré (meeting courant)")
     print("Meet link:", data.get("hangoutLink"))
     print("Event (Calendar):", data.get("htmlLink"))
     print("Début :", meeting_state["start"])
@@ -0,0 +1,125 @@
+# hierarchical_summary.py
+"""
+Résumé map-reduce pour les longues réunions :
+1. les chunks (itérés page par page, cf. MeetingStore.iter_chunks) sont découpés en fenêtres de ~SUMMARY_WINDOW_CHARS caractères
+2. map : chaque fenêtre est résumée, en parallèle (les limites de débit restent celles de mistral_async)
+3. reduce : les résumés de fenêtres sont combinés (récursivement si besoin) en compte-rendu final
+
+Les résumés de fenêtres sont mis en cache dans le meeting store, indexés par (position, hash du contenu) :
+un ré-export ne résume que les fenêtres nouvelles ou modifiées (en pratique la dernière).
+"""
+import hashlib
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+from mistral_client import ask_mistral, summarize_meeting_paragraphs
+from meeting_store import get_meeting_store
+from config import SUMMARY_WINDOW_CHARS, MISTRAL_MAX_IN_FLIGHT
+
+
+def chunk_line(c: dict) -> str:
+    """Texte d'un chunk pour le résumé (on favorise la traduction)."""
+    return c.get("translated") or c.get("text") or ""
+
+
+def split_windows(chunks: Iterable[dict], window_chars: int = SUMMARY_WINDOW_CHARS) -> list[str]:
+    """
+    Découpe en fenêtres de texte. Les frontières ne dépendent que des chunks précédents,
+    donc les fenêtres déjà complètes restent identiques quand la réunion continue.
+    """
+    windows, lines, size = [], [], 0
+    for c in chunks:
+        line = chunk_line(c)
+        if not line:
+            continue
+        if lines and size + len(line) > window_chars:
+            windows.append("\n".join(lines))
+            lines, size = [], 0
+        lines.append(line)
+        size += len(line) + 1
+    if lines:
+        windows.append("\n".join(lines))
+    return windows
+
+
+def _window_key(level: int, index: int, text: str) -> str:
+    digest = hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+    return f"{level}:{index}:{digest}"
+
+
+def _summarize_window(level: int, index: int, total: int, text: str,
+                      meeting_id: str | None = None) -> str:
+    key = _window_key(level, index, text)
+    cached = get_meeting_store().get_window_summary(key, mid=meeting_id)
+    if cached:
+        return cached
+
+    prompt = (
+        f"Voici la partie {index + 1}/{total} de la transcription d'une réunion.\n"
+        "Résume-la EN FRANÇAIS UNIQUEMENT, de manière factuelle et concise :\n"
+        "- thèmes abordés, points clés, décisions, actions à suivre (avec les personnes si citées)\n"
+        "- ignore les répétitions, hésitations et phrases sans intérêt\n"
+        "- pas d'introduction ni de conclusion\n\n"
+        f"{text}"
+    )
+    summary = ask_mistral(prompt, temperature=0.2)
+    if summary is None:
+        # pas de cache : on retentera au prochain export
+        print(f"[hierarchical_summary] fenêtre {level}:{index} non résumée (Mistral indisponible)")
+        return text[:1000]
+
+    get_meeting_store().set_window_summary(key, summary, mid=meeting_id)
+    return summary
+
+
+def _map(level: int, texts: list[str], meeting_id: str | None = None) -> list[str]:
+    if len(texts) == 1:
+        return [_summarize_window(level, 0, 1, texts[0], meeting_id)]
+    with ThreadPoolExecutor(max_workers=max(1, MISTRAL_MAX_IN_FLIGHT)) as pool:
+        futures = [
+            pool.submit(_summarize_window, level, i, len(texts), t, meeting_id)
+            for i, t in enumerate(texts)
+        ]
+        return [f.result() for f in futures]
+
+
+def _group(texts: list[str], max_chars: int) -> list[str]:
+    groups, current, size = [], [], 0
+    for t in texts:
+        if current and size + len(t) > max_chars:
+            groups.append("\n\n".join(current))
+            current, size = [], 0
+        current.append(t)
+        size += len(t) + 2
+    if current:
+        groups.append("\n\n".join(current))
+    return groups
+
+
+def summarize_chunks(chunks: Iterable[dict], target_lang: str = "fr",
+                     window_chars: int = SUMMARY_WINDOW_CHARS,
+                     meeting_id: str | None = None) -> str:
+    """
+    Compte-rendu final de toute la réunion, quelle que soit sa longueur.
+    `meeting_id` : réunion dont le cache de fenêtres est utilisé (courante par défaut).
+    """
+    windows = split_windows(chunks, window_chars)
+    if not windows:
+        return "Résumé non disponible (aucun contenu exploitable)."
+    if len(windows) == 1:
+        return summarize_meeting_paragraphs(windows[0], target_lang)
+
+    level, texts = 0, windows
+    summaries = _map(level, texts, meeting_id)
+    # reduce : tant que les résumés ne tiennent pas dans une fenêtre, on les résume par groupes
+    while sum(len(s) for s in summaries) > window_chars and len(summaries) > 1:
+        level += 1
+        groups = _group(summaries, window_chars)
+        if len(groups) == len(summaries):
+            break  # chaque résumé remplit déjà une fenêtre, on ne gagnerait rien
+        summaries = _map(level, groups, meeting_id)
+
+    combined = "\n\n".join(
+        f"Partie {i + 1} :\n{s}" for i, s in enumerate(summaries)
+    )
+    return summarize_meeting_paragraphs(combined, target_lang)
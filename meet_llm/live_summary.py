@@ -0,0 +1,139 @@
+# live_summary.py
+import threading
+import time
+
+from mistral_client import ask_mistral
+from meeting_store import get_meeting_store
+from config import (
+    LIVE_SUMMARY_EVERY_CHUNKS,
+    LIVE_SUMMARY_EVERY_SECONDS,
+    LIVE_SUMMARY_MAX_INPUT_CHARS,
+    LIVE_SUMMARY_MAX_CHARS,
+)
+
+
+class LiveSummarizer:
+    """
+    Résumé live en arrière-plan, stocké dans le meeting store (get_summary / set_summary).
+
+    - notify() est appelé à chaque chunk sauvegardé
+    - une mise à jour part quand `every_chunks` nouveaux chunks sont arrivés,
+      ou après `every_seconds` s'il y a au moins un nouveau chunk (debounce)
+    - le prompt est borné : résumé actuel (<= max_summary_chars) + nouveaux chunks
+      (<= max_input_chars) ; le reste sera traité au tour suivant
+    - le curseur (get_summary_cursor) est l'ID du dernier chunk intégré
+    """
+
+    def __init__(self, meeting_id: str | None = None,
+                 every_chunks: int = LIVE_SUMMARY_EVERY_CHUNKS,
+                 every_seconds: float = LIVE_SUMMARY_EVERY_SECONDS,
+                 max_input_chars: int = LIVE_SUMMARY_MAX_INPUT_CHARS,
+                 max_summary_chars: int = LIVE_SUMMARY_MAX_CHARS):
+        self.meeting_id = meeting_id
+        self.store = get_meeting_store()
+        self.every_chunks = max(1, every_chunks)
+        self.every_seconds = every_seconds
+        self.max_input_chars = max_input_chars
+        self.max_summary_chars = max_summary_chars
+
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._last_run = time.monotonic()
+        self.updates = 0
+
+    def notify(self, n: int = 1):
+        with self._lock:
+            self._pending += n
+            if self._pending >= self.every_chunks:
+                self._wake.set()
+
+    def start(self):
+        self._stop.clear()
+        self._last_run = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name=f"live-summary-{self.meeting_id}", daemon=True)
+        self._thread.start()
+
+    def stop(self, final_update: bool = True):
+        """Arrête le thread ; par défaut intègre les derniers chunks avant de rendre la main."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if final_update:
+            while self._pending_chunks() > 0:
+                if not self.update():
+                    break
+
+    def _due(self) -> bool:
+        with self._lock:
+            pending = self._pending
+        if pending >= self.every_chunks:
+            return True
+        return pending > 0 and time.monotonic() - self._last_run >= self.every_seconds
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(timeout=1.0)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            if self._due():
+                try:
+                    self.update()
+                except Exception as e:
+                    print("[live_summary] update error:", e)
+
+    def _pending_chunks(self) -> int:
+        with self._lock:
+            return self._pending
+
+    def update(self) -> bool:
+        """Une mise à jour du résumé. Retourne False si rien n'a pu être intégré."""
+        self._last_run = time.monotonic()
+        mid = self.meeting_id
+        cursor = self.store.get_summary_cursor(mid=mid)
+        new_chunks = self.store.get_chunks_since(cursor, count=200, mid=mid)
+        if not new_chunks:
+            with self._lock:
+                self._pending = 0
+            return False
+
+        # on prend les nouveaux chunks dans l'ordre jusqu'au budget de caractères
+        lines, used, taken = [], 0, 0
+        for c in new_chunks:
+            line = c.get("translated") or c.get("text") or ""
+            if taken and used + len(line) > self.max_input_chars:
+                break
+            lines.append(line[:self.max_input_chars])
+            used += len(line)
+            taken += 1
+
+        current_summary = self.store.get_summary(mid=mid)[-self.max_summary_chars:]
+        prompt = (
+            "Résumé de la réunion jusqu'à présent (en français) :\n"
+            f"{current_summary or '(vide)'}\n\n"
+            "Nouveaux extraits de la transcription (dans l'ordre) :\n"
+            + "\n".join(f"- {l}" for l in lines if l)
+            + "\n\n"
+            "Mets à jour le résumé de la réunion, de manière claire et concise, "
+            "EN FRANÇAIS UNIQUEMENT, en gardant seulement les informations importantes. "
+            "Rédige en paragraphes, sans listes à puces, "
+            f"en {self.max_summary_chars} caractères maximum. "
+            "Réponds uniquement avec le résumé mis à jour."
+        )
+
+        updated = ask_mistral(prompt, temperature=0.2)
+        if updated is None:
+            print("[live_summary] Mistral indisponible, résumé inchangé.")
+            return False
+
+        self.store.set_summary(updated, mid=mid)
+        self.store.set_summary_cursor(new_chunks[taken - 1]["id"], mid=mid)
+        with self._lock:
+            self._pending = max(0, self._pending - taken)
+        self.updates += 1
+        print(f"[live_summary] résumé mis à jour (+{taken} chunks)")
+        return True
@@ -1,32 +1,33 @@
 import os
 import json
+import uuid
+import asyncio
 import datetime
 from dotenv import load_dotenv
 
-from redis_client import (
-    reset_meeting_memory,
-    append_chunk,
-    get_all_chunks,
-    get_summary,
-    set_summary,
-    add_action_item,
-    get_action_items,
-    get_last_chunks,
+from meeting_store import get_meeting_store, get_async_meeting_store, is_chunk_id, STREAM_START
+
+from mistral_client import translate_and_summarize_async
+from hierarchical_summary import summarize_chunks
+from retrieval import get_meeting_index
+from config import (
+    TARGET_LANG,
+    RETRIEVAL_TOP_K,
+    RETRIEVAL_RECENT_CHUNKS,
+    PDF_TRANSCRIPT_PAGE_SIZE,
+    EXPORT_PAGE_SIZE,
+    EXPORT_MAX_PAGE_SIZE,
 )
-
-from mistral_client import translate_and_summarize, summarize_meeting_paragraphs
-from config import TARGET_LANG
 from io import BytesIO
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph
+from xml.sax.saxutils import escape
 
-CURRENT_MEETING_FILE = os.path.join(
-    os.path.dirname(os.path.dirname(__file__)),
-    "current_meeting.json"
-)
 
 # Fonts configuration (Inter si dispo, sinon fallback Helvetica)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -51,88 +52,115 @@ load_dotenv()
 
 def load_current_meeting():
     """
-    Lit current_meeting.json qui contient meet_link etc.
-    Garantit toujours les clés : meet_link, start, end, participants.
+    Infos du meeting courant (lien Meet, participants...), via le meeting store.
+    Garantit toujours les clés : meet_link, start, end, participants, calendar_link.
     """
-    if not os.path.exists(CURRENT_MEETING_FILE):
-        return {
-            "meet_link": None,
-            "start": None,
-            "end": None,
-            "participants": [],
-        }
+    return get_meeting_store().load_current_meeting()
 
-    try:
-        with open(CURRENT_MEETING_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except Exception:
-        # En cas de fichier corrompu ou lecture impossible
-        return {
-            "meet_link": None,
-            "start": None,
-            "end": None,
-            "participants": [],
-        }
 
-    # On s'assure que toutes les clés existent
-    return {
-        "meet_link": data.get("meet_link"),
-        "start": data.get("start"),
-        "end": data.get("end"),
-        "participants": data.get("participants", []),
-    }
+def save_current_meeting(meet_link=None, start=None, end=None, participants=None):
+    """
+    Met à jour le meeting courant en conservant les champs existants.
+    """
+    get_meeting_store().save_current_meeting(
+        meet_link=meet_link,
+        start=start,
+        end=end,
+        participants=participants,
+    )
 
 
-def save_current_meeting(meet_link=None, start=None, end=None, participants=None):
+def chunk_time(chunk, meeting_start=None):
+    """
+    Heure (HH:MM:SS) où la phrase a été dite : début de la réunion + "start" du chunk
+    (temps de parole stocké avec le chunk) ; à défaut, heure d'écriture lue dans l'ID "<ms>-<seq>".
+    """
+    if chunk.get("start") is not None and meeting_start:
+        try:
+            origin = datetime.datetime.fromisoformat(meeting_start)
+            return (origin + datetime.timedelta(seconds=chunk["start"])).strftime("%H:%M:%S")
+        except ValueError:
+            pass
+    ms = int(chunk["id"].partition("-")[0])
+    if ms == 0:
+        return ""  # chunk migré de l'ancienne liste Redis : heure inconnue
+    return datetime.datetime.fromtimestamp(ms / 1000).strftime("%H:%M:%S")
+
+
+def new_meeting_id():
+    return uuid.uuid4().hex[:12]
+
+
+def load_meeting(meeting_id):
     """
-    Écrit dans current_meeting.json en conservant les champs existants.
+    Infos d'une réunion précise ; mêmes clés que load_current_meeting, plus "id".
     """
-    data = load_current_meeting()
+    return get_meeting_store().load_meeting(meeting_id)
 
-    if meet_link is not None:
-        data["meet_link"] = meet_link
-    if start is not None:
-        data["start"] = start
-    if end is not None:
-        data["end"] = end
-    if participants is not None:
-        data["participants"] = participants
 
-    with open(CURRENT_MEETING_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+def save_meeting(meeting_id, meet_link=None, start=None, end=None, participants=None):
+    """
+    Met à jour les infos d'une réunion en conservant les champs existants.
+    """
+    get_meeting_store().save_meeting(
+        meeting_id,
+        meet_link=meet_link,
+        start=start,
+        end=end,
+        participants=participants,
+    )
 
 
-def start_meeting(source_lang, target_lang):
+def start_meeting(source_lang, target_lang, meeting_id=None):
     """
-    Appelé par /api/meeting/start.
-    - reset Redis memory
+    Appelé par /api/meeting/start et POST /api/meetings.
+    - crée un ID de réunion (devient la réunion "courante")
+    - reset de la mémoire (transcript, résumé) de cette réunion
     - note l'heure de début
     - (optionnel) configure langues
     """
-    reset_meeting_memory()
+    store = get_meeting_store()
+    meeting_id = meeting_id or new_meeting_id()
+    store.reset_meeting_memory(meeting_id)
 
     now_iso = datetime.datetime.now().isoformat(timespec="seconds")
     save_current_meeting(start=now_iso)
 
+    # lien Meet / participants du meeting courant (écrits par /api/meeting/invite)
+    current = load_current_meeting()
+    save_meeting(
+        meeting_id,
+        meet_link=current.get("meet_link"),
+        start=now_iso,
+        participants=current.get("participants", []),
+    )
+    store.register_meeting(meeting_id, now_iso)
+    store.set_current_meeting_id(meeting_id)
+
     return {
         "ok": True,
+        "meeting_id": meeting_id,
         "start": now_iso,
     }
 
 
-def stop_meeting():
+def stop_meeting(meeting_id):
     """
     Appelé par /api/meeting/stop.
-    - set end time
+    - set end time (infos du meeting courant seulement si c'est lui qu'on arrête)
     - renvoie un résumé final exploitable
     """
+    store = get_meeting_store()
     now_iso = datetime.datetime.now().isoformat(timespec="seconds")
-    save_current_meeting(end=now_iso)
+    if meeting_id == store.get_meeting_id():
+        save_current_meeting(end=now_iso)
+    save_meeting(meeting_id, end=now_iso)
 
-    summary_live = get_summary()
-    actions = get_action_items()
+    summary_live = store.get_summary(mid=meeting_id)
+    actions = store.get_action_items(mid=meeting_id)
 
     final_report = {
+        "meeting_id": meeting_id,
         "ended_at": now_iso,
         "summary": summary_live,
         "actions": actions,
@@ -140,15 +168,32 @@ def stop_meeting():
     return final_report
 
 
-def build_live_state(status, speaker=None, participants=None):
+async def list_all_meetings():
+    """
+    Réunions connues, de la plus récente à la plus ancienne.
+    """
+    meetings = [
+        {"meeting_id": mid, "start": started_at}
+        for mid, started_at in (await get_async_meeting_store().list_meetings()).items()
+    ]
+    return sorted(meetings, key=lambda m: m["start"] or "", reverse=True)
+
+
+async def build_live_state(meeting_id, status, speaker=None, participants=None):
     """
-    Construit l'état live retourné par /api/meeting/info.
+    Construit l'état live retourné par /api/live/state (lectures store en async).
     """
-    meet = load_current_meeting()
-    last_chunks = get_last_chunks(n=6)
+    store = get_async_meeting_store()
+    meet, last_chunks, partial = await asyncio.gather(
+        store.load_meeting(meeting_id),
+        store.get_last_chunks(n=6, mid=meeting_id),
+        store.get_partial(mid=meeting_id),
+    )
 
     formatted_chunks = [
         {
+            "id": c.get("id"),
+            "text": c.get("text", ""),
             "source": c.get("text", ""),
             "translated": c.get("translated", ""),
         }
@@ -156,68 +201,157 @@ def build_live_state(status, speaker=None, participants=None):
     ]
 
     return {
+        "meeting_id": meeting_id,
         "status": status,
         "meet_link": meet.get("meet_link"),
         "participants": participants or meet.get("participants", []),
         "speaker": speaker or None,
         "recent_chunks": formatted_chunks,
+        "partial": partial,
     }
 
 
-def generate_export_report():
-    meet = load_current_meeting()
-    all_chunks = get_all_chunks()
-    actions_list = get_action_items()
-
-    # 1) On récupère un éventuel résumé déjà construit en live (si tu en as).
-    summary_live = get_summary()
+async def build_live_delta(meeting_id, last_id, epoch=None, summary_version=None, max_chunks=500):
+    """
+    Nouveautés après le chunk `last_id` pour le flux /api/live/stream.
+    Coût proportionnel aux nouvelles données, pas à la taille du transcript.
+    Si l'époque a changé (nouvelle réunion), on repart du début.
+    """
+    store = get_async_meeting_store()
+    current_epoch, partial, version = await store.get_live_counters(mid=meeting_id)
+    reset = epoch is not None and current_epoch != epoch
+    if reset:
+        last_id = STREAM_START
+    chunks = await store.get_chunks_since(last_id, count=max_chunks, mid=meeting_id)
+    summary = await store.get_summary(mid=meeting_id) if version != summary_version else None
+    return {
+        "reset": reset,
+        "epoch": current_epoch,
+        "chunks": chunks,
+        "last_id": chunks[-1]["id"] if chunks else last_id,
+        "partial": partial,
+        "summary_version": version,
+        "summary": summary,
+    }
 
-    # 2) Si pas de résumé live, on en génère un propre
-    if not summary_live:
-        lines = []
 
-        for c in all_chunks:
-            # On favorise la traduction (normalement déjà en TARGET_LANG)
-            if c.get("translated"):
-                lines.append(c["translated"])
-            elif c.get("text"):
-                lines.append(c["text"])
+def build_export_summary(meeting_id):
+    """
+    Partie "légère" de l'export (infos, résumé, actions), sans le transcript :
+    la page Summary l'affiche pendant que le transcript se charge par pages.
+    """
+    store = get_meeting_store()
+    meet = load_meeting(meeting_id)
+    actions_list = store.get_action_items(mid=meeting_id)
 
-        # On limite un peu la taille pour éviter d'envoyer 50km de texte
-        # (optionnel, ajuste 4000/8000 selon ton usage)
-        context_text = "\n".join(lines)[-8000:]
+    # 1) On récupère un éventuel résumé déjà construit en live (si tu en as).
+    summary_live = store.get_summary(mid=meeting_id)
 
-        if context_text.strip():
-            summary_live = summarize_meeting_paragraphs(context_text, TARGET_LANG)
-        else:
-            summary_live = "Résumé non disponible (aucun contenu exploitable)."
+    # 2) Si pas de résumé live, on en génère un propre, sur TOUTE la réunion
+    #    (map-reduce par fenêtres, résumés de fenêtres en cache, chunks lus par pages)
+    if not summary_live:
+        summary_live = summarize_chunks(store.iter_chunks(EXPORT_PAGE_SIZE, mid=meeting_id),
+                                        TARGET_LANG, meeting_id=meeting_id)
 
     return {
+        "meeting_id": meeting_id,
         "title": f"Meeting report {meet.get('start','')}",
         "meet_link": meet.get("meet_link", ""),
         "start": meet.get("start"),
         "end": meet.get("end"),
         "summary": summary_live,
         "actions": actions_list,
-        "raw_transcript": all_chunks,
+        "chunk_count": store.get_chunk_count(mid=meeting_id),
     }
 
 
-def answer_question(question: str):
+def generate_export_report(meeting_id):
+    """Export complet en un seul objet (résumé + transcript brut) ; préférer les pages pour les longues réunions."""
+    report = build_export_summary(meeting_id)
+    report["raw_transcript"] = get_meeting_store().get_all_chunks(mid=meeting_id)
+    return report
+
+
+def check_cursor(cursor):
+    """
+    Curseur de pagination venu du client : None ou un ID de chunk "<ms>-<seq>".
+    Sinon ValueError (Redis répondrait "Invalid stream ID", les autres backends planteraient sur int()).
+    """
+    if cursor is not None and not is_chunk_id(cursor):
+        raise ValueError(f"invalid cursor {cursor!r}: expected <ms>-<seq>")
+
+
+async def export_transcript_page(meeting_id, cursor=None, limit=EXPORT_PAGE_SIZE):
+    """Une page du transcript : {chunks, next_cursor} (next_cursor None => fin)."""
+    check_cursor(cursor)
+    limit = max(1, min(limit, EXPORT_MAX_PAGE_SIZE))
+    chunks, next_cursor = await get_async_meeting_store().get_chunks_page(cursor, count=limit, mid=meeting_id)
+    return {
+        "meeting_id": meeting_id,
+        "chunks": chunks,
+        "next_cursor": next_cursor,
+    }
+
+
+async def iter_export_ndjson(meeting_id, cursor=None, page_size=EXPORT_PAGE_SIZE):
+    """
+    Export en NDJSON (une ligne JSON par enregistrement), lu page par page :
+    {"type": "meeting", ...} puis {"type": "chunk", ...} par chunk, puis {"type": "end", ...}.
+    Le résumé n'est pas dans le flux (cf. build_export_summary).
+    """
+    check_cursor(cursor)
+    page_size = max(1, min(page_size, EXPORT_MAX_PAGE_SIZE))
+    store = get_async_meeting_store()
+    meet, actions = await asyncio.gather(
+        store.load_meeting(meeting_id),
+        store.get_action_items(mid=meeting_id),
+    )
+    header = {"type": "meeting", "meeting_id": meeting_id, **meet, "actions": actions}
+    yield json.dumps(header, ensure_ascii=False) + "\n"
+
+    count, last_id = 0, cursor
+    while True:
+        chunks, next_cursor = await store.get_chunks_page(last_id, count=page_size, mid=meeting_id)
+        if chunks:
+            yield "".join(json.dumps({"type": "chunk", **c}, ensure_ascii=False) + "\n" for c in chunks)
+            count += len(chunks)
+            last_id = chunks[-1]["id"]
+        if next_cursor is None:
+            break
+    yield json.dumps({"type": "end", "count": count, "last_id": last_id}) + "\n"
+
+
+async def answer_question(meeting_id, question: str):
     """
     Version ChatGPT : le bot peut répondre à tout, 
     et utilise la réunion uniquement comme contexte supplémentaire.
+    Contexte borné quelle que soit la durée : résumé live + extraits pertinents
+    (index de recherche) + quelques extraits récents.
     """
+    store = get_async_meeting_store()
 
-    summary_live = get_summary()
-    chunks = get_all_chunks()
-    last_chunks = chunks[-10:] if len(chunks) > 10 else chunks
+    summary_live, last_chunks = await asyncio.gather(
+        store.get_summary(mid=meeting_id),
+        store.get_last_chunks(n=RETRIEVAL_RECENT_CHUNKS, mid=meeting_id),
+    )
+    relevant_chunks = await asyncio.to_thread(
+        get_meeting_index(meeting_id).search,
+        question,
+        k=RETRIEVAL_TOP_K,
+        exclude_ids=[c["id"] for c in last_chunks],
+    )
 
     # Construit un contexte optionnel (pas obligatoire)
     context_txt = ""
     if summary_live:
         context_txt += "Résumé de la réunion:\n" + summary_live + "\n\n"
 
+    if relevant_chunks:
+        context_txt += "Extraits pertinents (ordre chronologique):\n"
+        for c in relevant_chunks:
+            context_txt += f"- {c.get('text', '')} / {c.get('translated', '')}\n"
+        context_txt += "\n"
+
     if last_chunks:
         context_txt += "Extraits récents:\n"
         for c in last_chunks:
@@ -240,40 +374,44 @@ QUESTION :
 Réponds en {TARGET_LANG}, de manière claire et naturelle.
 """
 
-    answer = translate_and_summarize(prompt_for_llm, TARGET_LANG)
+    answer = await translate_and_summarize_async(prompt_for_llm, TARGET_LANG)
     return answer
 
 
-def build_summary_pdf():
+def build_summary_pdf(meeting_id, output=None):
     """
     PDF 'Compte-rendu de réunion' avec style glassmorphism :
     - bandeau vert en haut
     - page 1 : titre + carte infos
     - page 2 : résumé dans une carte "verre"
     - page 3 : actions dans une carte "verre"
+    - puis : transcription complète EN + FR
+
+    Les textes sont des Paragraph Platypus (coupure des lignes à la largeur réelle des glyphes).
+    La transcription est lue page par page (iter_chunks) et dessinée au fil de l'eau.
+    `output` : chemin ou fichier binaire où écrire le PDF ; sinon les octets sont retournés.
     """
+    store = get_meeting_store()
 
-    meet = load_current_meeting()
-    all_chunks = get_all_chunks()
-    actions = get_action_items()
+    meet = load_meeting(meeting_id)
+    actions = store.get_action_items(mid=meeting_id)
 
-    # Texte global (on favorise la traduction)
-    transcript_text = ""
-    for c in all_chunks:
-        t = c.get("translated") or c.get("text") or ""
-        if t:
-            transcript_text += t + "\n"
+    # Résumé live déjà maintenu en arrière-plan (live_summary) => pas d'appel LLM
+    summary_paragraphs = store.get_summary(mid=meeting_id)
 
-    # Résumé via LLM
-    summary_paragraphs = summarize_meeting_paragraphs(transcript_text, TARGET_LANG)
+    if not summary_paragraphs:
+        # Résumé via LLM (map-reduce, borné quelle que soit la durée)
+        summary_paragraphs = summarize_chunks(store.iter_chunks(PDF_TRANSCRIPT_PAGE_SIZE, mid=meeting_id),
+                                              TARGET_LANG, meeting_id=meeting_id)
 
-    buffer = BytesIO()
+    buffer = BytesIO() if output is None else output
     p = canvas.Canvas(buffer, pagesize=A4)
     width, height = A4
 
     # Marges & couleurs
     x_margin = 50
     y_margin_top = height - 80
+    y_margin_bottom = 70
     y = y_margin_top
 
     ACCENT = colors.HexColor("#10B981")      # vert émeraude
@@ -283,6 +421,11 @@ def build_summary_pdf():
     CARD_BG = colors.Color(1, 1, 1, alpha=0.95)  # presque blanc (effet verre)
     SHADOW = colors.Color(0, 0, 0, alpha=0.08)   # ombre légère
 
+    BODY_STYLE = ParagraphStyle("body", fontName=BODY_FONT, fontSize=11, leading=16, textColor=DARK)
+    TRANSCRIPT_STYLE = ParagraphStyle("transcript", parent=BODY_STYLE, fontSize=9.5, leading=13)
+    TRANSLATED_STYLE = ParagraphStyle("translated", parent=TRANSCRIPT_STYLE, textColor=TEXT_MUTED,
+                                      leftIndent=12, spaceAfter=6)
+
     # ---------- Helpers ----------
 
     def new_page():
@@ -297,39 +440,45 @@ def build_summary_pdf():
         p.setFillColor(TEXT_MUTED)
         p.drawRightString(width - x_margin, 30, f"Page {page_num}")
 
-    def wrap_text(text, max_chars=95):
-        lines = []
+    def draw_flowable(flowable, indent=22):
+        """Dessine un flowable à y, en le coupant sur plusieurs pages si besoin."""
+        nonlocal y
+        avail_width = width - 2 * x_margin - 2 * indent
+        while flowable is not None:
+            avail_height = y - y_margin_bottom
+            _, h = flowable.wrap(avail_width, avail_height)
+            if h <= avail_height:
+                flowable.drawOn(p, x_margin + indent, y - h)
+                y -= h + flowable.getSpaceAfter()
+                return
+            parts = flowable.split(avail_width, avail_height)
+            if len(parts) == 2:
+                first, flowable = parts
+                first.wrap(avail_width, avail_height)
+                first.drawOn(p, x_margin + indent, y - first.height)
+            elif y == y_margin_top:
+                # même une page vide ne suffit pas : on le dessine tronqué au bas de la page
+                # (et on le signale) plutôt que de perdre le texte sans rien dire
+                print(f"[pdf] {meeting_id} : bloc de {h:.0f} pt plus haut qu'une page, tronqué")
+                p.saveState()
+                clip = p.beginPath()
+                clip.rect(x_margin + indent, y_margin_bottom, avail_width, avail_height)
+                p.clipPath(clip, stroke=0, fill=0)
+                flowable.drawOn(p, x_margin + indent, y - h)
+                p.restoreState()
+                y = y_margin_bottom
+                return
+            draw_page_number()
+            new_page()
+
+    def draw_paragraph(text, style=BODY_STYLE):
+        nonlocal y
         for para in text.split("\n"):
             para = para.strip()
             if not para:
-                lines.append("")
-                continue
-            while len(para) > max_chars:
-                chunk = para[:max_chars]
-                last_space = chunk.rfind(" ")
-                if last_space > 0:
-                    chunk = chunk[:last_space]
-                lines.append(chunk)
-                para = para[len(chunk):].lstrip()
-            if para:
-                lines.append(para)
-        return lines
-
-    def draw_paragraph(text, font=BODY_FONT, size=11, leading=16):
-        nonlocal y
-        p.setFont(font, size)
-        p.setFillColor(DARK)
-
-        for line in wrap_text(text):
-            if y < 90:
-                draw_page_number()
-                new_page()
-                p.setFont(font, size)
-            if line == "":
-                y -= leading / 2
+                y -= style.leading / 2
                 continue
-            p.drawString(x_margin + 22, y, line)
-            y -= leading
+            draw_flowable(Paragraph(escape(para), style))
 
     def draw_section_title(text):
         nonlocal y
@@ -489,4 +638,47 @@ def build_summary_pdf():
     draw_page_number()
     new_page()
 
+    # ---------- PAGE 3 : Actions (glass card) ----------
+
+    draw_section_title("Actions à suivre")
+
+    card_top = y
+    card_height = 300
+    y = draw_glass_card(card_top, card_height, "Actions détectées pendant la réunion")
+
+    if actions:
+        for action in actions:
+            draw_paragraph(f"• {action}")
+    else:
+        draw_paragraph("Aucune action détectée.")
+
+    draw_page_number()
+    new_page()
+
+    # ---------- Transcription complète (EN + FR), lue page par page ----------
+
+    draw_section_title("Transcription complète")
+
+    empty = True
+    for chunk in store.iter_chunks(PDF_TRANSCRIPT_PAGE_SIZE, mid=meeting_id):
+        text = (chunk.get("text") or "").strip()
+        translated = (chunk.get("translated") or "").strip()
+        if not text and not translated:
+            continue
+        empty = False
+        stamp = chunk_time(chunk, meet.get("start"))
+        draw_flowable(Paragraph(f"<font color='#10B981'>{stamp}</font>&nbsp;&nbsp;{escape(text)}",
+                                TRANSCRIPT_STYLE))
+        if translated and translated != text:
+            draw_flowable(Paragraph(escape(translated), TRANSLATED_STYLE))
+        else:
+            y -= TRANSLATED_STYLE.spaceAfter
+    if empty:
+        draw_paragraph("Aucune transcription enregistrée.")
+
+    draw_page_number()
+    p.save()
 
+    if output is None:
+        return buffer.getvalue()
+    return None
@@ -0,0 +1,130 @@
+# meeting_metadata.py
+"""
+Métadonnées du meeting courant dans current_meeting.json (backend "file" de meeting_store).
+
+- un seul schéma : meet_link, start, end, participants, calendar_link
+- lecture depuis une copie en mémoire ; le fichier n'est re-stat qu'au plus toutes les
+  `check_interval` secondes, et relu seulement si son mtime a changé (écriture externe)
+- écriture "write-through" atomique : fichier temporaire + os.replace, sous verrou
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+
+CURRENT_MEETING_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "current_meeting.json"
+)
+
+FIELDS = ("meet_link", "start", "end", "participants", "calendar_link")
+
+
+def empty_meeting() -> dict:
+    return {
+        "meet_link": None,
+        "start": None,
+        "end": None,
+        "participants": [],
+        "calendar_link": None,
+    }
+
+
+def normalize_meeting(data: dict) -> dict:
+    """Toutes les clés du schéma, et seulement elles."""
+    meeting = empty_meeting()
+    for field in FIELDS:
+        if data.get(field) is not None:
+            meeting[field] = data[field]
+    meeting["participants"] = list(meeting["participants"] or [])
+    return meeting
+
+
+def write_json_atomic(path: str, data, indent: int | None = None):
+    """Écrit `data` en JSON via un fichier temporaire du même dossier + os.replace (jamais de fichier à moitié écrit)."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp.", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _copy(meeting: dict) -> dict:
+    return {**meeting, "participants": list(meeting["participants"])}
+
+
+class MeetingMetadataStore:
+    def __init__(self, path: str = CURRENT_MEETING_FILE, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._data = empty_meeting()
+        self._mtime: float | None = None
+        self._checked_at = float("-inf")
+        self.version = 0
+
+    def _stat(self) -> float | None:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _read_file(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return normalize_meeting(json.load(f))
+        except Exception:
+            # En cas de fichier absent, corrompu ou lecture impossible
+            return empty_meeting()
+
+    def _refresh(self, force: bool = False):
+        """À appeler sous verrou : recharge le cache si le fichier a changé."""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        mtime = self._stat()
+        if mtime != self._mtime:
+            self._data = self._read_file()
+            self._mtime = mtime
+            self.version += 1
+
+    def load(self) -> dict:
+        """Copie des métadonnées (sans appel système sur le chemin chaud)."""
+        with self._lock:
+            self._refresh()
+            return _copy(self._data)
+
+    def update(self, **fields) -> dict:
+        """
+        Met à jour les champs donnés (None = inchangé) en conservant les autres,
+        écrit le fichier de façon atomique et met le cache à jour.
+        """
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"unknown meeting fields: {sorted(unknown)}")
+
+        with self._lock:
+            self._refresh(force=True)
+            data = _copy(self._data)
+            for field, value in fields.items():
+                if value is not None:
+                    data[field] = value
+            data = normalize_meeting(data)
+
+            write_json_atomic(self.path, data, indent=2)
+
+            self._data = data
+            self._mtime = self._stat()
+            self._checked_at = time.monotonic()
+            self.version += 1
+            return _copy(data)
+
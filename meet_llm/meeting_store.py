@@ -0,0 +1,809 @@
+# meeting_store.py
+"""
+Stockage des réunions derrière une seule interface (MeetingStore) :
+métadonnées (meeting courant, infos par réunion, index) et transcript
+(chunks, résumé live, partiel, cache du résumé hiérarchique, actions).
+
+Backends (MEETING_STORE) :
+- "redis"  : partagé entre process (plusieurs workers uvicorn) — défaut
+- "file"   : un dossier par réunion sous MEETING_STORE_DIR (un seul process serveur)
+- "memory" : dans le process, pour les tests
+
+Les chunks ont des IDs croissants "<ms>-<seq>" (IDs de Redis Stream pour le backend redis,
+même format pour les autres), utilisés comme curseurs par le flux live, le résumé live
+et les lectures paginées. Partout, `mid=None` désigne la réunion courante.
+"""
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from meeting_metadata import (
+    MeetingMetadataStore, CURRENT_MEETING_FILE, empty_meeting, normalize_meeting, write_json_atomic,
+)
+from chunk_codec import encode_chunk, decode_chunk
+from config import MEETING_STORE, MEETING_STORE_DIR
+
+STREAM_START = "0-0"  # curseur "avant le premier chunk"
+DEFAULT_MEETING_ID = "current"
+
+
+# Métadonnées optionnelles d'un chunk (temps en secondes depuis le début de la réunion) :
+# - start / end : début et fin de la parole du chunk
+# - segments    : [{"start", "end", "conf" (exp(avg_logprob)), "no_speech"}] par segment Whisper
+# - words       : [[mot, start, end], ...] si ASR_WORD_TIMESTAMPS
+CHUNK_META_FIELDS = ("start", "end", "segments", "words")
+
+
+_CHUNK_ID = re.compile(r"\d+-\d+")
+# IDs générés (hex / uuid) et DEFAULT_MEETING_ID : sert aussi de nom de dossier / fichier
+MEETING_ID_PATTERN = r"^[A-Za-z0-9_-]{1,64}$"
+_MEETING_ID = re.compile(MEETING_ID_PATTERN)
+
+
+def is_meeting_id(value) -> bool:
+    """ID de réunion sûr comme nom de fichier (ni "..", ni "/", ni chemin absolu) ?"""
+    return isinstance(value, str) and _MEETING_ID.fullmatch(value) is not None
+
+
+def is_chunk_id(value) -> bool:
+    """Curseur reçu d'un client (cursor, since, Last-Event-ID) au format "<ms>-<seq>" ?"""
+    return isinstance(value, str) and _CHUNK_ID.fullmatch(value) is not None
+
+
+def _id_key(chunk_id: str) -> tuple[int, int]:
+    ms, _, seq = chunk_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class MeetingStore(ABC):
+    """Interface commune des backends (les méthodes abstraites sont à fournir par chacun)."""
+
+    # ---------- réunions ----------
+
+    @abstractmethod
+    def get_meeting_id(self) -> str:
+        """
+        ID de la réunion "courante" (la dernière démarrée), utilisé par les routes
+        historiques /api/meeting/... ; DEFAULT_MEETING_ID si aucune n'a été démarrée.
+        """
+
+    @abstractmethod
+    def set_current_meeting_id(self, mid: str):
+        ...
+
+    @abstractmethod
+    def register_meeting(self, mid: str, started_at: str):
+        """Index des réunions connues (ID -> date de début)."""
+
+    @abstractmethod
+    def list_meetings(self) -> dict:
+        ...
+
+    def _mid(self, mid=None) -> str:
+        return mid or self.get_meeting_id()
+
+    # ---------- métadonnées ----------
+
+    @abstractmethod
+    def load_current_meeting(self) -> dict:
+        """Meeting courant (lien Meet, participants...) : schéma de meeting_metadata."""
+
+    @abstractmethod
+    def save_current_meeting(self, **fields) -> dict:
+        """Met à jour les champs donnés (None = inchangé)."""
+
+    @abstractmethod
+    def load_meeting(self, mid=None) -> dict:
+        """Infos d'une réunion précise, même schéma + "id"."""
+
+    @abstractmethod
+    def save_meeting(self, mid=None, **fields) -> dict:
+        ...
+
+    # ---------- transcript ----------
+
+    @abstractmethod
+    def append_chunk(self, text, translated, mid=None, meta=None) -> str:
+        """
+        Ajoute une phrase au transcript. Retourne l'ID du chunk.
+        `meta` : champs CHUNK_META_FIELDS (horodatage, confiance...) stockés avec le chunk.
+        """
+
+    def get_all_chunks(self, mid=None) -> list[dict]:
+        return self.get_chunks_since(STREAM_START, mid=mid)
+
+    @abstractmethod
+    def get_last_chunks(self, n=6, mid=None) -> list[dict]:
+        """Les n derniers chunks, du plus ancien au plus récent."""
+
+    @abstractmethod
+    def get_chunks_since(self, last_id=STREAM_START, count=None, mid=None) -> list[dict]:
+        """Chunks strictement après l'ID `last_id` (au plus `count`)."""
+
+    def get_chunks_page(self, cursor=None, count=100, mid=None):
+        """Page de chunks : (chunks, curseur suivant ou None si fini)."""
+        chunks = self.get_chunks_since(cursor or STREAM_START, count=count, mid=mid)
+        next_cursor = chunks[-1]["id"] if len(chunks) == count else None
+        return chunks, next_cursor
+
+    def iter_chunks(self, page_size=500, mid=None):
+        """Tous les chunks dans l'ordre, lus page par page (mémoire bornée à une page)."""
+        cursor = None
+        while True:
+            chunks, cursor = self.get_chunks_page(cursor, count=page_size, mid=mid)
+            yield from chunks
+            if cursor is None:
+                return
+
+    @abstractmethod
+    def get_chunk_count(self, mid=None) -> int:
+        ...
+
+    @abstractmethod
+    def get_live_counters(self, mid=None):
+        """(époque de la réunion, partiel, version du résumé) pour le flux live."""
+
+    @abstractmethod
+    def set_summary(self, summary_text, mid=None):
+        ...
+
+    @abstractmethod
+    def get_summary(self, mid=None) -> str:
+        ...
+
+    @abstractmethod
+    def get_summary_cursor(self, mid=None) -> str:
+        """ID du dernier chunk intégré dans le résumé live (sert aussi de version du résumé)."""
+
+    @abstractmethod
+    def set_summary_cursor(self, chunk_id, mid=None):
+        ...
+
+    @abstractmethod
+    def set_partial(self, text, mid=None):
+        """Hypothèse partielle (instable) du transcripteur streaming."""
+
+    @abstractmethod
+    def get_partial(self, mid=None) -> str:
+        ...
+
+    @abstractmethod
+    def get_window_summary(self, window_key, mid=None):
+        """Résumé d'une fenêtre de transcript (cache du résumé hiérarchique)."""
+
+    @abstractmethod
+    def set_window_summary(self, window_key, summary_text, mid=None):
+        ...
+
+    @abstractmethod
+    def add_action_item(self, item_text, mid=None):
+        ...
+
+    @abstractmethod
+    def get_action_items(self, mid=None) -> list[str]:
+        ...
+
+    @abstractmethod
+    def reset_meeting_memory(self, mid=None):
+        """Efface le transcript et l'état live d'une réunion ; les flux live repartent de zéro."""
+
+
+# ---------- Redis ----------
+
+def _meeting_key(mid: str, name: str) -> str:
+    """Clé Redis meeting:<id>:<name>, partagée par RedisMeetingStore et AsyncRedisMeetingStore."""
+    return f"meeting:{mid}:{name}"
+
+
+# lus ensemble en un aller-retour par get_live_counters (sync et async)
+LIVE_COUNTER_KEYS = ("epoch", "partial", "summary_cursor")
+
+
+class RedisMeetingStore(MeetingStore):
+    """
+    Clés meeting:<id>:* ; les chunks sont dans un Redis Stream (meeting:<id>:chunks),
+    ce qui permet de lire "les n derniers", "depuis l'ID X" ou une page en O(n demandé).
+    Les chunks sont encodés par chunk_codec et lus via `raw_conn` (réponses en octets).
+    """
+
+    CURRENT_MEETING_KEY = "meetings:current"
+    CURRENT_INFO_KEY = "meetings:current:info"
+    INDEX_KEY = "meetings:index"
+
+    def __init__(self, conn, raw_conn=None):
+        self.r = conn
+        self.rb = raw_conn or conn
+        self._migrated: set[str] = set()  # réunions dont la liste historique a été vérifiée
+
+    def get_meeting_id(self):
+        return self.r.get(self.CURRENT_MEETING_KEY) or DEFAULT_MEETING_ID
+
+    def set_current_meeting_id(self, mid):
+        self.r.set(self.CURRENT_MEETING_KEY, mid)
+
+    def register_meeting(self, mid, started_at):
+        self.r.hset(self.INDEX_KEY, mid, started_at)
+
+    def list_meetings(self):
+        return self.r.hgetall(self.INDEX_KEY)
+
+    def _load_json(self, key) -> dict:
+        raw = self.r.get(key)
+        if not raw:
+            return {}
+        try:
+            return json.loads(raw)
+        except Exception:
+            return {}
+
+    def _update_json(self, key, fields) -> dict:
+        data = normalize_meeting(self._load_json(key))
+        data.update({k: v for k, v in fields.items() if v is not None})
+        data = normalize_meeting(data)
+        self.r.set(key, json.dumps(data))
+        return data
+
+    def load_current_meeting(self):
+        return normalize_meeting(self._load_json(self.CURRENT_INFO_KEY))
+
+    def save_current_meeting(self, **fields):
+        return self._update_json(self.CURRENT_INFO_KEY, fields)
+
+    def load_meeting(self, mid=None):
+        mid = self._mid(mid)
+        return {"id": mid, **normalize_meeting(self._load_json(_meeting_key(mid, "info")))}
+
+    def save_meeting(self, mid=None, **fields):
+        mid = self._mid(mid)
+        return {"id": mid, **self._update_json(_meeting_key(mid, "info"), fields)}
+
+    def _chunks_key(self, mid=None):
+        mid = self._mid(mid)
+        if mid not in self._migrated:
+            self._migrate_legacy_chunks(mid)
+        return _meeting_key(mid, "chunks")
+
+    def _migrate_legacy_chunks(self, mid):
+        """
+        Réunions enregistrées avant le Redis Stream : chunks en JSON dans la liste meeting:<id>:raw.
+        Migration unique et atomique (WATCH) vers le stream, avant les chunks déjà présents :
+        IDs "0-<n>" (l'heure d'écriture n'était pas stockée), les chunks du stream gardent leur ID.
+        """
+        raw_key, chunks_key = _meeting_key(mid, "raw"), _meeting_key(mid, "chunks")
+
+        def migrate(pipe):
+            legacy = pipe.lrange(raw_key, 0, -1)
+            if not legacy:
+                return
+            existing = pipe.xrange(chunks_key, "-", "+")
+            pipe.multi()
+            pipe.delete(chunks_key)
+            n = 0
+            for item in legacy:
+                try:
+                    entry = json.loads(item)
+                except ValueError:
+                    continue
+                n += 1
+                pipe.xadd(chunks_key, encode_chunk(entry), id=f"0-{n}")
+            for entry_id, fields in existing:
+                pipe.xadd(chunks_key, fields, id=entry_id)
+            pipe.delete(raw_key)
+            print(f"[meeting_store] {mid} : {n} chunks migrés de {raw_key} vers {chunks_key}")
+
+        self.rb.transaction(migrate, raw_key, chunks_key)
+        self._migrated.add(mid)
+
+    @staticmethod
+    def _decode_entries(entries):
+        """[(id, {tag: données}), ...] -> [{"id": id, "text": ..., "translated": ...}, ...]"""
+        out = []
+        for entry_id, fields in entries:
+            chunk = decode_chunk(fields)
+            if chunk is None:
+                continue
+            chunk["id"] = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+            out.append(chunk)
+        return out
+
+    def append_chunk(self, text, translated, mid=None, meta=None):
+        entry = {"text": text, "translated": translated, **(meta or {})}
+        chunk_id = self.rb.xadd(self._chunks_key(mid), encode_chunk(entry))
+        return chunk_id.decode() if isinstance(chunk_id, bytes) else chunk_id
+
+    def get_all_chunks(self, mid=None):
+        return self._decode_entries(self.rb.xrange(self._chunks_key(mid), "-", "+"))
+
+    def get_last_chunks(self, n=6, mid=None):
+        if n <= 0:
+            return []
+        entries = self.rb.xrevrange(self._chunks_key(mid), "+", "-", count=n)
+        return self._decode_entries(reversed(entries))
+
+    def get_chunks_since(self, last_id=STREAM_START, count=None, mid=None):
+        return self._decode_entries(
+            self.rb.xrange(self._chunks_key(mid), f"({last_id}", "+", count=count)
+        )
+
+    def get_chunk_count(self, mid=None):
+        return self.r.xlen(self._chunks_key(mid))
+
+    def get_live_counters(self, mid=None):
+        # un seul aller-retour Redis
+        mid = self._mid(mid)
+        pipe = self.r.pipeline(transaction=False)
+        for name in LIVE_COUNTER_KEYS:
+            pipe.get(_meeting_key(mid, name))
+        epoch, partial, cursor = pipe.execute()
+        return int(epoch or 0), partial or "", cursor or STREAM_START
+
+    def set_summary(self, summary_text, mid=None):
+        self.r.set(_meeting_key(self._mid(mid), "summary"), summary_text or "")
+
+    def get_summary(self, mid=None):
+        return self.r.get(_meeting_key(self._mid(mid), "summary")) or ""
+
+    def get_summary_cursor(self, mid=None):
+        return self.r.get(_meeting_key(self._mid(mid), "summary_cursor")) or STREAM_START
+
+    def set_summary_cursor(self, chunk_id, mid=None):
+        self.r.set(_meeting_key(self._mid(mid), "summary_cursor"), chunk_id)
+
+    def set_partial(self, text, mid=None):
+        self.r.set(_meeting_key(self._mid(mid), "partial"), text or "")
+
+    def get_partial(self, mid=None):
+        return self.r.get(_meeting_key(self._mid(mid), "partial")) or ""
+
+    def get_window_summary(self, window_key, mid=None):
+        return self.r.hget(_meeting_key(self._mid(mid), "window_summaries"), window_key)
+
+    def set_window_summary(self, window_key, summary_text, mid=None):
+        self.r.hset(_meeting_key(self._mid(mid), "window_summaries"), window_key, summary_text)
+
+    def add_action_item(self, item_text, mid=None):
+        self.r.rpush(_meeting_key(self._mid(mid), "actions"), item_text)
+
+    def get_action_items(self, mid=None):
+        return self.r.lrange(_meeting_key(self._mid(mid), "actions"), 0, -1)
+
+    def reset_meeting_memory(self, mid=None):
+        mid = self._mid(mid)
+        self.r.delete(
+            _meeting_key(mid, "chunks"),
+            _meeting_key(mid, "raw"),  # ancien stockage (liste JSON)
+            _meeting_key(mid, "summary"),
+            _meeting_key(mid, "actions"),
+            _meeting_key(mid, "partial"),
+            _meeting_key(mid, "summary_cursor"),
+            _meeting_key(mid, "window_summaries"),
+        )
+        self.r.incr(_meeting_key(mid, "epoch"))
+
+
+# ---------- Mémoire ----------
+
+def _new_state() -> dict:
+    return {
+        "chunks": [],
+        "last_id": STREAM_START,
+        "summary": "",
+        "summary_cursor": STREAM_START,
+        "partial": "",
+        "window_summaries": {},
+        "actions": [],
+        "epoch": 0,
+        "info": empty_meeting(),
+    }
+
+
+def _next_id(last_id: str) -> str:
+    """ID de chunk "<ms>-<seq>" strictement croissant (comme XADD)."""
+    last_ms, last_seq = _id_key(last_id)
+    now_ms = int(time.time() * 1000)
+    if now_ms > last_ms:
+        return f"{now_ms}-0"
+    return f"{last_ms}-{last_seq + 1}"
+
+
+def _after(chunks: list[dict], last_id: str, count=None) -> list[dict]:
+    key = _id_key(last_id)
+    out = [c for c in chunks if _id_key(c["id"]) > key]
+    return out[:count] if count else out
+
+
+class MemoryMeetingStore(MeetingStore):
+    """Tout en mémoire dans le process (tests, développement sans Redis)."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._current = DEFAULT_MEETING_ID
+        self._index: dict[str, str] = {}
+        self._current_info = empty_meeting()
+        self._meetings: dict[str, dict] = {}
+
+    def _state(self, mid=None) -> dict:
+        mid = self._mid(mid)
+        if mid not in self._meetings:
+            self._meetings[mid] = _new_state()
+        return self._meetings[mid]
+
+    def get_meeting_id(self):
+        return self._current
+
+    def set_current_meeting_id(self, mid):
+        self._current = mid
+
+    def register_meeting(self, mid, started_at):
+        with self._lock:
+            self._index[mid] = started_at
+
+    def list_meetings(self):
+        with self._lock:
+            return dict(self._index)
+
+    def load_current_meeting(self):
+        with self._lock:
+            return normalize_meeting(self._current_info)
+
+    def save_current_meeting(self, **fields):
+        with self._lock:
+            self._current_info.update({k: v for k, v in fields.items() if v is not None})
+            self._current_info = normalize_meeting(self._current_info)
+            return normalize_meeting(self._current_info)
+
+    def load_meeting(self, mid=None):
+        mid = self._mid(mid)
+        with self._lock:
+            return {"id": mid, **normalize_meeting(self._state(mid)["info"])}
+
+    def save_meeting(self, mid=None, **fields):
+        mid = self._mid(mid)
+        with self._lock:
+            state = self._state(mid)
+            state["info"].update({k: v for k, v in fields.items() if v is not None})
+            state["info"] = normalize_meeting(state["info"])
+            return {"id": mid, **normalize_meeting(state["info"])}
+
+    def append_chunk(self, text, translated, mid=None, meta=None):
+        with self._lock:
+            state = self._state(mid)
+            chunk_id = _next_id(state["last_id"])
+            state["chunks"].append({"text": text, "translated": translated, **(meta or {}), "id": chunk_id})
+            state["last_id"] = chunk_id
+            return chunk_id
+
+    def get_last_chunks(self, n=6, mid=None):
+        if n <= 0:
+            return []
+        with self._lock:
+            return [dict(c) for c in self._state(mid)["chunks"][-n:]]
+
+    def get_chunks_since(self, last_id=STREAM_START, count=None, mid=None):
+        with self._lock:
+            return [dict(c) for c in _after(self._state(mid)["chunks"], last_id, count)]
+
+    def get_chunk_count(self, mid=None):
+        with self._lock:
+            return len(self._state(mid)["chunks"])
+
+    def get_live_counters(self, mid=None):
+        with self._lock:
+            state = self._state(mid)
+            return state["epoch"], state["partial"], state["summary_cursor"]
+
+    def _set(self, mid, field, value):
+        with self._lock:
+            self._state(mid)[field] = value
+
+    def _get(self, mid, field):
+        with self._lock:
+            return self._state(mid)[field]
+
+    def set_summary(self, summary_text, mid=None):
+        self._set(mid, "summary", summary_text or "")
+
+    def get_summary(self, mid=None):
+        return self._get(mid, "summary")
+
+    def get_summary_cursor(self, mid=None):
+        return self._get(mid, "summary_cursor")
+
+    def set_summary_cursor(self, chunk_id, mid=None):
+        self._set(mid, "summary_cursor", chunk_id)
+
+    def set_partial(self, text, mid=None):
+        self._set(mid, "partial", text or "")
+
+    def get_partial(self, mid=None):
+        return self._get(mid, "partial")
+
+    def get_window_summary(self, window_key, mid=None):
+        with self._lock:
+            return self._state(mid)["window_summaries"].get(window_key)
+
+    def set_window_summary(self, window_key, summary_text, mid=None):
+        with self._lock:
+            self._state(mid)["window_summaries"][window_key] = summary_text
+
+    def add_action_item(self, item_text, mid=None):
+        with self._lock:
+            self._state(mid)["actions"].append(item_text)
+
+    def get_action_items(self, mid=None):
+        with self._lock:
+            return list(self._state(mid)["actions"])
+
+    def reset_meeting_memory(self, mid=None):
+        with self._lock:
+            state = self._state(mid)
+            fresh = _new_state()
+            fresh["epoch"] = state["epoch"] + 1
+            fresh["info"] = state["info"]
+            fresh["last_id"] = state["last_id"]  # les IDs restent croissants
+            self._meetings[self._mid(mid)] = fresh
+
+
+# ---------- Fichiers ----------
+
+class FileMeetingStore(MemoryMeetingStore):
+    """
+    Mémoire + persistance sur disque, pour un seul process serveur :
+    <dir>/current, <dir>/index.json, <dir>/<id>/chunks.jsonl (append),
+    <dir>/<id>/state.json (résumé, curseurs, actions, infos ; réécrit de façon atomique).
+    Le meeting courant reste dans current_meeting.json (meeting_metadata).
+    Pour plusieurs workers uvicorn, utiliser le backend redis.
+    """
+
+    def __init__(self, directory: str, current_meeting_file: str = CURRENT_MEETING_FILE):
+        super().__init__()
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._metadata = MeetingMetadataStore(current_meeting_file)
+
+        try:
+            with open(os.path.join(directory, "current"), "r", encoding="utf-8") as f:
+                self._current = f.read().strip() or DEFAULT_MEETING_ID
+        except OSError:
+            pass
+        try:
+            with open(os.path.join(directory, "index.json"), "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def _dir(self, mid) -> str:
+        if not is_meeting_id(mid):
+            raise ValueError(f"invalid meeting id {mid!r}")
+        path = os.path.join(self.directory, mid)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _state(self, mid=None) -> dict:
+        mid = self._mid(mid)
+        if mid not in self._meetings:
+            state = _new_state()
+            directory = self._dir(mid)
+            try:
+                with open(os.path.join(directory, "state.json"), "r", encoding="utf-8") as f:
+                    state.update(json.load(f))
+            except (OSError, ValueError):
+                pass
+            try:
+                with open(os.path.join(directory, "chunks.jsonl"), "r", encoding="utf-8") as f:
+                    state["chunks"] = [json.loads(line) for line in f if line.strip()]
+            except (OSError, ValueError):
+                state["chunks"] = []
+            if state["chunks"]:
+                state["last_id"] = state["chunks"][-1]["id"]
+            self._meetings[mid] = state
+        return self._meetings[mid]
+
+    def _persist(self, mid=None):
+        mid = self._mid(mid)
+        state = {k: v for k, v in self._state(mid).items() if k != "chunks"}
+        write_json_atomic(os.path.join(self._dir(mid), "state.json"), state)
+
+    def set_current_meeting_id(self, mid):
+        with self._lock:
+            super().set_current_meeting_id(mid)
+            with open(os.path.join(self.directory, "current"), "w", encoding="utf-8") as f:
+                f.write(mid)
+
+    def register_meeting(self, mid, started_at):
+        with self._lock:
+            super().register_meeting(mid, started_at)
+            write_json_atomic(os.path.join(self.directory, "index.json"), self._index)
+
+    def load_current_meeting(self):
+        return self._metadata.load()
+
+    def save_current_meeting(self, **fields):
+        return self._metadata.update(**fields)
+
+    def save_meeting(self, mid=None, **fields):
+        with self._lock:
+            meeting = super().save_meeting(mid, **fields)
+            self._persist(mid)
+            return meeting
+
+    def append_chunk(self, text, translated, mid=None, meta=None):
+        with self._lock:
+            chunk_id = super().append_chunk(text, translated, mid, meta)
+            chunk = self._state(mid)["chunks"][-1]
+            with open(os.path.join(self._dir(self._mid(mid)), "chunks.jsonl"), "a", encoding="utf-8") as f:
+                f.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+            self._persist(mid)  # last_id
+            return chunk_id
+
+    def _set(self, mid, field, value):
+        with self._lock:
+            super()._set(mid, field, value)
+            if field != "partial":  # le partiel est éphémère, pas besoin de l'écrire
+                self._persist(mid)
+
+    def set_window_summary(self, window_key, summary_text, mid=None):
+        with self._lock:
+            super().set_window_summary(window_key, summary_text, mid)
+            self._persist(mid)
+
+    def add_action_item(self, item_text, mid=None):
+        with self._lock:
+            super().add_action_item(item_text, mid)
+            self._persist(mid)
+
+    def reset_meeting_memory(self, mid=None):
+        with self._lock:
+            super().reset_meeting_memory(mid)
+            try:
+                os.remove(os.path.join(self._dir(self._mid(mid)), "chunks.jsonl"))
+            except OSError:
+                pass
+            self._persist(mid)
+
+
+# ---------- Accès async (endpoints FastAPI) ----------
+
+class AsyncMeetingStore:
+    """
+    Même interface que MeetingStore, en coroutines. Par défaut chaque appel part dans
+    un thread (backends file / memory) ; le backend redis lit en natif (redis.asyncio).
+    """
+
+    def __init__(self, store: MeetingStore):
+        self._store = store
+
+    def __getattr__(self, name):
+        fn = getattr(self._store, name)
+
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+        return call
+
+
+class AsyncRedisMeetingStore(AsyncMeetingStore):
+    """Lectures du chemin chaud (flux live, infos, Q&A) sans thread ; écritures via le store sync."""
+
+    def __init__(self, store: RedisMeetingStore, conn, raw_conn=None):
+        super().__init__(store)
+        self.r = conn
+        self.rb = raw_conn or conn
+
+    async def get_meeting_id(self):
+        return await self.r.get(RedisMeetingStore.CURRENT_MEETING_KEY) or DEFAULT_MEETING_ID
+
+    async def _mid(self, mid=None):
+        return mid or await self.get_meeting_id()
+
+    async def _chunks_key(self, mid=None):
+        mid = await self._mid(mid)
+        if mid not in self._store._migrated:
+            # première lecture de cette réunion : migration éventuelle par le store sync
+            await asyncio.to_thread(self._store._chunks_key, mid)
+        return _meeting_key(mid, "chunks")
+
+    async def list_meetings(self):
+        return await self.r.hgetall(RedisMeetingStore.INDEX_KEY)
+
+    async def _load_json(self, key) -> dict:
+        raw = await self.r.get(key)
+        try:
+            return json.loads(raw) if raw else {}
+        except Exception:
+            return {}
+
+    async def load_current_meeting(self):
+        return normalize_meeting(await self._load_json(RedisMeetingStore.CURRENT_INFO_KEY))
+
+    async def load_meeting(self, mid=None):
+        mid = await self._mid(mid)
+        return {"id": mid, **normalize_meeting(await self._load_json(_meeting_key(mid, "info")))}
+
+    async def get_all_chunks(self, mid=None):
+        return await self.get_chunks_since(STREAM_START, mid=mid)
+
+    async def get_last_chunks(self, n=6, mid=None):
+        if n <= 0:
+            return []
+        entries = await self.rb.xrevrange(await self._chunks_key(mid), "+", "-", count=n)
+        return RedisMeetingStore._decode_entries(reversed(entries))
+
+    async def get_chunks_since(self, last_id=STREAM_START, count=None, mid=None):
+        entries = await self.rb.xrange(await self._chunks_key(mid), f"({last_id}", "+", count=count)
+        return RedisMeetingStore._decode_entries(entries)
+
+    async def get_chunks_page(self, cursor=None, count=100, mid=None):
+        chunks = await self.get_chunks_since(cursor or STREAM_START, count=count, mid=mid)
+        next_cursor = chunks[-1]["id"] if len(chunks) == count else None
+        return chunks, next_cursor
+
+    async def get_chunk_count(self, mid=None):
+        return await self.r.xlen(await self._chunks_key(mid))
+
+    async def get_live_counters(self, mid=None):
+        mid = await self._mid(mid)
+        pipe = self.r.pipeline(transaction=False)
+        for name in LIVE_COUNTER_KEYS:
+            pipe.get(_meeting_key(mid, name))
+        epoch, partial, cursor = await pipe.execute()
+        return int(epoch or 0), partial or "", cursor or STREAM_START
+
+    async def get_summary(self, mid=None):
+        return await self.r.get(_meeting_key(await self._mid(mid), "summary")) or ""
+
+    async def get_summary_cursor(self, mid=None):
+        return await self.r.get(_meeting_key(await self._mid(mid), "summary_cursor")) or STREAM_START
+
+    async def get_partial(self, mid=None):
+        return await self.r.get(_meeting_key(await self._mid(mid), "partial")) or ""
+
+    async def get_action_items(self, mid=None):
+        return await self.r.lrange(_meeting_key(await self._mid(mid), "actions"), 0, -1)
+
+
+_store: MeetingStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_meeting_store() -> MeetingStore:
+    """Backend choisi par MEETING_STORE ("redis" | "file" | "memory")."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if MEETING_STORE == "memory":
+                _store = MemoryMeetingStore()
+            elif MEETING_STORE == "file":
+                _store = FileMeetingStore(MEETING_STORE_DIR)
+            else:
+                from redis_client import r, rb
+                _store = RedisMeetingStore(r, rb)
+    return _store
+
+
+_async_store: AsyncMeetingStore | None = None
+
+
+def get_async_meeting_store() -> AsyncMeetingStore:
+    """Version async du backend configuré (à utiliser depuis la boucle asyncio)."""
+    global _async_store
+    store = get_meeting_store()
+    with _store_lock:
+        if _async_store is None or _async_store._store is not store:
+            if isinstance(store, RedisMeetingStore):
+                from redis_client import ar, arb
+                _async_store = AsyncRedisMeetingStore(store, ar, arb)
+            else:
+                _async_store = AsyncMeetingStore(store)
+    return _async_store
+
+
+def set_meeting_store(store: MeetingStore):
+    """Remplace le backend (tests)."""
+    global _store
+    with _store_lock:
+        _store = store
@@ -0,0 +1,218 @@
+# mistral_async.py
+"""
+Couche asyncio pour les appels Mistral :
+- un seul client HTTP (pool de connexions httpx partagé)
+- sémaphore : nombre max de requêtes en vol
+- token bucket : débit max (requêtes / seconde)
+- retries avec backoff exponentiel + jitter, en respectant Retry-After (429 / 5xx)
+
+Tous les appels passent par une boucle asyncio dédiée (thread de fond), pour que
+la limite de concurrence et le débit soient partagés entre les threads du pipeline
+et les endpoints async de l'API.
+"""
+import asyncio
+import email.utils
+import random
+import threading
+import time
+
+import httpx
+from mistralai import Mistral
+
+from config import (
+    MISTRAL_API_KEY,
+    MISTRAL_MAX_IN_FLIGHT,
+    MISTRAL_RATE_PER_SEC,
+    MISTRAL_BURST,
+    MISTRAL_MAX_RETRIES,
+    MISTRAL_BACKOFF_BASE,
+    MISTRAL_BACKOFF_MAX,
+    MISTRAL_TIMEOUT,
+)
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class MistralUnavailable(Exception):
+    """Mistral n'a pas répondu après tous les retries."""
+
+
+class TokenBucket:
+    """Limiteur de débit : `rate` jetons/seconde, au plus `burst` d'avance."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def penalize(self, seconds: float):
+        """Après un 429 : plus de jetons pendant `seconds` pour tout le monde."""
+        if self.rate > 0:
+            self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def _retry_after(exc) -> float | None:
+    """Lit l'en-tête Retry-After (secondes ou date HTTP) d'une erreur SDK / httpx."""
+    response = getattr(exc, "raw_response", None) or getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after") if hasattr(headers, "get") else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+def _status(exc) -> int | None:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        response = getattr(exc, "raw_response", None) or getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+    return status
+
+
+class AsyncMistralClient:
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None):
+        # transport : httpx.MockTransport dans les tests, sinon le transport réseau par défaut
+        self._http = httpx.AsyncClient(
+            transport=transport,
+            timeout=MISTRAL_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=max(MISTRAL_MAX_IN_FLIGHT, 1),
+                max_keepalive_connections=max(MISTRAL_MAX_IN_FLIGHT, 1),
+            ),
+        )
+        self._client = Mistral(api_key=MISTRAL_API_KEY, async_client=self._http)
+        self._semaphore = asyncio.Semaphore(max(MISTRAL_MAX_IN_FLIGHT, 1))
+        self._bucket = TokenBucket(MISTRAL_RATE_PER_SEC, MISTRAL_BURST)
+        self.in_flight = 0
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    async def chat(self, model: str, messages: list[dict], temperature: float = 0.0, **kwargs):
+        """chat.complete_async avec limite de concurrence, débit et retries."""
+        return await self._call(
+            self._client.chat.complete_async,
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            **kwargs,
+        )
+
+    async def embed(self, model: str, inputs: list[str]):
+        """embeddings.create_async, mêmes limites et retries que chat."""
+        return await self._call(self._client.embeddings.create_async, model=model, inputs=inputs)
+
+    async def _call(self, fn, **kwargs):
+        attempt = 0
+        while True:
+            await self._bucket.acquire()
+            async with self._semaphore:
+                self.in_flight += 1
+                self.requests += 1
+                try:
+                    return await fn(**kwargs)
+                except Exception as e:
+                    status = _status(e)
+                    transient = isinstance(e, httpx.TransportError) or status in RETRY_STATUS
+                    if not transient or attempt >= MISTRAL_MAX_RETRIES:
+                        self.failures += 1
+                        raise MistralUnavailable(f"{type(e).__name__} (status={status}): {e}") from e
+                    error = e
+                finally:
+                    self.in_flight -= 1
+
+            # hors du sémaphore : on ne bloque pas une place pendant l'attente
+            delay = _retry_after(error)
+            if delay is None:
+                cap = min(MISTRAL_BACKOFF_MAX, MISTRAL_BACKOFF_BASE * 2 ** attempt)
+                delay = random.uniform(cap / 2, cap)  # jitter
+            attempt += 1
+            self.retries += 1
+            print(f"[mistral_async] retry {attempt}/{MISTRAL_MAX_RETRIES} dans {delay:.1f}s ({_status(error)})")
+            if _status(error) == 429 and self._bucket.rate > 0:
+                # rate limit : on suspend le bucket pour toutes les requêtes, pas seulement celle-ci
+                self._bucket.penalize(delay)
+            else:
+                await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": MISTRAL_MAX_IN_FLIGHT,
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+
+# ---------- Boucle de fond partagée ----------
+
+_loop: asyncio.AbstractEventLoop | None = None
+_client: AsyncMistralClient | None = None
+_init_lock = threading.Lock()
+
+
+def _ensure_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _client
+    with _init_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="mistral-loop", daemon=True).start()
+            # le client (sémaphore, lock du bucket) est créé dans sa boucle
+            _client = asyncio.run_coroutine_threadsafe(_make_client(), loop).result()
+            _loop = loop
+    return _loop
+
+
+async def _make_client() -> AsyncMistralClient:
+    return AsyncMistralClient()
+
+
+def submit(model: str, messages: list[dict], temperature: float = 0.0, **kwargs):
+    """Planifie un appel sur la boucle partagée ; retourne un concurrent.futures.Future."""
+    loop = _ensure_loop()
+    return asyncio.run_coroutine_threadsafe(
+        _client.chat(model, messages, temperature, **kwargs), loop
+    )
+
+
+def chat_sync(model: str, messages: list[dict], temperature: float = 0.0, **kwargs):
+    """Version bloquante (threads du pipeline)."""
+    return submit(model, messages, temperature, **kwargs).result()
+
+
+async def chat_async(model: str, messages: list[dict], temperature: float = 0.0, **kwargs):
+    """Version awaitable depuis n'importe quelle boucle asyncio (ex : FastAPI)."""
+    return await asyncio.wrap_future(submit(model, messages, temperature, **kwargs))
+
+
+def embed_sync(model: str, inputs: list[str]):
+    """Embeddings, version bloquante."""
+    loop = _ensure_loop()
+    return asyncio.run_coroutine_threadsafe(_client.embed(model, inputs), loop).result()
+
+
+def stats() -> dict:
+    return _client.stats() if _client is not None else {}
@@ -1,55 +1,100 @@
 # mistral_client.py
-from mistralai import Mistral
-from config import MISTRAL_API_KEY
+import asyncio
+import json
 
-try:
-    from mistralai.exceptions import MistralAPIException
-except ImportError:
-    MistralAPIException = Exception
+from translation_cache import get_translation_cache
+import mistral_async
+from mistral_async import MistralUnavailable
 
-# Client global Mistral
-_client = Mistral(api_key=MISTRAL_API_KEY)
+MISTRAL_MODEL = "mistral-small-latest"
+MISTRAL_EMBED_MODEL = "mistral-embed"
+
+SYSTEM_PROMPT = (
+    "You are a precise, literal translator and summarizer. "
+    "Do not add information, do not infer, and avoid paraphrasing unless asked. "
+    "Return only the requested formats."
+)
+
+
+def _build_request(prompt: str, json_mode: bool):
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+    extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+    return messages, extra
+
+
+def _content_text(resp) -> str:
+    content = resp.choices[0].message.content
+
+    # Parfois le SDK renvoie une liste de blocs
+    if isinstance(content, list):
+        content = "".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in content
+        )
+
+    return content.strip()
 
 
 def ask_mistral(
     prompt: str,
-    model: str = "mistral-small-latest",
+    model: str = MISTRAL_MODEL,
     temperature: float = 0.0,
+    json_mode: bool = False,
 ):
     """
-    Appel Mistral robuste.
+    Appel Mistral robuste (bloquant), via le client async partagé de mistral_async :
+    pool de connexions, limite de requêtes en vol, rate limit, retries 429/5xx.
     Retourne:
       - str : réponse du modèle
-      - None : en cas d'erreur (429, quota, etc.)
+      - None : si l'API reste indisponible après tous les retries
     """
-    system = (
-        "You are a precise, literal translator and summarizer. "
-        "Do not add information, do not infer, and avoid paraphrasing unless asked. "
-        "Return only the requested formats."
-    )
-
+    messages, extra = _build_request(prompt, json_mode)
     try:
-        resp = _client.chat.complete(
-            model=model,
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=temperature,
-        )
+        resp = mistral_async.chat_sync(model, messages, temperature, **extra)
+        return _content_text(resp)
+
+    except MistralUnavailable as e:
+        print("[ERROR] Mistral API error:", e)
+        return None
+
+    except Exception as e:
+        print("[ERROR] Unexpected Mistral error:", e)
+        return None
+
 
-        content = resp.choices[0].message.content
+def embed_texts(texts: list[str], model: str = MISTRAL_EMBED_MODEL) -> list[list[float]] | None:
+    """
+    Embeddings Mistral (une requête pour toute la liste). None si l'API reste indisponible.
+    """
+    if not texts:
+        return []
+    try:
+        resp = mistral_async.embed_sync(model, texts)
+        return [item.embedding for item in resp.data]
+    except Exception as e:
+        print("[ERROR] Mistral embeddings error:", e)
+        return None
 
-        # Parfois le SDK renvoie une liste de blocs
-        if isinstance(content, list):
-            content = "".join(
-                part.get("text", "") if isinstance(part, dict) else str(part)
-                for part in content
-            )
 
-        return content.strip()
+async def ask_mistral_async(
+    prompt: str,
+    model: str = MISTRAL_MODEL,
+    temperature: float = 0.0,
+    json_mode: bool = False,
+):
+    """
+    Même contrat que ask_mistral, awaitable : plusieurs appels peuvent tourner en parallèle
+    (asyncio.gather) sans dépasser les limites de concurrence / débit.
+    """
+    messages, extra = _build_request(prompt, json_mode)
+    try:
+        resp = await mistral_async.chat_async(model, messages, temperature, **extra)
+        return _content_text(resp)
 
-    except MistralAPIException as e:
+    except MistralUnavailable as e:
         print("[ERROR] Mistral API error:", e)
         return None
 
@@ -58,13 +103,8 @@ def ask_mistral(
         return None
 
 
-def translate_and_summarize(text: str, target_lang: str = "fr") -> str:
-    """
-    Traduit le texte en FRANÇAIS.
-    On ignore la valeur réelle de target_lang et on force le français.
-    Si l'API échoue, on renvoie le texte source (fallback doux).
-    """
-    prompt = (
+def _translate_prompt(text: str) -> str:
+    return (
         "Traduire le texte suivant en **français**.\n"
         "- Réponds UNIQUEMENT en français.\n"
         "- Ne donne aucune explication.\n"
@@ -72,15 +112,121 @@ def translate_and_summarize(text: str, target_lang: str = "fr") -> str:
         f"Texte source :\n{text}"
     )
 
+
+def translate_and_summarize(text: str, target_lang: str = "fr") -> str:
+    """
+    Traduit le texte en FRANÇAIS.
+    On ignore la valeur réelle de target_lang et on force le français.
+    Si l'API échoue, on renvoie le texte source (fallback doux).
+    Les traductions réussies sont mises en cache (texte normalisé + modèle + version du prompt).
+    """
+    cache = get_translation_cache()
+    cached = cache.get(text, MISTRAL_MODEL)
+    if cached is not None:
+        return cached
+
     print("[mistral_client] translate_and_summarize (FR)")
 
-    result = ask_mistral(prompt, temperature=0.0)
+    result = ask_mistral(_translate_prompt(text), temperature=0.0)
 
     if result is None:
         print("[mistral_client] Fallback: Mistral a retourné None, on renvoie le texte source.")
         return text
 
-    return result.strip()
+    result = result.strip()
+    cache.put(text, MISTRAL_MODEL, result)
+    return result
+
+
+async def translate_and_summarize_async(text: str, target_lang: str = "fr") -> str:
+    """
+    Même contrat que translate_and_summarize, awaitable (endpoints async).
+    """
+    cache = get_translation_cache()
+    cached = await asyncio.to_thread(cache.get, text, MISTRAL_MODEL)
+    if cached is not None:
+        return cached
+
+    result = await ask_mistral_async(_translate_prompt(text), temperature=0.0)
+
+    if result is None:
+        print("[mistral_client] Fallback: Mistral a retourné None, on renvoie le texte source.")
+        return text
+
+    result = result.strip()
+    await asyncio.to_thread(cache.put, text, MISTRAL_MODEL, result)
+    return result
+
+
+def translate_batch(texts: list[str], target_lang: str = "fr") -> list[str]:
+    """
+    Traduit N segments en FRANÇAIS en UNE seule requête (JSON structuré),
+    et renvoie les traductions dans le même ordre.
+    Si la réponse est inexploitable, on retombe sur translate_and_summarize segment par segment.
+    """
+    if not texts:
+        return []
+
+    # Segments identiques une fois normalisés ("Okay." / " okay. ") = même clé de cache :
+    # une seule entrée par clé, recopiée ensuite sur chaque occurrence
+    cache = get_translation_cache()
+    keys = [cache.key(t, MISTRAL_MODEL) for t in texts]
+    first: dict[str, int] = {}
+    for i, k in enumerate(keys):
+        first.setdefault(k, i)
+    found = {k: cache.get(texts[i], MISTRAL_MODEL) for k, i in first.items()}
+    # seuls les segments absents du cache partent chez Mistral
+    missing = [i for k, i in first.items() if found[k] is None]
+
+    def fan_out():
+        return [found[k] for k in keys]
+
+    if not missing:
+        return fan_out()
+    if len(missing) == 1:
+        i = missing[0]
+        found[keys[i]] = translate_and_summarize(texts[i], target_lang)
+        return fan_out()
+
+    payload = json.dumps(
+        [{"id": n, "text": texts[i]} for n, i in enumerate(missing)],
+        ensure_ascii=False,
+    )
+    prompt = (
+        "Traduire chaque segment suivant en **français**.\n"
+        "- Traduis chaque segment séparément, sans le fusionner avec les autres.\n"
+        "- Ne donne aucune explication.\n"
+        '- Réponds UNIQUEMENT avec un objet JSON de la forme '
+        '{"translations": [{"id": 0, "text": "..."}, ...]} '
+        "contenant exactement un élément par segment, avec le même id.\n\n"
+        f"Segments :\n{payload}"
+    )
+
+    print(f"[mistral_client] translate_batch (FR) x{len(missing)} "
+          f"({len(first) - len(missing)} en cache, {len(texts) - len(first)} doublons)")
+
+    result = ask_mistral(prompt, temperature=0.0, json_mode=True)
+
+    if result is None:
+        print("[mistral_client] Fallback: Mistral a retourné None, on renvoie les textes source.")
+        out = fan_out()
+        return [texts[i] if tr is None else tr for i, tr in enumerate(out)]
+
+    try:
+        items = json.loads(result)["translations"]
+        by_id = {int(it["id"]): str(it["text"]).strip() for it in items}
+        if set(by_id) != set(range(len(missing))):
+            raise ValueError(f"ids reçus {sorted(by_id)}")
+    except Exception as e:
+        print(f"[mistral_client] translate_batch: réponse invalide ({e}), traduction segment par segment.")
+        for i in missing:
+            found[keys[i]] = translate_and_summarize(texts[i], target_lang)
+        return fan_out()
+
+    for n, i in enumerate(missing):
+        found[keys[i]] = by_id[n]
+        cache.put(texts[i], MISTRAL_MODEL, by_id[n])
+    return fan_out()
 
 
 def summarize_meeting_paragraphs(text: str, target_lang: str = "fr") -> str:
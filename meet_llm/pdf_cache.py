@@ -0,0 +1,193 @@
+# pdf_cache.py
+"""
+Rendu du compte-rendu PDF en tâche de fond, avec cache par (réunion, version du transcript).
+
+- version = époque + ID du dernier chunk + curseur du résumé live + actions + infos :
+  tant que rien ne change, un téléchargement renvoie les octets déjà rendus
+- un seul rendu à la fois par (réunion, version) : les doubles clics attendent le même job
+- le PDF est écrit sur disque (PDF_CACHE_DIR, partagé entre workers uvicorn sur la
+  même machine) puis servi en streaming depuis le fichier ; sans dossier, octets en mémoire
+"""
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+from background import get_heavy_executor
+from meeting_manager import build_summary_pdf
+from meeting_store import get_async_meeting_store, is_meeting_id
+from config import PDF_CACHE_DIR
+
+
+async def transcript_version(meeting_id: str) -> str:
+    """Tout ce qui apparaît dans le PDF, résumé en une chaîne (lectures store légères)."""
+    store = get_async_meeting_store()
+    (epoch, _, summary_cursor), last, actions, meet = await asyncio.gather(
+        store.get_live_counters(mid=meeting_id),
+        store.get_last_chunks(1, mid=meeting_id),
+        store.get_action_items(mid=meeting_id),
+        store.load_meeting(meeting_id),
+    )
+    last_id = last[0]["id"] if last else "-"
+    raw = "|".join(str(v) for v in (
+        epoch, last_id, summary_cursor, len(actions), hashlib.sha1("\n".join(actions).encode()).hexdigest(),
+        meet.get("start"), meet.get("end"), meet.get("meet_link"), ",".join(meet.get("participants", [])),
+    ))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class PdfCache:
+    def __init__(self, directory: str | None = PDF_CACHE_DIR):
+        self.directory = directory or None
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._memory: dict[str, tuple[str, str | bytes]] = {}  # meeting -> (version, chemin ou pdf)
+        self._jobs: dict[tuple[str, str], Future] = {}
+        self._errors: dict[str, str] = {}
+        self.hits = 0
+        self.renders = 0
+
+    def _path(self, meeting_id: str, version: str) -> str:
+        # l'ID vient de l'URL : jamais de ".." ni de "/" dans le nom du fichier
+        if not is_meeting_id(meeting_id):
+            raise ValueError(f"invalid meeting id {meeting_id!r}")
+        return os.path.join(self.directory, f"{meeting_id}-{version}.pdf")
+
+    def get(self, meeting_id: str, version: str):
+        """PDF à jour : chemin du fichier (cache disque) ou octets (cache mémoire), sinon None."""
+        with self._lock:
+            cached = self._memory.get(meeting_id)
+            if cached and cached[0] == version:
+                self.hits += 1
+                return cached[1]
+        if self.directory:
+            path = self._path(meeting_id, version)
+            if not os.path.exists(path):
+                return None
+            with self._lock:
+                self._memory[meeting_id] = (version, path)
+                self.hits += 1
+            return path
+        return None
+
+    def _prune(self, meeting_id: str, keep: int = 2):
+        """Anciens rendus de la réunion : on garde les `keep` plus récents (un téléchargement peut être en cours)."""
+        prefix = f"{meeting_id}-"
+        paths = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            # "<id>-<version>.pdf" ; la version n'a pas de "-" (sinon rendu d'une réunion "<id>-xxx")
+            if name.startswith(prefix) and name.endswith(".pdf") and "-" not in name[len(prefix):-4]
+        ]
+        paths.sort(key=lambda path: os.path.getmtime(path), reverse=True)
+        for path in paths[keep:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _render(self, meeting_id: str, version: str):
+        started = time.monotonic()
+        if self.directory:
+            # écrit directement dans un fichier temporaire : pas de copie complète en mémoire
+            path = self._path(meeting_id, version)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                build_summary_pdf(meeting_id, output=tmp_path)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            result = path
+            self._prune(meeting_id)
+        else:
+            result = build_summary_pdf(meeting_id)
+        with self._lock:
+            self._memory[meeting_id] = (version, result)
+            self._errors.pop(meeting_id, None)
+            self.renders += 1
+        print(f"[pdf_cache] {meeting_id} rendu en {time.monotonic() - started:.1f}s")
+        return result
+
+    def _job_done(self, key, future: Future):
+        with self._lock:
+            self._jobs.pop(key, None)
+            if future.exception() is not None:
+                self._errors[key[0]] = str(future.exception())
+
+    def render(self, meeting_id: str, version: str) -> Future:
+        """Lance (ou rejoint) le rendu de cette version ; retourne son Future."""
+        key = (meeting_id, version)
+        # vérification et lancement sous le même verrou : deux requêtes simultanées
+        # ne rendent pas deux fois la même version (submit() ne bloque pas)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None:
+                return job
+            job = get_heavy_executor().submit(self._render, meeting_id, version)
+            self._jobs[key] = job
+        # hors verrou : si le job est déjà fini, le callback s'exécute ici et prend self._lock
+        job.add_done_callback(lambda f: self._job_done(key, f))
+        return job
+
+    async def get_or_render(self, meeting_id: str, wait: bool = True):
+        """
+        (pdf, statut) : pdf (chemin ou octets) à jour depuis le cache, sinon rendu en fond ;
+        wait=False => (None, "rendering") sans attendre la fin du rendu.
+        """
+        version = await transcript_version(meeting_id)
+        pdf = self.get(meeting_id, version)
+        if pdf is not None:
+            return pdf, "ready"
+        job = self.render(meeting_id, version)
+        if not wait:
+            return None, "rendering"
+        return await asyncio.wrap_future(job), "ready"
+
+    async def status(self, meeting_id: str) -> dict:
+        version = await transcript_version(meeting_id)
+        with self._lock:
+            rendering = (meeting_id, version) in self._jobs
+            cached = self._memory.get(meeting_id)
+            error = self._errors.get(meeting_id)
+        if cached and cached[0] == version:
+            status = "ready"
+        elif rendering:
+            status = "rendering"
+        elif self.directory and os.path.exists(self._path(meeting_id, version)):
+            status = "ready"
+        elif error:
+            status = "error"
+        else:
+            # un ancien rendu peut exister, mais le transcript a changé depuis
+            status = "stale" if cached else "missing"
+        return {
+            "meeting_id": meeting_id,
+            "version": version,
+            "status": status,
+            "error": error if status == "error" else None,
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "cached_meetings": len(self._memory),
+                "rendering": len(self._jobs),
+                "hits": self.hits,
+                "renders": self.renders,
+            }
+
+
+_cache: PdfCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_pdf_cache() -> PdfCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PdfCache()
+    return _cache
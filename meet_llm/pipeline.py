@@ -0,0 +1,349 @@
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+POLICIES = ("block", "drop_oldest", "coalesce")
+
+
+class BoundedQueue:
+    """Thread-safe bounded FIFO with an overflow policy.
+
+    - "block"       : put() waits until there is room
+    - "drop_oldest" : the oldest queued item is discarded (reported to on_drop)
+    - "coalesce"    : the incoming item is merged into the newest queued one with coalesce(old, new)
+
+    Exposes put()/get()/empty() like queue.Queue so producers (e.g. AlternatingRecorder)
+    can use it directly.
+    """
+
+    def __init__(self, maxsize: int, policy: str = "block",
+                 coalesce: Optional[Callable[[Any, Any], Any]] = None,
+                 on_drop: Optional[Callable[[Any], None]] = None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        if policy == "coalesce" and coalesce is None:
+            raise ValueError("policy 'coalesce' requires a coalesce function")
+        self.maxsize = max(1, int(maxsize))
+        self.policy = policy
+        self._coalesce = coalesce
+        self._on_drop = on_drop
+        self._items: deque = deque()
+        self._cond = threading.Condition()
+        self.closed = False
+        self.in_progress = 0  # items taken by get() and not yet marked task_done()
+        self.dropped = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def idle(self) -> bool:
+        """Nothing queued and nothing being processed."""
+        with self._cond:
+            return not self._items and self.in_progress == 0
+
+    def task_done(self, n: int = 1):
+        with self._cond:
+            self.in_progress -= n
+
+    def close(self):
+        """Wake up blocked producers/consumers; further puts are ignored."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def put(self, item):
+        dropped = None
+        with self._cond:
+            if self.closed:
+                return
+            while len(self._items) >= self.maxsize and not self.closed:
+                if self.policy == "block":
+                    self._cond.wait(0.1)
+                elif self.policy == "drop_oldest":
+                    dropped = self._items.popleft()
+                    self.dropped += 1
+                else:
+                    item = self._coalesce(self._items.pop(), item)
+                    self.coalesced += 1
+            self._items.append(item)
+            self._cond.notify_all()
+        if dropped is not None and self._on_drop is not None:
+            self._on_drop(dropped)
+
+    def get(self, timeout: float | None = None):
+        with self._cond:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self._items:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if self.closed or (remaining is not None and remaining <= 0):
+                    raise queue.Empty
+                self._cond.wait(remaining)
+            item = self._items.popleft()
+            self.in_progress += 1
+            self._cond.notify_all()
+            return item
+
+    def get_batch(self, max_items: int, timeout: float | None = None) -> list:
+        """Wait for one item (like get) then also take whatever else is already queued, up to max_items."""
+        first = self.get(timeout)
+        with self._cond:
+            batch = [first]
+            while self._items and len(batch) < max_items:
+                batch.append(self._items.popleft())
+                self.in_progress += 1
+            self._cond.notify_all()
+            return batch
+
+
+class _Job:
+    """Payload travelling through the pipeline, with the sequence numbers it covers."""
+
+    __slots__ = ("seqs", "payload", "created", "enqueued")
+
+    def __init__(self, seqs: list[int], payload, created: float):
+        self.seqs = seqs
+        self.payload = payload
+        self.created = created
+        self.enqueued = created
+
+
+class Stage:
+    """One pipeline stage: a bounded input queue drained by `workers` threads calling fn(payload).
+
+    fn returns the payload for the next stage, or None to drop the item (e.g. silence).
+    With batch_size > 1, fn receives the list of payloads queued at that moment (at most
+    batch_size) and returns a list of results of the same length.
+    `coalesce(a, b)` merges two payloads (used by the "coalesce" policy). `flush()` is called
+    once when the pipeline stops and may return extra payloads for the next stage.
+    """
+
+    def __init__(self, name: str, fn: Callable[[Any], Any], workers: int = 1, maxsize: int = 16,
+                 policy: str = "block", coalesce: Optional[Callable[[Any, Any], Any]] = None,
+                 flush: Optional[Callable[[], list]] = None, batch_size: int = 1):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, int(workers))
+        self.batch_size = max(1, int(batch_size))
+        self.coalesce = coalesce
+        self.flush = flush
+        self.queue = BoundedQueue(maxsize, policy, self._coalesce_jobs if coalesce else None)
+
+        self._pipeline: Optional["Pipeline"] = None
+        self._threads: list[threading.Thread] = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+        self.processed = 0
+        self.batches = 0
+        self.errors = 0
+        self._wait_total = 0.0
+        self._service_total = 0.0
+
+    def _coalesce_jobs(self, a: _Job, b: _Job) -> _Job:
+        # payloads are merged in capture order whatever order they were queued in
+        if min(b.seqs) < min(a.seqs):
+            a, b = b, a
+        job = _Job(a.seqs + b.seqs, self.coalesce(a.payload, b.payload), min(a.created, b.created))
+        job.enqueued = min(a.enqueued, b.enqueued)
+        return job
+
+    def start(self, pipeline: "Pipeline"):
+        self._pipeline = pipeline
+        self.queue._on_drop = lambda job: pipeline._skip(job, self)
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"{self.name}-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def idle(self) -> bool:
+        return self.queue.idle()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                jobs = self.queue.get_batch(self.batch_size, timeout=0.5)
+            except queue.Empty:
+                continue
+
+            started = time.monotonic()
+            try:
+                if self.batch_size > 1:
+                    results = list(self.fn([j.payload for j in jobs]))
+                    if len(results) != len(jobs):
+                        raise RuntimeError(f"batch returned {len(results)} results for {len(jobs)} items")
+                else:
+                    results = [self.fn(jobs[0].payload)]
+            except Exception as e:
+                print(f"[pipeline] {self.name} error: {e}")
+                results = [None] * len(jobs)
+                with self._lock:
+                    self.errors += 1
+            finished = time.monotonic()
+
+            with self._lock:
+                self.processed += len(jobs)
+                self.batches += 1
+                self._wait_total += sum(started - j.enqueued for j in jobs)
+                self._service_total += (finished - started) * len(jobs)
+
+            for job, result in zip(jobs, results):
+                if result is None:
+                    self._pipeline._skip(job, self)
+                else:
+                    job.payload = result
+                    self._pipeline._forward(self, job)
+            self.queue.task_done(len(jobs))
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        self.queue.close()
+        for t in self._threads:
+            t.join(timeout=timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            n = self.processed or 1
+            return {
+                "name": self.name,
+                "workers": self.workers,
+                "policy": self.queue.policy,
+                "depth": len(self.queue),
+                "maxsize": self.queue.maxsize,
+                "busy": self.queue.in_progress,
+                "processed": self.processed,
+                "batches": self.batches,
+                "errors": self.errors,
+                "dropped": self.queue.dropped,
+                "coalesced": self.queue.coalesced,
+                "avg_wait_ms": round(1000 * self._wait_total / n, 1),
+                "avg_service_ms": round(1000 * self._service_total / n, 1),
+            }
+
+
+class _Reorder:
+    """Releases jobs in sequence order. A job covering several seqs (coalesced) is keyed by
+    its smallest one; seqs of dropped jobs are marked resolved so they don't block the rest."""
+
+    def __init__(self):
+        self.next_seq = 0
+        self.pending: dict[int, _Job] = {}
+        self.resolved: set[int] = set()
+
+    def push(self, job: Optional[_Job] = None, skipped: Optional[list[int]] = None) -> list[_Job]:
+        if job is not None:
+            first = min(job.seqs)
+            self.pending[first] = job
+            self.resolved.update(s for s in job.seqs if s != first)
+        if skipped:
+            self.resolved.update(skipped)
+        ready = []
+        while True:
+            if self.next_seq in self.pending:
+                ready.append(self.pending.pop(self.next_seq))
+            elif self.next_seq in self.resolved:
+                self.resolved.discard(self.next_seq)
+            else:
+                break
+            self.next_seq += 1
+        return ready
+
+
+class Pipeline:
+    """Chain of Stages. Items put() into the pipeline get a sequence number; the last stage
+    receives them in capture order even when middle stages run several workers. Stages with
+    the "coalesce" policy also receive them in order, so merged payloads stay in capture order."""
+
+    def __init__(self, stages: list[Stage]):
+        self.stages = stages
+        self._seq = itertools.count()
+        self._order_lock = threading.Lock()  # end-to-end stats
+        # stage index -> reorder point in front of its queue (stage 0 is fed in order)
+        self._ordered = {
+            i: _Reorder()
+            for i, stage in enumerate(stages)
+            if i > 0 and (i == len(stages) - 1 or stage.queue.policy == "coalesce")
+        }
+        # one lock per reorder point, held from push() until the released jobs are queued:
+        # otherwise two workers could interleave the puts of their in-order batches.
+        # A put may block on a full queue while holding it, so points are only ever
+        # locked in increasing stage order (see _skip) and never under _order_lock.
+        self._release_locks = {i: threading.Lock() for i in self._ordered}
+
+        self.completed = 0
+        self._latency_total = 0.0
+
+    # --- producer side (same interface as queue.Queue.put) ---
+
+    def put(self, payload):
+        now = time.monotonic()
+        self.stages[0].queue.put(_Job([next(self._seq)], payload, now))
+
+    # --- routing ---
+
+    def _forward(self, stage: Stage, job: _Job):
+        idx = self.stages.index(stage)
+        if idx + 1 == len(self.stages):
+            with self._order_lock:
+                self.completed += 1
+                self._latency_total += time.monotonic() - job.created
+            return
+        nxt = idx + 1
+        if nxt in self._ordered:
+            with self._release_locks[nxt]:
+                self._release(nxt, self._ordered[nxt].push(job))
+            return
+        job.enqueued = time.monotonic()
+        self.stages[nxt].queue.put(job)
+
+    def _release(self, idx: int, jobs: list[_Job]):
+        for j in jobs:
+            j.enqueued = time.monotonic()
+            self.stages[idx].queue.put(j)
+
+    def _skip(self, job: _Job, stage: Stage):
+        """A job was dropped at `stage` (silence, error, overflow): don't let it block ordering downstream."""
+        idx = self.stages.index(stage)
+        for point, reorder in sorted(self._ordered.items()):
+            if point > idx:
+                with self._release_locks[point]:
+                    self._release(point, reorder.push(None, job.seqs))
+
+    # --- lifecycle ---
+
+    def start(self):
+        for stage in self.stages:
+            stage.start(self)
+
+    def stop(self, drain_timeout: float = 10.0):
+        """Drain the stages in order (bounded by drain_timeout), flush them, then stop workers."""
+        deadline = time.monotonic() + drain_timeout
+        for stage in self.stages:
+            while not stage.idle() and time.monotonic() < deadline:
+                time.sleep(0.05)
+            if stage.flush is not None:
+                try:
+                    for payload in stage.flush() or []:
+                        job = _Job([next(self._seq)], payload, time.monotonic())
+                        self._forward(stage, job)
+                except Exception as e:
+                    print(f"[pipeline] {stage.name} flush error: {e}")
+        for stage in self.stages:
+            stage.stop()
+
+    def stats(self) -> dict:
+        with self._order_lock:
+            n = self.completed or 1
+            latency = round(1000 * self._latency_total / n, 1)
+            completed = self.completed
+        return {
+            "stages": [s.stats() for s in self.stages],
+            "completed": completed,
+            "avg_end_to_end_ms": latency,
+        }
@@ -1,10 +1,74 @@
 import os
 import time
 import threading
-import sounddevice as sd
+import numpy as np
 import soundfile as sf
 from typing import Optional
 
+try:
+    import sounddevice as sd
+except (ImportError, OSError):
+    # PortAudio absent (serveur sans carte son) : RingBuffer / resample_to_asr restent utilisables
+    sd = None
+
+# Whisper expects 16 kHz mono float32
+ASR_SAMPLERATE = 16000
+
+
+class RingBuffer:
+    """Preallocated mono float32 ring buffer fed by the audio callback.
+
+    The audio thread is the only writer: it copies frames into the array and then
+    advances `written` (a monotonically increasing sample counter). Readers ask for
+    absolute sample ranges, so nothing is allocated or locked in the callback.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = int(capacity)
+        self._data = np.zeros(self.capacity, dtype=np.float32)
+        self.written = 0
+
+    def write(self, samples: np.ndarray):
+        n = len(samples)
+        if n >= self.capacity:
+            # keep only the most recent samples, each at its usual slot (absolute index % capacity)
+            self.written += n
+            self._data[:] = np.roll(samples[-self.capacity:], self.written % self.capacity)
+            return
+        start = self.written % self.capacity
+        end = start + n
+        if end <= self.capacity:
+            self._data[start:end] = samples
+        else:
+            split = self.capacity - start
+            self._data[start:] = samples[:split]
+            self._data[:end - self.capacity] = samples[split:]
+        self.written += n
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        """Copy samples [start, end) out of the buffer. Samples already overwritten are skipped."""
+        end = min(end, self.written)
+        lost = self.written - self.capacity - start
+        if lost > 0:
+            print(f"Recorder warning: ring buffer overrun, {lost} samples lost")
+            start += lost
+        if end <= start:
+            return np.zeros(0, dtype=np.float32)
+        i, j = start % self.capacity, end % self.capacity
+        if i < j:
+            return self._data[i:j].copy()
+        return np.concatenate((self._data[i:], self._data[:j]))
+
+
+def resample_to_asr(audio: np.ndarray, samplerate: int) -> np.ndarray:
+    """Linear resampling to ASR_SAMPLERATE (cheap, good enough for speech recognition)."""
+    if samplerate == ASR_SAMPLERATE or len(audio) == 0:
+        return audio.astype(np.float32, copy=False)
+    n_out = int(round(len(audio) * ASR_SAMPLERATE / samplerate))
+    x_old = np.arange(len(audio), dtype=np.float64)
+    x_new = np.linspace(0, len(audio) - 1, n_out)
+    return np.interp(x_new, x_old, audio).astype(np.float32)
+
 
 class AlternatingRecorder:
     """Single input stream that writes audio into two alternating WAV files with minimal gap.
@@ -13,19 +77,31 @@ class AlternatingRecorder:
       rec = AlternatingRecorder(device_index=None, channels=1)
       rec.start_stream()
       # run alternate_recording in background thread, it will put finished filenames into a queue
+
+    With capture_mode="memory" the callback only copies frames into a preallocated
+    RingBuffer, and buffered_recording puts 16 kHz mono float32 arrays into the queue
+    instead of filenames (no WAV encode/decode, no temp files).
     """
 
-    def __init__(self, device_index: Optional[int] = None, samplerate: Optional[int] = None, channels: int = 1):
+    def __init__(self, device_index: Optional[int] = None, samplerate: Optional[int] = None, channels: int = 1,
+                 capture_mode: str = "wav", buffer_seconds: int = 120):
+        if capture_mode not in ("wav", "memory"):
+            raise ValueError(f"Unknown capture_mode: {capture_mode}")
         self.device_index = device_index
         self.channels = channels
-        self._stream: Optional[sd.InputStream] = None
+        self.capture_mode = capture_mode
+        self._stream = None
         self.samplerate = samplerate
+        self._ring: Optional[RingBuffer] = None
 
         # writers for slot 0 and 1
         self._writers = [None, None]
         self._writers_lock = threading.Lock()
         self._active_slot = None
 
+        if sd is None:
+            raise RuntimeError("sounddevice / PortAudio not available: cannot record")
+
         # pick device/samplerate now
         dev = sd.query_devices()
         if device_index is not None:
@@ -47,6 +123,9 @@ class AlternatingRecorder:
             except Exception:
                 self.samplerate = 16000
 
+        if capture_mode == "memory":
+            self._ring = RingBuffer(self.samplerate * buffer_seconds)
+
         # prepare input stream (callback will dispatch frames to active writer)
         self._stream = sd.InputStream(device=self.device_index, channels=self.channels,
                                       samplerate=self.samplerate, dtype="float32",
@@ -69,6 +148,13 @@ class AlternatingRecorder:
         if status:
             # print status to help debugging (non-blocking)
             print(f"Recorder status: {status}")
+        if self._ring is not None:
+            # indata is float32 numpy array shape (frames, channels) -> downmix to mono
+            if self.channels == 1:
+                self._ring.write(indata[:, 0])
+            else:
+                self._ring.write(indata.mean(axis=1))
+            return
         with self._writers_lock:
             slot = self._active_slot
             if slot is not None and self._writers[slot] is not None:
@@ -146,3 +232,71 @@ class AlternatingRecorder:
                     out_queue.put(prev_filename)
             except Exception:
                 pass
+
+    def read_since(self, position: int) -> tuple[np.ndarray, int]:
+        """Return (16 kHz mono float32 audio captured since `position`, new position)."""
+        if self._ring is None:
+            raise RuntimeError("read_since requires capture_mode='memory'")
+        end = self._ring.written
+        audio = self._ring.read(position, end)
+        return resample_to_asr(audio, self.samplerate), end
+
+    def buffered_recording(self, seconds_per_chunk: float, out_queue, stop_event: threading.Event):
+        """Memory-mode counterpart of alternate_recording: every `seconds_per_chunk` the audio
+        captured since the previous cut is put into out_queue as a float32 array at
+        ASR_SAMPLERATE. This method blocks until stop_event is set.
+        """
+        if self._ring is None:
+            raise RuntimeError("buffered_recording requires capture_mode='memory'")
+        position = self._ring.written
+
+        try:
+            while not stop_event.is_set():
+                start = time.time()
+                while (time.time() - start) < seconds_per_chunk and not stop_event.is_set():
+                    time.sleep(0.1)
+
+                audio, position = self.read_since(position)
+                if len(audio):
+                    try:
+                        out_queue.put(audio)
+                    except Exception:
+                        print("Warning: failed to put audio chunk into queue")
+        finally:
+            # flush whatever was captured after the last cut
+            try:
+                audio, position = self.read_since(position)
+                if len(audio):
+                    out_queue.put(audio)
+            except Exception:
+                pass
+
+    def segmented_recording(self, segmenter, out_queue, stop_event: threading.Event, poll_seconds: float = 0.1):
+        """Memory-mode recording loop that lets `segmenter` (see segmenter.EnergySegmenter)
+        decide where chunks end: captured audio is fed to it every `poll_seconds` and each
+        closed speech segment is put into out_queue. Blocks until stop_event is set.
+        """
+        if self._ring is None:
+            raise RuntimeError("segmented_recording requires capture_mode='memory'")
+        position = self._ring.written
+
+        try:
+            while not stop_event.is_set():
+                time.sleep(poll_seconds)
+                audio, position = self.read_since(position)
+                for segment in segmenter.feed(audio):
+                    try:
+                        out_queue.put(segment)
+                    except Exception:
+                        print("Warning: failed to put audio segment into queue")
+        finally:
+            try:
+                audio, position = self.read_since(position)
+                segments = segmenter.feed(audio)
+                last = segmenter.flush()
+                if last is not None:
+                    segments.append(last)
+                for segment in segments:
+                    out_queue.put(segment)
+            except Exception:
+                pass
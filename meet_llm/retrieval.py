@@ -0,0 +1,208 @@
+# retrieval.py
+"""
+Index de recherche local sur le transcript, pour le Q&A ("Ask the Meeting") :
+- BM25 incrémental sur le texte source + la traduction (EN + FR), sans accents ni mots vides
+- embeddings Mistral optionnels (RETRIEVAL_EMBEDDINGS) : score hybride BM25 + cosinus,
+  les chunks ne sont embeddés qu'au moment d'une question, par lots
+
+Un index par réunion, dans le process. Il est alimenté à chaque chunk sauvegardé
+(MeetingSession) et rattrape le meeting store avant chaque recherche (chunks écrits
+par un autre process, redémarrage) ; un changement d'époque (reset) le reconstruit.
+"""
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from meeting_store import get_meeting_store, STREAM_START
+from mistral_client import embed_texts
+from config import RETRIEVAL_EMBEDDINGS, RETRIEVAL_EMBED_BATCH_SIZE
+
+_TOKEN = re.compile(r"\w+")
+
+STOPWORDS = {
+    # en
+    "the", "a", "an", "and", "or", "but", "of", "to", "in", "on", "for", "with", "at", "by",
+    "is", "are", "was", "were", "be", "been", "it", "this", "that", "these", "those", "i",
+    "you", "he", "she", "we", "they", "me", "my", "your", "our", "their", "do", "does", "did",
+    "so", "if", "not", "no", "yes", "what", "which", "who", "how", "about", "as", "from",
+    "have", "has", "had", "will", "would", "can", "could", "just", "there", "here",
+    # fr
+    "le", "la", "les", "un", "une", "des", "du", "de", "et", "ou", "mais", "en", "au", "aux",
+    "pour", "par", "sur", "dans", "avec", "est", "sont", "etait", "ete", "il", "elle", "on",
+    "nous", "vous", "ils", "elles", "je", "tu", "ce", "cet", "cette", "ces", "qui", "que",
+    "quoi", "ne", "pas", "oui", "non", "se", "sa", "son", "ses", "leur", "leurs", "mon",
+    "ma", "mes", "ton", "ta", "tes", "a", "y", "plus", "comme", "avoir", "etre", "fait",
+}
+
+
+def tokenize(text: str) -> list[str]:
+    """Minuscules, accents retirés (réunion == reunion), mots vides ignorés."""
+    text = unicodedata.normalize("NFKD", (text or "").casefold())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return [t for t in _TOKEN.findall(text) if len(t) > 1 and t not in STOPWORDS]
+
+
+class BM25Index:
+    """BM25 Okapi, documents ajoutés un par un (postings term -> {doc: tf})."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self._lengths: list[int] = []
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def add(self, text: str) -> int:
+        doc = len(self._lengths)
+        terms = Counter(tokenize(text))
+        for term, tf in terms.items():
+            self._postings[term][doc] = tf
+        length = sum(terms.values())
+        self._lengths.append(length)
+        self._total_length += length
+        return doc
+
+    def scores(self, query: str) -> dict[int, float]:
+        n = len(self._lengths)
+        if n == 0:
+            return {}
+        avg_length = self._total_length / n or 1.0
+        scores: dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc] / avg_length)
+                scores[doc] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+
+class MeetingIndex:
+    """Index d'une réunion : BM25 + chunks (+ vecteurs si embeddings)."""
+
+    def __init__(self, meeting_id: str, use_embeddings: bool = RETRIEVAL_EMBEDDINGS,
+                 embed_batch_size: int = RETRIEVAL_EMBED_BATCH_SIZE):
+        self.meeting_id = meeting_id
+        self.use_embeddings = use_embeddings
+        self.embed_batch_size = max(1, embed_batch_size)
+        self._lock = threading.Lock()
+        self._reset(epoch=None)
+
+    def _reset(self, epoch):
+        self.epoch = epoch
+        self.last_id = STREAM_START
+        self.bm25 = BM25Index()
+        self.chunks: list[dict] = []
+        self._vectors: list[np.ndarray | None] = []
+
+    @staticmethod
+    def _text(chunk: dict) -> str:
+        return f"{chunk.get('text') or ''}\n{chunk.get('translated') or ''}"
+
+    def add(self, chunk: dict):
+        """Ajoute un chunk (ignoré s'il est déjà indexé : les IDs sont croissants)."""
+        chunk_id = chunk["id"]
+        with self._lock:
+            if self._key(chunk_id) <= self._key(self.last_id):
+                return
+            self.bm25.add(self._text(chunk))
+            self.chunks.append(chunk)
+            self._vectors.append(None)
+            self.last_id = chunk_id
+
+    @staticmethod
+    def _key(chunk_id: str) -> tuple[int, int]:
+        ms, _, seq = chunk_id.partition("-")
+        return int(ms), int(seq or 0)
+
+    def sync(self, page_size: int = 500):
+        """Rattrape les chunks du store pas encore indexés ; reconstruit après un reset."""
+        store = get_meeting_store()
+        epoch, _, _ = store.get_live_counters(mid=self.meeting_id)
+        if epoch != self.epoch:
+            with self._lock:
+                self._reset(epoch)
+        while True:
+            chunks, cursor = store.get_chunks_page(self.last_id, count=page_size, mid=self.meeting_id)
+            for c in chunks:
+                self.add(c)
+            if cursor is None:
+                break
+
+    @staticmethod
+    def _embed(texts: list[str]) -> list[np.ndarray] | None:
+        vectors = embed_texts(texts)
+        if not vectors:
+            return None
+        vectors = [np.asarray(v, dtype=np.float32) for v in vectors]
+        return [v / (np.linalg.norm(v) or 1.0) for v in vectors]
+
+    def _embed_missing(self, query: str):
+        """
+        Vecteur de la question ; vectorise au passage les chunks qui n'en ont pas encore.
+        Les appels réseau se font hors du verrou (add() n'attend pas), par lots bornés ;
+        si un lot échoue, les chunks restants sont recherchés en BM25 seul.
+        """
+        with self._lock:
+            vectors = self._vectors
+            missing = [(i, self._text(self.chunks[i])) for i, v in enumerate(vectors) if v is None]
+
+        query_vector = self._embed([query])
+        if query_vector is None:
+            return None
+        for start in range(0, len(missing), self.embed_batch_size):
+            batch = missing[start:start + self.embed_batch_size]
+            embedded = self._embed([text for _, text in batch])
+            if embedded is None:
+                break
+            with self._lock:
+                if self._vectors is not vectors:
+                    break  # index reconstruit entre-temps (nouvelle réunion)
+                for (i, _), v in zip(batch, embedded):
+                    vectors[i] = v
+        return query_vector[0]
+
+    def search(self, query: str, k: int = 6, exclude_ids=()) -> list[dict]:
+        """Top-k chunks pour la question, dans l'ordre chronologique."""
+        self.sync()
+        query_vector = self._embed_missing(query) if self.use_embeddings and self.chunks else None
+        with self._lock:
+            scores = self.bm25.scores(query)
+            if scores:
+                top = max(scores.values())
+                scores = {doc: s / top for doc, s in scores.items()}
+            if query_vector is not None:
+                for doc, v in enumerate(self._vectors):
+                    if v is None:
+                        continue
+                    similarity = float(v @ query_vector)
+                    scores[doc] = scores.get(doc, 0.0) + max(0.0, similarity)
+
+            excluded = set(exclude_ids)
+            ranked = sorted(
+                (doc for doc in scores if self.chunks[doc]["id"] not in excluded),
+                key=lambda doc: scores[doc],
+                reverse=True,
+            )[:k]
+            return [self.chunks[doc] for doc in sorted(ranked)]
+
+
+_indexes: dict[str, MeetingIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_meeting_index(meeting_id: str) -> MeetingIndex:
+    with _indexes_lock:
+        index = _indexes.get(meeting_id)
+        if index is None:
+            index = _indexes[meeting_id] = MeetingIndex(meeting_id)
+    return index
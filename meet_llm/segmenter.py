@@ -0,0 +1,90 @@
+import numpy as np
+
+from recorder import ASR_SAMPLERATE
+
+
+def frame_rms(audio: np.ndarray, frame_len: int) -> np.ndarray:
+    """RMS energy of consecutive frames (the trailing partial frame is ignored)."""
+    n_frames = len(audio) // frame_len
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+class EnergySegmenter:
+    """Cut a 16 kHz mono stream into speech segments at pauses.
+
+    Audio is fed incrementally with feed(); a segment is closed when a pause of at
+    least `silence_seconds` follows speech and the segment is longer than
+    `min_seconds`, or unconditionally once it reaches `max_seconds`. Windows without
+    any frame above `silence_rms` are dropped instead of being emitted.
+    """
+
+    def __init__(self, min_seconds: float = 2.0, max_seconds: float = 20.0,
+                 silence_seconds: float = 0.6, silence_rms: float = 0.01,
+                 frame_ms: int = 30, pre_roll_seconds: float = 0.3,
+                 samplerate: int = ASR_SAMPLERATE):
+        self.frame_len = int(samplerate * frame_ms / 1000)
+        self.min_samples = int(min_seconds * samplerate)
+        self.max_samples = int(max_seconds * samplerate)
+        self.silence_samples = int(silence_seconds * samplerate)
+        self.pre_roll_frames = max(1, int(pre_roll_seconds * samplerate) // self.frame_len)
+        self.silence_rms = silence_rms
+
+        self._frames: list[np.ndarray] = []
+        self._has_speech = False
+        self._silence_run = 0
+        self._leftover = np.zeros(0, dtype=np.float32)
+
+    def _current_len(self) -> int:
+        return len(self._frames) * self.frame_len
+
+    def _reset(self):
+        self._frames = []
+        self._has_speech = False
+        self._silence_run = 0
+
+    def _emit(self) -> np.ndarray | None:
+        segment = None
+        if self._has_speech:
+            # trailing silence beyond the pause itself is useless for ASR
+            keep = len(self._frames) - max(0, self._silence_run - self.silence_samples) // self.frame_len
+            segment = np.concatenate(self._frames[:keep])
+        self._reset()
+        return segment
+
+    def feed(self, audio: np.ndarray) -> list[np.ndarray]:
+        """Add audio and return the list of segments closed by it (possibly empty)."""
+        if len(self._leftover):
+            audio = np.concatenate((self._leftover, audio))
+        energies = frame_rms(audio, self.frame_len)
+        used = len(energies) * self.frame_len
+        self._leftover = audio[used:].copy()
+
+        out = []
+        for k, rms in enumerate(energies):
+            frame = audio[k * self.frame_len:(k + 1) * self.frame_len]
+            self._frames.append(frame)
+
+            if rms >= self.silence_rms:
+                self._has_speech = True
+                self._silence_run = 0
+            else:
+                self._silence_run += self.frame_len
+                if not self._has_speech:
+                    # no speech yet: only keep a short pre-roll before the first word
+                    if len(self._frames) > self.pre_roll_frames:
+                        self._frames.pop(0)
+                    continue
+
+            pause = self._silence_run >= self.silence_samples
+            if (pause and self._current_len() >= self.min_samples) or self._current_len() >= self.max_samples:
+                segment = self._emit()
+                if segment is not None:
+                    out.append(segment)
+        return out
+
+    def flush(self) -> np.ndarray | None:
+        """Close the pending segment (end of stream). Returns None if it is silence only."""
+        return self._emit()
@@ -1,35 +1,97 @@
-from fastapi import FastAPI, Response
+import asyncio
+import json
+import threading
+import time
+
+from typing import Annotated
+
+from fastapi import FastAPI, Response, Request, Path
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse, JSONResponse, FileResponse
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from google_meet_test.main import get_creds, create_calendar_event_with_meet
 
-from audio_worker import state, start_session, stop_session
-from meeting_manager import (
-    start_meeting,
-    stop_meeting,
-    build_live_state,
-    generate_export_report,
-    answer_question,
-    load_current_meeting,
-    save_current_meeting,
-    build_summary_pdf,
+from audio_worker import (
+    start_session,
+    stop_session,
+    get_state,
+    get_pipeline_stats,
+    list_sessions,
 )
+from asr_pool import get_asr_pool
+from speech_gate import get_speech_gate
+from translation_cache import get_translation_cache
+import mistral_async
 from meeting_manager import (
     start_meeting,
     stop_meeting,
     build_live_state,
     generate_export_report,
-    build_summary_pdf,
+    build_export_summary,
+    export_transcript_page,
+    iter_export_ndjson,
+    check_cursor,
     answer_question,
+    save_current_meeting,
+    build_live_delta,
+    list_all_meetings,
 )
+from meeting_store import get_async_meeting_store, STREAM_START, MEETING_ID_PATTERN
+from background import get_heavy_executor, ExecutorBusy
+from pdf_cache import get_pdf_cache
+from config import LIVE_STREAM_INTERVAL, LIVE_STREAM_BACKLOG, ASR_WARMUP, EXPORT_PAGE_SIZE
 
 app = FastAPI()
 
+# ID de réunion pris dans l'URL : refusé (422) s'il ne peut pas servir de nom de fichier
+MeetingId = Annotated[str, Path(pattern=MEETING_ID_PATTERN)]
+
 from fastapi import HTTPException
 
+
+@app.on_event("startup")
+def warmup_asr():
+    """
+    Charge le modèle Whisper dès le démarrage (en arrière-plan : l'API répond
+    pendant ce temps, /api/ready indique quand le modèle est chaud).
+    """
+    if ASR_WARMUP:
+        threading.Thread(target=get_asr_pool().warmup, name="asr-warmup", daemon=True).start()
+
+
+@app.on_event("shutdown")
+def shutdown_asr():
+    get_asr_pool().shutdown(wait=False)
+    get_heavy_executor().shutdown(wait=False)
+
+
+@app.exception_handler(ExecutorBusy)
+async def executor_busy_handler(request: Request, exc: ExecutorBusy):
+    # trop de rendus PDF / exports en attente : le client réessaie plus tard
+    return JSONResponse(status_code=503, content={"detail": "busy, retry later"},
+                        headers={"Retry-After": "5"})
+
+
+@app.get("/api/ready")
+async def api_ready(response: Response):
+    """
+    Readiness : 200 quand le modèle ASR est chargé et chaud, 503 sinon.
+    """
+    readiness = get_asr_pool().readiness()
+    if not readiness["ready"]:
+        response.status_code = 503
+    return readiness
+
+
 @app.post("/api/meeting/create_link")
-def create_link():
+async def create_link():
+    # appels Google (requests) bloquants => thread
+    return await run_in_threadpool(_create_link)
+
+
+def _create_link():
     try:
         creds = get_creds()
 
@@ -81,69 +143,340 @@ class QARequest(BaseModel):
 
 
 # ---------- Routes ----------
+# Les routes /api/meetings/{meeting_id}/... ciblent une réunion précise ;
+# les routes historiques /api/meeting/... et /api/live/... visent la réunion courante
+# (la dernière démarrée).
 
-@app.post("/api/meeting/start")
-def api_meeting_start(body: StartMeetingBody):
+async def _start(body: StartMeetingBody):
     """
-    1. reset mémoire, note l'heure de début, configure langues
-    2. démarre l'audio worker
+    1. nouvel ID de réunion, reset mémoire, note l'heure de début, configure langues
+    2. démarre l'audio worker de cette réunion
     """
-    meta = start_meeting(
+    meta = await run_in_threadpool(
+        start_meeting,
         source_lang=body.source_lang,
         target_lang=body.target_lang,
     )
-    start_session()
+    await run_in_threadpool(start_session, meta["meeting_id"])
     return {
         "ok": True,
+        "meeting_id": meta["meeting_id"],
         "meeting": meta,
     }
 
 
-@app.post("/api/meeting/stop")
-def api_meeting_stop():
+async def _stop(meeting_id: str):
     """
     1. arrête l'audio worker
     2. fige la mémoire et renvoie le rapport final
     """
-    stop_session()
-    report = stop_meeting()
+    stop_session(meeting_id)
+    report = await run_in_threadpool(stop_meeting, meeting_id)
     return {
         "ok": True,
         "final_report": report,
     }
 
 
-@app.get("/api/live/state")
-def api_live_state():
-    live = build_live_state(
+async def _live_state(meeting_id: str):
+    state = get_state(meeting_id)
+    return await build_live_state(
+        meeting_id,
         status=state["status"],
         speaker=state.get("speaker"),
         participants=state.get("participants"),
     )
-    return live
+
+
+def _sse(event, data, event_id=None):
+    msg = f"event: {event}\n"
+    if event_id is not None:
+        msg += f"id: {event_id}\n"
+    return msg + f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _cursor_or_400(cursor: str | None, name: str = "cursor"):
+    try:
+        check_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be a chunk ID <ms>-<seq>")
+    return cursor
+
+
+def _live_stream(meeting_id: str | None, request: Request, since: str | None = None):
+    """
+    Flux Server-Sent Events remplaçant le polling de /api/live/state :
+    - "state"   : statut, lien Meet, participants (à la connexion et quand ça change)
+    - "chunk"   : chaque nouveau chunk (id SSE = ID du stream Redis => reprise via Last-Event-ID)
+    - "partial" : hypothèse ASR en cours
+    - "summary" : résumé live quand il est mis à jour
+    - "reset"   : nouvelle réunion, le client vide sa liste
+    meeting_id=None (route historique) : suit la réunion courante, relue à chaque tour.
+    """
+    resume_id = _cursor_or_400(request.headers.get("last-event-id") or since, "since / Last-Event-ID")
+    store = get_async_meeting_store()
+    follow_current = meeting_id is None
+
+    async def events():
+        mid = meeting_id or await store.get_meeting_id()
+        last_id = resume_id
+        epoch = None
+        if last_id is None:
+            backlog = await store.get_last_chunks(LIVE_STREAM_BACKLOG, mid)
+            # on démarre juste avant les derniers chunks pour les renvoyer au client
+            last_id = backlog[0]["id"] if backlog else STREAM_START
+            if backlog:
+                yield _sse("chunk", backlog[0], event_id=backlog[0]["id"])
+        yield "retry: 2000\n\n"
+
+        sent_state = None
+        partial = None
+        summary_version = None
+        last_write = time.monotonic()
+
+        while not await request.is_disconnected():
+            if follow_current:
+                current_id = await store.get_meeting_id()
+                if current_id != mid:
+                    # nouvelle réunion démarrée : on repart de son début
+                    mid = current_id
+                    last_id, epoch = STREAM_START, None
+                    sent_state = partial = summary_version = None
+                    yield _sse("reset", {})
+                    last_write = time.monotonic()
+
+            state = get_state(mid)
+            current_state = (state["status"], state.get("speaker"), tuple(state.get("participants") or []))
+            if current_state != sent_state:
+                meet = await store.load_meeting(mid)
+                yield _sse("state", {
+                    "meeting_id": mid,
+                    "status": state["status"],
+                    "speaker": state.get("speaker"),
+                    "meet_link": meet.get("meet_link"),
+                    "participants": state.get("participants") or meet.get("participants", []),
+                })
+                sent_state = current_state
+                last_write = time.monotonic()
+
+            delta = await build_live_delta(mid, last_id, epoch, summary_version)
+            if delta["reset"]:
+                yield _sse("reset", {})
+            epoch = delta["epoch"]
+            for c in delta["chunks"]:
+                yield _sse("chunk", c, event_id=c["id"])
+            last_id = delta["last_id"]
+            if delta["partial"] != partial:
+                partial = delta["partial"]
+                yield _sse("partial", {"text": partial})
+                last_write = time.monotonic()
+            if delta["summary"] is not None:
+                summary_version = delta["summary_version"]
+                yield _sse("summary", {"summary": delta["summary"]})
+
+            if delta["reset"] or delta["chunks"] or delta["summary"] is not None:
+                last_write = time.monotonic()
+            elif time.monotonic() - last_write > 15:
+                yield ": keep-alive\n\n"
+                last_write = time.monotonic()
+
+            await asyncio.sleep(LIVE_STREAM_INTERVAL)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _pipeline_stats(meeting_id: str):
+    """
+    profondeur des files + latences par étape (ASR, traduction, persistance)
+    + file du pool ASR + compteurs hit/miss du cache de traduction
+    """
+    return {
+        "meeting_id": meeting_id,
+        **get_pipeline_stats(meeting_id),
+        "asr_pool": get_asr_pool().stats(),
+        "speech_gate": get_speech_gate().stats(),
+        "translation_cache": get_translation_cache().stats(),
+        "mistral": mistral_async.stats(),
+        "heavy_executor": get_heavy_executor().stats(),
+        "pdf_cache": get_pdf_cache().stats(),
+    }
+
+
+async def _export(meeting_id: str, format: str, cursor: str | None, limit: int | None):
+    """
+    - format=ndjson : tout le transcript en streaming, lu dans le store page par page
+    - limit (et cursor) : une page JSON {chunks, next_cursor}
+    - sinon : export complet historique (résumé + raw_transcript)
+    """
+    _cursor_or_400(cursor)
+    if format == "ndjson":
+        return StreamingResponse(
+            iter_export_ndjson(meeting_id, cursor, limit or EXPORT_PAGE_SIZE),
+            media_type="application/x-ndjson",
+            headers={
+                "Content-Disposition": f'attachment; filename="meeting_transcript_{meeting_id}.ndjson"'
+            },
+        )
+    if format != "json":
+        raise HTTPException(status_code=400, detail="format must be json or ndjson")
+    if limit is not None or cursor is not None:
+        return await export_transcript_page(meeting_id, cursor, limit or EXPORT_PAGE_SIZE)
+    return await get_heavy_executor().run(generate_export_report, meeting_id)
+
+
+async def _summary_pdf(meeting_id: str, wait: bool = True):
+    """
+    PDF en cache si le transcript n'a pas changé, sinon rendu en fond (exécuteur dédié).
+    wait=false : 202 + statut pendant le rendu (à suivre via .../summary_pdf/status).
+    """
+    pdf, status = await get_pdf_cache().get_or_render(meeting_id, wait=wait)
+    if pdf is None:
+        return JSONResponse(status_code=202, content=await get_pdf_cache().status(meeting_id))
+    headers = {
+        "Content-Disposition": f'attachment; filename="meeting_summary_{meeting_id}.pdf"'
+    }
+    if isinstance(pdf, str):
+        # cache disque : envoyé par morceaux depuis le fichier
+        return FileResponse(pdf, media_type="application/pdf", headers=headers)
+    return Response(content=pdf, media_type="application/pdf", headers=headers)
+
+
+# ---------- Routes par réunion ----------
+
+@app.post("/api/meetings")
+async def api_meetings_create(body: StartMeetingBody):
+    return await _start(body)
+
+
+@app.get("/api/meetings")
+async def api_meetings_list():
+    sessions = {s["meeting_id"]: s["status"] for s in list_sessions()}
+    return {
+        "current": await get_async_meeting_store().get_meeting_id(),
+        "meetings": [
+            {**m, "status": sessions.get(m["meeting_id"], "stopped")}
+            for m in await list_all_meetings()
+        ],
+    }
+
+
+@app.post("/api/meetings/{meeting_id}/stop")
+async def api_meetings_stop(meeting_id: MeetingId):
+    return await _stop(meeting_id)
+
+
+@app.get("/api/meetings/{meeting_id}/info")
+async def api_meetings_info(meeting_id: MeetingId):
+    return await get_async_meeting_store().load_meeting(meeting_id)
+
+
+@app.get("/api/meetings/{meeting_id}/state")
+async def api_meetings_state(meeting_id: MeetingId):
+    return await _live_state(meeting_id)
+
+
+@app.get("/api/meetings/{meeting_id}/stream")
+async def api_meetings_stream(meeting_id: MeetingId, request: Request, since: str | None = None):
+    return _live_stream(meeting_id, request, since)
+
+
+@app.get("/api/meetings/{meeting_id}/pipeline/stats")
+async def api_meetings_pipeline_stats(meeting_id: MeetingId):
+    return _pipeline_stats(meeting_id)
+
+
+@app.get("/api/meetings/{meeting_id}/export")
+async def api_meetings_export(meeting_id: MeetingId, format: str = "json",
+                              cursor: str | None = None, limit: int | None = None):
+    return await _export(meeting_id, format, cursor, limit)
+
+
+@app.get("/api/meetings/{meeting_id}/export/summary")
+async def api_meetings_export_summary(meeting_id: MeetingId):
+    return await get_heavy_executor().run(build_export_summary, meeting_id)
+
+
+@app.post("/api/meetings/{meeting_id}/qa")
+async def api_meetings_qa(meeting_id: MeetingId, body: QARequest):
+    return {"answer": await answer_question(meeting_id, body.question)}
+
+
+@app.get("/api/meetings/{meeting_id}/summary_pdf")
+async def api_meetings_summary_pdf(meeting_id: MeetingId, wait: bool = True):
+    return await _summary_pdf(meeting_id, wait)
+
+
+@app.get("/api/meetings/{meeting_id}/summary_pdf/status")
+async def api_meetings_summary_pdf_status(meeting_id: MeetingId):
+    return await get_pdf_cache().status(meeting_id)
+
+
+# ---------- Routes historiques (réunion courante) ----------
+
+async def _current_id():
+    return await get_async_meeting_store().get_meeting_id()
+
+
+@app.post("/api/meeting/start")
+async def api_meeting_start(body: StartMeetingBody):
+    return await _start(body)
+
+
+@app.post("/api/meeting/stop")
+async def api_meeting_stop():
+    return await _stop(await _current_id())
+
+
+@app.get("/api/live/state")
+async def api_live_state():
+    return await _live_state(await _current_id())
+
+
+@app.get("/api/live/stream")
+async def api_live_stream(request: Request, since: str | None = None):
+    return _live_stream(None, request, since)
+
+
+@app.get("/api/pipeline/stats")
+async def api_pipeline_stats():
+    return _pipeline_stats(await _current_id())
 
 
 @app.get("/api/meeting/export")
-def api_meeting_export():
+async def api_meeting_export(format: str = "json", cursor: str | None = None, limit: int | None = None):
     """
     renvoie le résumé final + transcript brut
-    (pour la page Summary + download)
+    (pour la page Summary + download) ; ?limit= / ?format=ndjson : transcript par pages
     """
-    return generate_export_report()
+    return await _export(await _current_id(), format, cursor, limit)
+
+
+@app.get("/api/meeting/export/summary")
+async def api_meeting_export_summary():
+    return await get_heavy_executor().run(build_export_summary, await _current_id())
 
 
 @app.post("/api/meeting/qa")
-def api_meeting_qa(body: QARequest):
+async def api_meeting_qa(body: QARequest):
     """
     chatbot QA basé sur le contenu de la réunion
     """
-    ans = answer_question(body.question)
+    ans = await answer_question(await _current_id(), body.question)
     return { "answer": ans }
 
 
 from fastapi import HTTPException
 @app.post("/api/meeting/invite")
-def api_meeting_invite(body: InviteBody):
+async def api_meeting_invite(body: InviteBody):
+    # appels Google (requests) bloquants => thread
+    return await run_in_threadpool(_invite, body)
+
+
+def _invite(body: InviteBody):
     try:
         creds = get_creds()
 
@@ -178,21 +511,19 @@ def api_meeting_invite(body: InviteBody):
 
 
 @app.get("/api/meeting/info")
-def api_meeting_info():
+async def api_meeting_info():
     """
     Récupérer les infos du meeting courant (pour la HomePage)
     """
-    return load_current_meeting()
+    return await get_async_meeting_store().load_current_meeting()
 
 @app.get("/api/meeting/summary_pdf")
-def get_meeting_summary_pdf():
-    pdf_bytes = build_summary_pdf()
-    return Response(
-        content=pdf_bytes,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": 'attachment; filename="meeting_summary.pdf"'
-        },
-    )
+async def get_meeting_summary_pdf(wait: bool = True):
+    return await _summary_pdf(await _current_id(), wait)
+
+
+@app.get("/api/meeting/summary_pdf/status")
+async def get_meeting_summary_pdf_status():
+    return await get_pdf_cache().status(await _current_id())
     
 
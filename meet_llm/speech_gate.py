@@ -0,0 +1,116 @@
+# speech_gate.py
+"""
+Filtre avant / après ASR pour que les silences ne coûtent ni CPU Whisper ni appel LLM :
+- avant : énergie RMS par trame (+ VAD webrtcvad optionnel) sur les échantillons bruts ;
+  un chunk sans parole n'est pas transcrit
+- après : les segments Whisper avec un no_speech_prob élevé ne partent pas en traduction
+"""
+import threading
+
+import numpy as np
+import soundfile as sf
+
+from recorder import ASR_SAMPLERATE, resample_to_asr
+from segmenter import frame_rms
+from config import ASR_GATE_RMS, ASR_GATE_VAD_MODE, ASR_GATE_MIN_SPEECH_RATIO, ASR_MAX_NO_SPEECH_PROB
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+
+def _load(audio) -> np.ndarray:
+    """Chemin WAV ou array -> array 16 kHz mono float32."""
+    if isinstance(audio, str):
+        data, samplerate = sf.read(audio, dtype="float32", always_2d=True)
+        return resample_to_asr(data.mean(axis=1), samplerate)
+    return np.asarray(audio, dtype=np.float32)
+
+
+class SpeechGate:
+    """
+    has_speech(audio) : False si aucune trame ne dépasse `rms_threshold`, ou si le VAD
+    (mode webrtcvad 0-3, -1 = désactivé) trouve moins de `min_speech_ratio` de trames
+    parlées parmi les trames assez fortes.
+    """
+
+    def __init__(self, rms_threshold: float = 0.01, vad_mode: int = -1,
+                 min_speech_ratio: float = 0.1, max_no_speech_prob: float = 0.6,
+                 frame_ms: int = 30):
+        self.rms_threshold = rms_threshold
+        self.min_speech_ratio = min_speech_ratio
+        self.max_no_speech_prob = max_no_speech_prob
+        self.frame_len = int(ASR_SAMPLERATE * frame_ms / 1000)  # 10/20/30 ms pour webrtcvad
+
+        self._vad = None
+        if vad_mode >= 0:
+            if webrtcvad is None:
+                print("[speech_gate] webrtcvad non installé, filtre RMS seulement")
+            else:
+                self._vad = webrtcvad.Vad(vad_mode)
+
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.skipped = 0
+        self.segments_dropped = 0
+
+    def _speech_ratio(self, audio: np.ndarray, loud: np.ndarray) -> float:
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+        frames = np.flatnonzero(loud)
+        voiced = 0
+        for i in frames:
+            frame = pcm[i * self.frame_len:(i + 1) * self.frame_len].tobytes()
+            if self._vad.is_speech(frame, ASR_SAMPLERATE):
+                voiced += 1
+        return voiced / len(frames)
+
+    def has_speech(self, audio) -> bool:
+        audio = _load(audio)
+        rms = frame_rms(audio, self.frame_len)
+        loud = rms >= self.rms_threshold
+        speech = bool(loud.any())
+        if speech and self._vad is not None:
+            speech = self._speech_ratio(audio, loud) >= self.min_speech_ratio
+
+        with self._lock:
+            self.checked += 1
+            if not speech:
+                self.skipped += 1
+        return speech
+
+    def keep_segments(self, segments: list[dict]) -> list[dict]:
+        """Segments Whisper gardés (texte non vide, no_speech_prob <= max_no_speech_prob)."""
+        kept, dropped = [], 0
+        for seg in segments:
+            ns = seg.get("no_speech_prob")
+            if ns is not None and ns > self.max_no_speech_prob:
+                dropped += 1
+                continue
+            if seg.get("text"):
+                kept.append(seg)
+        if dropped:
+            with self._lock:
+                self.segments_dropped += dropped
+        return kept
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "vad": self._vad is not None,
+                "checked": self.checked,
+                "skipped": self.skipped,
+                "skip_rate": round(self.skipped / self.checked, 3) if self.checked else 0.0,
+                "segments_dropped": self.segments_dropped,
+            }
+
+
+_gate: SpeechGate | None = None
+
+
+def get_speech_gate() -> SpeechGate:
+    global _gate
+    if _gate is None:
+        _gate = SpeechGate(ASR_GATE_RMS, ASR_GATE_VAD_MODE, ASR_GATE_MIN_SPEECH_RATIO,
+                           ASR_MAX_NO_SPEECH_PROB)
+    return _gate
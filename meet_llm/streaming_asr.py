@@ -0,0 +1,119 @@
+import numpy as np
+
+from asr_pool import get_asr_pool
+from recorder import ASR_SAMPLERATE
+
+
+def _shift(seg: dict, offset: float) -> dict:
+    """Segment (and its word timings, if any) moved from window time to stream time."""
+    shifted = {**seg, "start": offset + seg["start"], "end": offset + seg["end"]}
+    if seg.get("words"):
+        shifted["words"] = [
+            {**w, "start": offset + w["start"], "end": offset + w["end"]} for w in seg["words"]
+        ]
+    return shifted
+
+
+class StreamingTranscriber:
+    """Incremental transcription over a sliding audio window.
+
+    Audio blocks (16 kHz mono float32) are appended with feed(). Every `step_seconds`
+    of new audio the whole window is re-decoded through the shared ASR pool (asr_pool.py):
+    - segments that end at least `commit_margin_seconds` before the end of the window
+      (and are not the last one) are considered stable: they are committed and their
+      audio is dropped from the window;
+    - the remaining text is the unstable partial hypothesis shown in the live view.
+    If the window grows beyond `max_window_seconds` everything decoded is committed.
+
+    Re-decoding the window is what lets the partial text settle; its cost is bounded by
+    `max_window_seconds`, and by `gate` (see speech_gate.SpeechGate): a silent step with
+    nothing pending skips Whisper and drops the silence, so quiet periods don't grow the window.
+    """
+
+    # audio kept when a silent window is dropped, so a quiet word onset is not cut
+    SILENCE_TAIL_SECONDS = 0.3
+
+    def __init__(self, language: str | None = None, step_seconds: float = 1.0,
+                 max_window_seconds: float = 15.0, commit_margin_seconds: float = 1.0,
+                 beam_size: int = 1, gate=None):
+        self.language = language
+        self.step_samples = int(step_seconds * ASR_SAMPLERATE)
+        self.max_window_samples = int(max_window_seconds * ASR_SAMPLERATE)
+        self.commit_margin = commit_margin_seconds
+        self.beam_size = beam_size
+        self.gate = gate
+
+        self._window = np.zeros(0, dtype=np.float32)
+        self._offset = 0.0          # stream time (s) of the first sample of the window
+        self._pending = 0           # samples fed since the last decode
+        self._prompt = ""           # tail of committed text, helps keep context
+        self.partial = ""
+
+    def _decode(self):
+        _, _, segments = get_asr_pool().transcribe(
+            self._window,
+            language=self.language,
+            vad_filter=False,
+            beam_size=self.beam_size,
+            condition_on_previous_text=False,
+            initial_prompt=self._prompt or None,
+        )
+        return [seg for seg in segments if seg["text"]]
+
+    def _commit(self, segs: list[dict]) -> list[dict]:
+        if not segs:
+            return []
+        cut = min(len(self._window), int(segs[-1]["end"] * ASR_SAMPLERATE))
+        committed = [_shift(s, self._offset) for s in segs]
+        self._window = self._window[cut:]
+        self._offset += cut / ASR_SAMPLERATE
+        self._prompt = (self._prompt + " " + " ".join(s["text"] for s in segs)).strip()[-200:]
+        return committed
+
+    def feed(self, audio: np.ndarray) -> tuple[list[dict], str]:
+        """Append audio. Returns (newly committed segments, current partial text)."""
+        self._window = np.concatenate((self._window, audio.astype(np.float32, copy=False)))
+        self._pending += len(audio)
+        if self._pending < self.step_samples:
+            return [], self.partial
+        new_audio = self._window[-self._pending:]
+        self._pending = 0
+
+        if self.gate is not None and not self.partial and not self.gate.has_speech(new_audio):
+            # silence and no speech in progress: nothing to decode, drop it from the window
+            tail = int(self.SILENCE_TAIL_SECONDS * ASR_SAMPLERATE)
+            drop = max(0, len(self._window) - tail)
+            self._window = self._window[drop:]
+            self._offset += drop / ASR_SAMPLERATE
+            return [], self.partial
+
+        segs = self._decode()
+        window_end = len(self._window) / ASR_SAMPLERATE
+
+        if len(self._window) >= self.max_window_samples:
+            stable, unstable = segs, []
+        else:
+            n_stable = 0
+            for i, s in enumerate(segs[:-1]):
+                if s["end"] <= window_end - self.commit_margin:
+                    n_stable = i + 1
+            stable, unstable = segs[:n_stable], segs[n_stable:]
+
+        committed = self._commit(stable)
+        if not segs and len(self._window) >= self.max_window_samples:
+            # nothing recognized in a full window: drop it instead of growing forever
+            self._offset += len(self._window) / ASR_SAMPLERATE
+            self._window = np.zeros(0, dtype=np.float32)
+
+        self.partial = " ".join(s["text"] for s in unstable)
+        return committed, self.partial
+
+    def flush(self) -> list[dict]:
+        """Decode and commit whatever is left in the window (end of stream)."""
+        committed = []
+        if len(self._window):
+            committed = self._commit(self._decode())
+        self._window = np.zeros(0, dtype=np.float32)
+        self._pending = 0
+        self.partial = ""
+        return committed
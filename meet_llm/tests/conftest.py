@@ -0,0 +1,5 @@
+import os
+import sys
+
+# les modules de meet_llm s'importent à plat (comme depuis server.py / main.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,85 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faster_whisper")
+
+import asr
+
+SR = asr.SAMPLE_RATE
+
+
+class _Segment:
+    def __init__(self, start, end, text):
+        self.start = start
+        self.end = end
+        self.text = text
+        self.no_speech_prob = 0.0
+        self.avg_logprob = -0.1
+        self.words = None
+
+
+class _FakeBatchedPipeline:
+    """Suit le contrat de clip_timestamps de BatchedInferencePipeline : un segment par clip."""
+
+    def __init__(self, clips_in_seconds):
+        self.clips_in_seconds = clips_in_seconds
+
+    def transcribe(self, audio, clip_timestamps, **options):
+        segments = []
+        for clip in clip_timestamps:
+            if self.clips_in_seconds:
+                start, end = int(clip["start"] * SR), int(clip["end"] * SR)
+            else:
+                assert isinstance(clip["start"], int) and isinstance(clip["end"], int)
+                start, end = clip["start"], clip["end"]
+            piece = audio[start:end]
+            segments.append(_Segment(start / SR, end / SR, f"level{piece.max():.0f}"))
+        return iter(segments), None
+
+
+@pytest.mark.parametrize("clips_in_seconds", [False, True])
+def test_two_clip_batch_maps_segments_back_to_inputs(monkeypatch, clips_in_seconds):
+    monkeypatch.setattr(asr, "_CLIPS_IN_SECONDS", clips_in_seconds)
+    monkeypatch.setattr(asr, "get_batched_model", lambda: _FakeBatchedPipeline(clips_in_seconds))
+
+    first = np.full(SR, 1.0, dtype=np.float32)          # 1 s
+    second = np.full(SR // 2, 2.0, dtype=np.float32)    # 0.5 s
+    results = asr.transcribe_batch([first, second], language="en")
+
+    assert [text for text, _, _ in results] == ["level1", "level2"]
+    (_, _, segs_a), (_, _, segs_b) = results
+    assert segs_a[0]["start"] == pytest.approx(0.0)
+    assert segs_a[0]["end"] == pytest.approx(1.0)
+    assert segs_b[0]["start"] == pytest.approx(0.0)
+    assert segs_b[0]["end"] == pytest.approx(0.5)
+
+
+def test_long_input_is_split_into_30s_clips(monkeypatch):
+    monkeypatch.setattr(asr, "get_batched_model", lambda: _FakeBatchedPipeline(asr._CLIPS_IN_SECONDS))
+    long = np.full(45 * SR, 3.0, dtype=np.float32)
+    short = np.full(SR, 4.0, dtype=np.float32)
+    results = asr.transcribe_batch([long, short], language="en")
+
+    assert results[0][0] == "level3 level3"
+    assert [s["end"] for s in results[0][2]] == pytest.approx([30.0, 45.0])
+    assert results[1][0] == "level4"
+
+
+def test_concurrent_get_model_loads_once(monkeypatch):
+    loads = []
+
+    def slow_load(cpu_threads, num_workers):
+        time.sleep(0.05)
+        loads.append(object())
+        return loads[-1]
+
+    monkeypatch.setattr(asr, "_MODEL", None)
+    monkeypatch.setattr(asr, "_load_model", slow_load)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        models = list(pool.map(lambda _: asr.get_model(), range(8)))
+
+    assert len(loads) == 1
+    assert all(m is loads[0] for m in models)
@@ -0,0 +1,112 @@
+import threading
+
+import numpy as np
+import pytest
+
+import audio_worker
+from audio_worker import _chunk_item, _coalesce_audio, _coalesce_text, _timeline
+from meeting_store import MemoryMeetingStore, set_meeting_store
+from recorder import ASR_SAMPLERATE
+
+
+def _item(seconds, start):
+    return {"audio": np.zeros(int(seconds * ASR_SAMPLERATE), dtype=np.float32), "start": start}
+
+
+def _seg(start, end, text="hello", **extra):
+    return {"start": start, "end": end, "text": text, "no_speech_prob": 0.1, "avg_logprob": -0.2, **extra}
+
+
+def test_timeline_of_single_item_is_an_offset():
+    assert _timeline(_item(2, 10.0))(1.5) == pytest.approx(11.5)
+
+
+def test_coalesced_audio_keeps_each_part_position():
+    # 2 s de parole à 10 s, puis (silence jeté par le segmenter) 1 s de parole à 30 s
+    merged = _coalesce_audio(_item(2, 10.0), _item(1, 30.0))
+    assert len(merged["audio"]) == 3 * ASR_SAMPLERATE
+    to_meeting = _timeline(merged)
+    assert to_meeting(0.5) == pytest.approx(10.5)
+    assert to_meeting(2.25) == pytest.approx(30.25)
+
+    merged = _coalesce_audio(merged, _item(1, 50.0))
+    assert _timeline(merged)(3.5) == pytest.approx(50.5)
+
+
+def test_chunk_item_maps_segments_and_words_to_meeting_time():
+    merged = _coalesce_audio(_item(2, 10.0), _item(1, 30.0))
+    words = [{"start": 2.1, "end": 2.4, "word": " world", "probability": 0.9}]
+    item = _chunk_item([_seg(0.0, 1.5), _seg(2.0, 2.8, "world", words=words)], _timeline(merged))
+
+    assert item["text"] == "hello world"
+    assert (item["start"], item["end"]) == (10.0, 30.8)
+    assert [s["start"] for s in item["segments"]] == [10.0, 30.0]
+    assert item["segments"][0]["conf"] == pytest.approx(0.819, abs=1e-3)
+    assert item["words"] == [["world", 30.1, 30.4]]
+
+
+def test_chunk_item_is_none_without_kept_segments():
+    assert _chunk_item([_seg(0, 1, no_speech_prob=0.99)], _timeline(_item(1, 0.0))) is None
+    assert _chunk_item([], _timeline(_item(1, 0.0))) is None
+
+
+def test_coalesce_text_merges_metadata():
+    to_meeting = _timeline(_item(1, 0.0))
+    a = _chunk_item([_seg(0.0, 1.0, "a")], to_meeting)
+    b = _chunk_item([_seg(4.0, 5.0, "b")], to_meeting)
+    merged = _coalesce_text(a, b)
+    assert merged["text"] == "a b"
+    assert (merged["start"], merged["end"]) == (0.0, 5.0)
+    assert len(merged["segments"]) == 2
+
+
+class _DrainingSession(audio_worker.MeetingSession):
+    """_run bloque jusqu'à `drained` : simule un pipeline encore en train de se vider."""
+
+    def __init__(self):
+        super().__init__("m1")
+        self.drained = threading.Event()
+        self.runs = 0
+
+    def _run(self):
+        self.runs += 1
+        self._stop_event.wait()
+        self.drained.wait()
+
+
+@pytest.fixture
+def store():
+    store = MemoryMeetingStore()
+    set_meeting_store(store)
+    yield store
+    set_meeting_store(None)
+
+
+def test_restart_waits_for_previous_run_to_finish(store):
+    session = _DrainingSession()
+    session.start()
+    first = session._thread
+    session.stop()
+
+    restart = threading.Thread(target=session.start)
+    restart.start()
+    restart.join(0.2)
+    assert restart.is_alive() and session._thread is first
+
+    session.drained.set()
+    restart.join(2)
+    assert not first.is_alive() and session._thread is not first
+    assert session.runs == 2 and session.state["status"] == "listening"
+    session.stop()
+
+
+def test_restart_refused_while_previous_run_is_stuck(store, monkeypatch):
+    monkeypatch.setattr(audio_worker, "SESSION_RESTART_TIMEOUT", 0.1)
+    session = _DrainingSession()
+    session.start()
+    session.stop()
+
+    with pytest.raises(RuntimeError):
+        session.start()
+    assert session.state["status"] == "stopped" and session.runs == 1
+    session.drained.set()
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+import chunk_codec
+from chunk_codec import JsonChunkCodec, MsgpackChunkCodec, decode_chunk, encode_chunk
+
+pytest.importorskip("msgpack")
+
+ENTRY = {
+    "text": "hello world",
+    "translated": "bonjour le monde",
+    "start": 12.34,
+    "end": 15.6,
+    "segments": [{"start": 12.34, "end": 15.6, "conf": 0.812, "no_speech": 0.05}],
+    "words": [["hello", 12.34, 12.9], ["world", 13.0, 15.6]],
+}
+
+
+@pytest.mark.parametrize("codec", ["msgpack", "json"])
+def test_roundtrip(codec, monkeypatch):
+    monkeypatch.setattr(chunk_codec, "CHUNK_CODEC", codec)
+    fields = encode_chunk(ENTRY)
+    assert list(fields) == [MsgpackChunkCodec.field if codec == "msgpack" else JsonChunkCodec.field]
+    assert decode_chunk(fields) == ENTRY
+
+
+def test_msgpack_is_smaller_than_json():
+    assert len(MsgpackChunkCodec().encode(ENTRY)) < len(JsonChunkCodec().encode(ENTRY))
+
+
+def test_msgpack_rounds_times_and_probabilities():
+    entry = {"text": "a", "translated": None, "start": 1.23456, "end": 2.0,
+             "segments": [{"start": 1.23456, "end": 2.0, "conf": 0.81234, "no_speech": None}]}
+    decoded = MsgpackChunkCodec().decode(MsgpackChunkCodec().encode(entry))
+    assert decoded["start"] == 1.23
+    assert decoded["segments"] == [{"start": 1.23, "end": 2.0, "conf": 0.812, "no_speech": None}]
+
+
+def test_msgpack_keeps_plain_chunks_and_extra_fields():
+    codec = MsgpackChunkCodec()
+    assert codec.decode(codec.encode({"text": "a", "translated": None})) == {"text": "a", "translated": None}
+    entry = {"text": "a", "translated": "b", "speaker": "Alice"}
+    assert codec.decode(codec.encode(entry)) == entry
+
+
+def test_legacy_json_entries_with_bytes_keys_are_read():
+    fields = {b"data": json.dumps({"text": "héllo", "translated": None}).encode("utf-8")}
+    assert decode_chunk(fields) == {"text": "héllo", "translated": None}
+
+
+def test_unknown_or_corrupt_entries_decode_to_none():
+    assert decode_chunk({b"m9": b"\x00"}) is None
+    assert decode_chunk({}) is None
+    assert decode_chunk({b"data": b"{not json"}) is None
+    assert decode_chunk({b"m1": b"\xc1"}) is None
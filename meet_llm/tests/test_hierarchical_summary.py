@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+
+import hierarchical_summary
+from hierarchical_summary import split_windows, summarize_chunks
+from meeting_store import MemoryMeetingStore, set_meeting_store
+
+
+@pytest.fixture
+def store():
+    store = MemoryMeetingStore()
+    set_meeting_store(store)
+    yield store
+    set_meeting_store(None)
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Appels LLM factices : map -> "S(<1re ligne>)", reduce final -> "FINAL"."""
+    calls = {"map": [], "final": []}
+    lock = threading.Lock()
+
+    def fake_ask(prompt, temperature=0.2):
+        text = prompt.rsplit("\n\n", 1)[1]
+        with lock:
+            calls["map"].append(text)
+        return f"S({text.splitlines()[0]})"
+
+    def fake_final(text, target_lang="fr"):
+        calls["final"].append(text)
+        return "FINAL"
+
+    monkeypatch.setattr(hierarchical_summary, "ask_mistral", fake_ask)
+    monkeypatch.setattr(hierarchical_summary, "summarize_meeting_paragraphs", fake_final)
+    return calls
+
+
+def _chunks(n, prefix="line"):
+    return [{"id": f"{i}-0", "text": f"{prefix} {i:03d}", "translated": None} for i in range(n)]
+
+
+def test_windows_are_stable_when_the_meeting_grows():
+    before = split_windows(_chunks(20), window_chars=50)
+    after = split_windows(_chunks(30), window_chars=50)
+    assert after[:len(before) - 1] == before[:-1]
+    assert all(len(w) <= 50 for w in after)
+    assert split_windows([{"text": "", "translated": None}]) == []
+
+
+def test_short_meeting_skips_map_reduce(store, llm):
+    assert summarize_chunks(_chunks(3), window_chars=1000, meeting_id="m1") == "FINAL"
+    assert llm["map"] == []
+    assert llm["final"] == ["line 000\nline 001\nline 002"]
+
+
+def test_window_summaries_are_cached_and_only_new_windows_are_sent(store, llm):
+    summarize_chunks(_chunks(20), window_chars=50, meeting_id="m1")
+    first = list(llm["map"])
+    assert len(first) == len(split_windows(_chunks(20), window_chars=50))
+
+    llm["map"].clear()
+    summarize_chunks(_chunks(20), window_chars=50, meeting_id="m1")
+    assert llm["map"] == []
+
+    summarize_chunks(_chunks(30), window_chars=50, meeting_id="m1")
+    # seules la dernière fenêtre (modifiée) et les nouvelles repartent
+    assert set(llm["map"]).isdisjoint(first[:-1])
+    assert llm["map"][0] not in first
+
+
+def test_cache_is_per_meeting_and_cleared_on_reset(store, llm):
+    summarize_chunks(_chunks(20), window_chars=50, meeting_id="m1")
+    sent = len(llm["map"])
+
+    summarize_chunks(_chunks(20), window_chars=50, meeting_id="m2")
+    assert len(llm["map"]) == 2 * sent
+
+    store.reset_meeting_memory("m1")
+    summarize_chunks(_chunks(20), window_chars=50, meeting_id="m1")
+    assert len(llm["map"]) == 3 * sent
+
+
+def test_failed_window_is_not_cached(store, llm, monkeypatch):
+    monkeypatch.setattr(hierarchical_summary, "ask_mistral", lambda prompt, temperature=0.2: None)
+    summarize_chunks(_chunks(20), window_chars=50, meeting_id="m1")
+    # le texte brut tronqué sert de résumé, mais rien n'est mis en cache
+    assert "line 000" in llm["final"][0]
+    assert store._state("m1")["window_summaries"] == {}
+
+
+def test_reduce_recurses_until_summaries_fit(store, llm):
+    summarize_chunks(_chunks(200), window_chars=60, meeting_id="m1")
+    # le compte-rendu final reçoit moins de parties qu'il n'y a de fenêtres
+    windows = len(split_windows(_chunks(200), window_chars=60))
+    assert llm["final"][0].count("Partie ") < windows
@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pytest
+
+import live_summary
+from live_summary import LiveSummarizer
+from meeting_store import STREAM_START, MemoryMeetingStore, set_meeting_store
+
+
+@pytest.fixture
+def store():
+    store = MemoryMeetingStore()
+    set_meeting_store(store)
+    yield store
+    set_meeting_store(None)
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """ask_mistral factice : garde les prompts, répond "summary #n"."""
+    prompts = []
+    lock = threading.Lock()
+
+    def fake_ask(prompt, temperature=0.2):
+        with lock:
+            prompts.append(prompt)
+            return f"summary #{len(prompts)}"
+
+    monkeypatch.setattr(live_summary, "ask_mistral", fake_ask)
+    return prompts
+
+
+def _append(store, summarizer, n, start=0):
+    for i in range(start, start + n):
+        store.append_chunk(f"line {i}", f"ligne {i}", mid="m1")
+        summarizer.notify()
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_update_waits_for_every_chunks(store, llm):
+    summarizer = LiveSummarizer("m1", every_chunks=3, every_seconds=3600)
+    summarizer.start()
+    try:
+        _append(store, summarizer, 2)
+        time.sleep(0.2)
+        assert llm == []
+
+        _append(store, summarizer, 1, start=2)
+        assert _wait_for(lambda: summarizer.updates == 1)
+    finally:
+        summarizer.stop(final_update=False)
+
+    # une seule requête pour les 3 chunks, dans l'ordre
+    assert len(llm) == 1
+    assert llm[0].index("ligne 0") < llm[0].index("ligne 1") < llm[0].index("ligne 2")
+    assert store.get_summary(mid="m1") == "summary #1"
+    assert store.get_summary_cursor(mid="m1") == store.get_all_chunks(mid="m1")[-1]["id"]
+
+
+def test_debounce_flushes_few_chunks_after_every_seconds(store, llm):
+    summarizer = LiveSummarizer("m1", every_chunks=100, every_seconds=0.3)
+    summarizer.start()
+    try:
+        _append(store, summarizer, 2)
+        assert _wait_for(lambda: summarizer.updates == 1)
+        time.sleep(0.5)
+    finally:
+        summarizer.stop(final_update=False)
+    # rien de nouveau après la mise à jour : pas de deuxième appel
+    assert len(llm) == 1
+
+
+def test_prompt_is_bounded_and_rest_is_taken_next_round(store, llm):
+    summarizer = LiveSummarizer("m1", every_chunks=100, every_seconds=3600,
+                                max_input_chars=30, max_summary_chars=10)
+    for i in range(6):
+        store.append_chunk("x", f"chunk-{i:02d}", mid="m1")  # 8 caractères
+    summarizer.notify(6)
+    store.set_summary("A" * 50 + "recent", mid="m1")
+
+    assert summarizer.update()
+    assert "chunk-02" in llm[0] and "chunk-03" not in llm[0]
+    assert "A" * 11 not in llm[0] and "AAAArecent" in llm[0]
+    assert summarizer._pending_chunks() == 3
+
+    assert summarizer.update()
+    assert "chunk-03" in llm[1] and "chunk-05" in llm[1] and "chunk-02" not in llm[1]
+    assert summarizer._pending_chunks() == 0
+    assert not summarizer.update()
+
+
+def test_stop_integrates_remaining_chunks(store, llm):
+    summarizer = LiveSummarizer("m1", every_chunks=100, every_seconds=3600)
+    summarizer.start()
+    _append(store, summarizer, 4)
+    summarizer.stop(final_update=True)
+
+    assert len(llm) == 1 and "ligne 3" in llm[0]
+    assert store.get_summary_cursor(mid="m1") != STREAM_START
+
+
+def test_llm_failure_keeps_summary_and_cursor(store, monkeypatch):
+    monkeypatch.setattr(live_summary, "ask_mistral", lambda prompt, temperature=0.2: None)
+    summarizer = LiveSummarizer("m1")
+    _append(store, summarizer, 2)
+
+    assert not summarizer.update()
+    assert store.get_summary(mid="m1") == ""
+    assert store.get_summary_cursor(mid="m1") == STREAM_START
+    assert summarizer._pending_chunks() == 2
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+import meeting_manager
+from meeting_store import MemoryMeetingStore, set_meeting_store
+
+
+@pytest.fixture
+def store():
+    store = MemoryMeetingStore()
+    set_meeting_store(store)
+    yield store
+    set_meeting_store(None)
+
+
+def test_stopping_an_older_meeting_leaves_current_metadata_alone(store):
+    meeting_manager.start_meeting("en", "fr", meeting_id="m1")
+    meeting_manager.start_meeting("en", "fr", meeting_id="m2")
+
+    report = meeting_manager.stop_meeting("m1")
+
+    assert store.load_meeting("m1")["end"] == report["ended_at"]
+    assert store.load_meeting("m2")["end"] is None
+    assert store.load_current_meeting()["end"] is None
+
+
+def test_stopping_the_current_meeting_updates_current_metadata(store):
+    meeting_manager.start_meeting("en", "fr", meeting_id="m1")
+
+    report = meeting_manager.stop_meeting("m1")
+
+    assert store.load_current_meeting()["end"] == report["ended_at"]
+
+
+def test_chunk_time_prefers_stored_start():
+    chunk = {"id": "0-1", "start": 65.4}
+    assert meeting_manager.chunk_time(chunk, "2024-05-02T10:00:00") == "10:01:05"
+    assert meeting_manager.chunk_time({"id": "0-1"}, "2024-05-02T10:00:00") == meeting_manager.chunk_time(
+        {"id": "0-1", "start": 3.0})
+
+
+@pytest.mark.parametrize("cursor", ["abc", "12", "12-", "-3", "1-2-3", "0-0 ", "../x"])
+def test_export_rejects_malformed_cursor(store, cursor):
+    with pytest.raises(ValueError):
+        asyncio.run(meeting_manager.export_transcript_page("m1", cursor))
+    with pytest.raises(ValueError):
+        asyncio.run(anext(meeting_manager.iter_export_ndjson("m1", cursor)))
+
+
+def test_export_page_accepts_chunk_id_cursor(store):
+    ids = [store.append_chunk(f"t{i}", None, mid="m1") for i in range(3)]
+    page = asyncio.run(meeting_manager.export_transcript_page("m1", ids[0], limit=10))
+    assert [c["id"] for c in page["chunks"]] == ids[1:]
+    assert page["next_cursor"] is None
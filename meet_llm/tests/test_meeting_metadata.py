@@ -0,0 +1,82 @@
+import json
+import os
+
+import pytest
+
+from meeting_metadata import MeetingMetadataStore, empty_meeting, write_json_atomic
+
+
+def _external_write(path, data):
+    """Écriture par un autre process : mtime forcé dans le futur pour ne pas dépendre de sa résolution."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_update_writes_through_and_keeps_other_fields(tmp_path):
+    path = str(tmp_path / "current_meeting.json")
+    store = MeetingMetadataStore(path)
+
+    store.update(meet_link="https://meet/x", participants=["a@x"])
+    meeting = store.update(start="2024-05-02T10:00:00", meet_link=None)
+
+    assert meeting["meet_link"] == "https://meet/x" and meeting["participants"] == ["a@x"]
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == meeting
+    assert MeetingMetadataStore(path).load() == meeting
+    assert [name for name in os.listdir(tmp_path)] == ["current_meeting.json"]
+
+
+def test_update_rejects_unknown_fields(tmp_path):
+    with pytest.raises(ValueError):
+        MeetingMetadataStore(str(tmp_path / "m.json")).update(title="x")
+
+
+def test_load_returns_copies(tmp_path):
+    store = MeetingMetadataStore(str(tmp_path / "m.json"))
+    store.update(participants=["a@x"])
+    store.load()["participants"].append("b@x")
+    assert store.load()["participants"] == ["a@x"]
+
+
+def test_external_change_is_picked_up_on_mtime_change(tmp_path):
+    path = str(tmp_path / "m.json")
+    store = MeetingMetadataStore(path, check_interval=0)
+    store.update(meet_link="https://meet/old")
+    version = store.version
+
+    assert store.load()["meet_link"] == "https://meet/old"
+    assert store.version == version  # mtime inchangé : pas de relecture
+
+    _external_write(path, {"meet_link": "https://meet/new"})
+    assert store.load()["meet_link"] == "https://meet/new"
+    assert store.version == version + 1
+
+
+def test_file_is_not_restated_within_check_interval(tmp_path):
+    path = str(tmp_path / "m.json")
+    store = MeetingMetadataStore(path, check_interval=3600)
+    store.update(meet_link="https://meet/old")
+
+    _external_write(path, {"meet_link": "https://meet/new"})
+    assert store.load()["meet_link"] == "https://meet/old"
+    # une écriture force la relecture : le champ externe n'est pas écrasé
+    assert store.update(start="s")["meet_link"] == "https://meet/new"
+
+
+def test_missing_or_corrupt_file_reads_as_empty(tmp_path):
+    path = tmp_path / "m.json"
+    assert MeetingMetadataStore(str(path)).load() == empty_meeting()
+    path.write_text("{not json")
+    assert MeetingMetadataStore(str(path)).load() == empty_meeting()
+
+
+def test_write_json_atomic_leaves_old_file_on_error(tmp_path):
+    path = str(tmp_path / "data.json")
+    write_json_atomic(path, {"a": 1})
+    with pytest.raises(TypeError):
+        write_json_atomic(path, {"a": object()})
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == {"a": 1}
+    assert os.listdir(tmp_path) == ["data.json"]
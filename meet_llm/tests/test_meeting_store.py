@@ -0,0 +1,152 @@
+import json
+import uuid
+
+import pytest
+
+from meeting_store import (
+    DEFAULT_MEETING_ID,
+    STREAM_START,
+    FileMeetingStore,
+    MeetingStore,
+    MemoryMeetingStore,
+    RedisMeetingStore,
+    is_meeting_id,
+)
+
+
+@pytest.fixture(params=["memory", "file"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryMeetingStore()
+    return FileMeetingStore(str(tmp_path / "meetings"), str(tmp_path / "current_meeting.json"))
+
+
+def test_interface_is_abstract():
+    with pytest.raises(TypeError):
+        MeetingStore()
+
+    class Partial(MeetingStore):
+        def get_meeting_id(self):
+            return "m"
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_backends_implement_the_whole_interface():
+    for cls in (MemoryMeetingStore, FileMeetingStore, RedisMeetingStore):
+        assert not cls.__abstractmethods__
+
+
+def test_chunk_ids_increase_and_meta_is_kept(store):
+    ids = [store.append_chunk(f"t{i}", f"tr{i}", mid="m1", meta={"start": float(i)}) for i in range(5)]
+
+    assert ids == sorted(ids, key=lambda c: tuple(map(int, c.split("-"))))
+    assert len(set(ids)) == 5
+    chunks = store.get_all_chunks(mid="m1")
+    assert [c["text"] for c in chunks] == [f"t{i}" for i in range(5)]
+    assert chunks[2] == {"id": ids[2], "text": "t2", "translated": "tr2", "start": 2.0}
+    assert store.get_chunk_count(mid="m1") == 5
+    assert store.get_chunk_count(mid="m2") == 0
+
+
+def test_reads_since_cursor_and_last_chunks(store):
+    ids = [store.append_chunk(f"t{i}", None, mid="m1") for i in range(5)]
+
+    assert [c["id"] for c in store.get_chunks_since(ids[1], mid="m1")] == ids[2:]
+    assert [c["id"] for c in store.get_chunks_since(ids[1], count=2, mid="m1")] == ids[2:4]
+    assert [c["id"] for c in store.get_last_chunks(2, mid="m1")] == ids[3:]
+    assert store.get_last_chunks(0, mid="m1") == []
+
+
+def test_pages_cover_every_chunk_once(store):
+    ids = [store.append_chunk(f"t{i}", None, mid="m1") for i in range(7)]
+
+    chunks, cursor = store.get_chunks_page(count=3, mid="m1")
+    assert [c["id"] for c in chunks] == ids[:3] and cursor == ids[2]
+    assert [c["id"] for c in store.iter_chunks(page_size=3, mid="m1")] == ids
+
+
+def test_mid_none_targets_current_meeting(store):
+    store.set_current_meeting_id("m2")
+    store.append_chunk("hello", None)
+    store.set_summary("résumé")
+
+    assert store.get_meeting_id() == "m2"
+    assert [c["text"] for c in store.get_all_chunks(mid="m2")] == ["hello"]
+    assert store.get_summary(mid="m2") == "résumé"
+
+
+def test_reset_bumps_epoch_and_keeps_ids_increasing(store):
+    first = store.append_chunk("a", None, mid="m1")
+    store.set_summary("s", mid="m1")
+    store.set_summary_cursor(first, mid="m1")
+    store.add_action_item("do it", mid="m1")
+    store.save_meeting("m1", start="2024-05-02T10:00:00")
+
+    store.reset_meeting_memory("m1")
+
+    assert store.get_all_chunks(mid="m1") == []
+    assert store.get_summary(mid="m1") == ""
+    assert store.get_action_items(mid="m1") == []
+    assert store.get_live_counters(mid="m1") == (1, "", STREAM_START)
+    assert store.load_meeting("m1")["start"] == "2024-05-02T10:00:00"
+    second = store.append_chunk("b", None, mid="m1")
+    assert tuple(map(int, second.split("-"))) > tuple(map(int, first.split("-")))
+
+
+def test_meeting_info_and_index(store):
+    store.register_meeting("m1", "2024-05-02T10:00:00")
+    store.save_meeting("m1", meet_link="https://meet/x")
+    store.save_meeting("m1", end="2024-05-02T11:00:00")
+
+    info = store.load_meeting("m1")
+    assert (info["id"], info["meet_link"], info["end"]) == ("m1", "https://meet/x", "2024-05-02T11:00:00")
+    assert store.list_meetings() == {"m1": "2024-05-02T10:00:00"}
+
+
+def test_file_store_reloads_from_disk(tmp_path):
+    args = (str(tmp_path / "meetings"), str(tmp_path / "current_meeting.json"))
+    store = FileMeetingStore(*args)
+    store.set_current_meeting_id("m1")
+    store.register_meeting("m1", "2024-05-02T10:00:00")
+    chunk_id = store.append_chunk("hello", "bonjour", meta={"start": 1.5})
+    store.set_summary_cursor(chunk_id)
+
+    reloaded = FileMeetingStore(*args)
+    assert reloaded.get_meeting_id() == "m1"
+    assert reloaded.get_all_chunks() == [{"text": "hello", "translated": "bonjour", "start": 1.5, "id": chunk_id}]
+    assert reloaded.get_summary_cursor() == chunk_id
+    assert reloaded.list_meetings() == {"m1": "2024-05-02T10:00:00"}
+
+
+@pytest.mark.parametrize("mid", ["..", "../x", "/tmp/x", "a/b", "x" * 65, "m1\n"])
+def test_file_store_rejects_unsafe_meeting_ids(tmp_path, mid):
+    store = FileMeetingStore(str(tmp_path / "meetings"), str(tmp_path / "current_meeting.json"))
+    with pytest.raises(ValueError):
+        store.append_chunk("hello", None, mid=mid)
+    assert not (tmp_path / "x").exists()
+
+
+def test_meeting_id_accepts_generated_ids():
+    assert is_meeting_id(uuid.uuid4().hex[:12])
+    assert is_meeting_id(str(uuid.uuid4()))
+    assert is_meeting_id(DEFAULT_MEETING_ID)
+
+
+def test_redis_store_migrates_legacy_list_before_stream_chunks():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    store = RedisMeetingStore(fakeredis.FakeRedis(server=server, decode_responses=True),
+                              fakeredis.FakeRedis(server=server))
+    store.r.rpush("meeting:m1:raw", json.dumps({"text": "old 1", "translated": "vieux 1"}),
+                  json.dumps({"text": "old 2", "translated": None}))
+    # chunk écrit par la nouvelle version avant la première lecture
+    store.r.xadd("meeting:m1:chunks", {"data": json.dumps({"text": "new", "translated": None})})
+
+    chunks = store.get_all_chunks(mid="m1")
+
+    assert [c["text"] for c in chunks] == ["old 1", "old 2", "new"]
+    assert [c["id"] for c in chunks[:2]] == ["0-1", "0-2"]
+    assert not store.r.exists("meeting:m1:raw")
+    assert store.get_chunk_count(mid="m1") == 3
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+import mistral_async
+from mistral_async import AsyncMistralClient, MistralUnavailable, TokenBucket, _retry_after
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def _completion(text="ok"):
+    return {
+        "id": "cmpl-1", "object": "chat.completion", "model": "mistral-small-latest", "created": 0,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+
+
+class _Api:
+    """Faux serveur Mistral : rejoue `responses` puis répond 200 ; note les heures d'appel."""
+
+    def __init__(self, responses=(), delay=0.0):
+        self.responses = list(responses)
+        self.delay = delay
+        self.calls = []
+        self.in_flight = self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request):
+        self.calls.append(time.monotonic())
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.responses:
+                status, headers = self.responses.pop(0)
+                return httpx.Response(status, headers=headers, json={"message": "error"})
+            return httpx.Response(200, json=_completion(json.loads(request.content)["messages"][0]["content"]))
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    """Limites rapides pour les tests (lues à la création du client)."""
+    def set_limits(**values):
+        defaults = dict(MISTRAL_MAX_IN_FLIGHT=4, MISTRAL_RATE_PER_SEC=0, MISTRAL_BURST=4,
+                        MISTRAL_MAX_RETRIES=3, MISTRAL_BACKOFF_BASE=0.01, MISTRAL_BACKOFF_MAX=0.05)
+        for name, value in {**defaults, **values}.items():
+            monkeypatch.setattr(mistral_async, name, value)
+    set_limits()
+    return set_limits
+
+
+def _chat(api, n=1):
+    async def run():
+        client = AsyncMistralClient(httpx.MockTransport(api))
+        results = await asyncio.gather(*(client.chat("mistral-small-latest", MESSAGES) for _ in range(n)),
+                                       return_exceptions=True)
+        return client, results
+    return asyncio.run(run())
+
+
+def test_token_bucket_allows_burst_then_refills_at_rate():
+    async def run():
+        bucket = TokenBucket(rate=20, burst=2)
+        start = time.monotonic()
+        stamps = []
+        for _ in range(5):
+            await bucket.acquire()
+            stamps.append(time.monotonic() - start)
+        return stamps
+
+    stamps = asyncio.run(run())
+    assert stamps[1] < 0.02
+    # ensuite un jeton toutes les 50 ms
+    assert stamps[4] == pytest.approx(3 * 0.05, abs=0.03)
+
+
+def test_penalize_empties_the_bucket_for_the_given_time():
+    async def run():
+        bucket = TokenBucket(rate=10, burst=5)
+        bucket.penalize(0.2)
+        start = time.monotonic()
+        await bucket.acquire()
+        return time.monotonic() - start
+
+    # 1 - 0.2 * 10 = -1 jeton : il en faut 2 pour repasser à 1, soit 0.2 s
+    assert asyncio.run(run()) == pytest.approx(0.2, abs=0.05)
+
+
+def test_retry_after_seconds_and_http_date():
+    class Err:
+        def __init__(self, value):
+            self.response = httpx.Response(429, headers={"Retry-After": value})
+
+    assert _retry_after(Err("3")) == 3.0
+    date = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 10))
+    assert 8 <= _retry_after(Err(date)) <= 10
+    assert _retry_after(Err("soon")) is None
+    assert _retry_after(ValueError()) is None
+
+
+def test_transient_errors_are_retried_with_backoff(limits):
+    api = _Api([(503, {}), (502, {})])
+    client, (result,) = _chat(api)
+
+    assert result.choices[0].message.content == "hi"
+    assert len(api.calls) == 3
+    assert client.stats()["retries"] == 2 and client.stats()["failures"] == 0
+    # backoff avec jitter : entre cap/2 et cap (cap = base * 2^tentative, borné à BACKOFF_MAX)
+    assert api.calls[1] - api.calls[0] >= 0.005
+    assert api.calls[2] - api.calls[1] >= 0.01
+
+
+def test_retry_after_header_overrides_backoff(limits):
+    limits(MISTRAL_BACKOFF_BASE=5, MISTRAL_BACKOFF_MAX=5)
+    api = _Api([(503, {"Retry-After": "0.2"})])
+    _, (result,) = _chat(api)
+
+    assert result.choices[0].message.content == "hi"
+    assert api.calls[1] - api.calls[0] == pytest.approx(0.2, abs=0.1)
+
+
+def test_rate_limit_penalizes_the_shared_bucket(limits):
+    limits(MISTRAL_RATE_PER_SEC=10, MISTRAL_BURST=5)
+    api = _Api([(429, {"Retry-After": "0.3"})])
+    _, (result,) = _chat(api)
+
+    assert result.choices[0].message.content == "hi"
+    # attente imposée par le bucket (0.3 s + le temps de refaire un jeton), pas par un sleep
+    assert api.calls[1] - api.calls[0] >= 0.3
+
+
+def test_gives_up_after_max_retries(limits):
+    limits(MISTRAL_MAX_RETRIES=2)
+    api = _Api([(503, {})] * 5)
+    client, (result,) = _chat(api)
+
+    assert isinstance(result, MistralUnavailable)
+    assert len(api.calls) == 3
+    assert client.stats()["failures"] == 1
+
+
+def test_client_errors_are_not_retried(limits):
+    api = _Api([(400, {})])
+    _, (result,) = _chat(api)
+
+    assert isinstance(result, MistralUnavailable)
+    assert len(api.calls) == 1
+
+
+def test_semaphore_limits_requests_in_flight(limits):
+    limits(MISTRAL_MAX_IN_FLIGHT=2)
+    api = _Api(delay=0.05)
+    client, results = _chat(api, n=6)
+
+    assert all(r.choices[0].message.content == "hi" for r in results)
+    assert api.max_in_flight == 2
+    assert client.stats()["in_flight"] == 0
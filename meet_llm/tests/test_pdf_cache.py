@@ -0,0 +1,124 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+import pdf_cache
+from meeting_store import MemoryMeetingStore, set_meeting_store
+from pdf_cache import PdfCache, transcript_version
+
+
+@pytest.fixture
+def store():
+    store = MemoryMeetingStore()
+    set_meeting_store(store)
+    yield store
+    set_meeting_store(None)
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """build_summary_pdf factice : compte les rendus, écrit des octets reconnaissables."""
+    calls = []
+
+    def fake_build(meeting_id, output=None):
+        calls.append(meeting_id)
+        time.sleep(0.05)
+        data = f"%PDF {meeting_id} #{len(calls)}".encode()
+        if output is None:
+            return data
+        with open(output, "wb") as f:
+            f.write(data)
+
+    monkeypatch.setattr(pdf_cache, "build_summary_pdf", fake_build)
+    return calls
+
+
+def _version(mid="m1"):
+    return asyncio.run(transcript_version(mid))
+
+
+def test_version_changes_with_everything_in_the_pdf(store):
+    versions = [_version()]
+    chunk_id = store.append_chunk("hello", None, mid="m1")
+    versions.append(_version())
+    store.set_summary_cursor(chunk_id, mid="m1")
+    versions.append(_version())
+    store.add_action_item("send notes", mid="m1")
+    versions.append(_version())
+    store.save_meeting("m1", end="2024-05-02T11:00:00")
+    versions.append(_version())
+    store.reset_meeting_memory("m1")
+    versions.append(_version())
+
+    assert len(set(versions)) == len(versions)
+    assert _version() == versions[-1]
+    # la version ne dépend que du contenu : une autre réunion vide a celle du départ
+    assert _version("m2") == versions[0]
+
+
+def test_second_request_is_a_cache_hit(store, renders, tmp_path):
+    cache = PdfCache(str(tmp_path))
+    store.append_chunk("hello", None, mid="m1")
+
+    path, status = asyncio.run(cache.get_or_render("m1"))
+    again, _ = asyncio.run(cache.get_or_render("m1"))
+
+    assert status == "ready" and again == path and os.path.dirname(path) == str(tmp_path)
+    assert renders == ["m1"]
+    assert (cache.stats()["renders"], cache.stats()["hits"]) == (1, 1)
+    # un autre process (même dossier) retrouve le fichier sans re-rendre
+    assert asyncio.run(PdfCache(str(tmp_path)).get_or_render("m1"))[0] == path
+    assert renders == ["m1"]
+
+
+def test_new_chunk_renders_again_and_old_files_are_pruned(store, renders, tmp_path):
+    cache = PdfCache(str(tmp_path))
+    for i in range(4):
+        store.append_chunk(f"t{i}", None, mid="m1")
+        asyncio.run(cache.get_or_render("m1"))
+    store.append_chunk("other", None, mid="m1-b")
+    asyncio.run(cache.get_or_render("m1-b"))
+
+    assert len(renders) == 5
+    files = sorted(os.listdir(tmp_path))
+    # 2 rendus gardés pour m1, et celui de "m1-b" n'est pas pris pour un rendu de "m1"
+    assert len([f for f in files if f.startswith("m1-") and f.count("-") == 1]) == 2
+    assert len([f for f in files if f.startswith("m1-b-")]) == 1
+
+
+def test_memory_cache_without_directory(store, renders):
+    cache = PdfCache(None)
+    pdf, _ = asyncio.run(cache.get_or_render("m1"))
+    assert pdf == b"%PDF m1 #1"
+    assert asyncio.run(cache.get_or_render("m1"))[0] == pdf
+    assert renders == ["m1"]
+
+
+def test_concurrent_requests_render_a_version_once(store, renders, tmp_path):
+    cache = PdfCache(str(tmp_path))
+    version = _version()
+    start = threading.Barrier(8)
+    jobs = []
+
+    def request():
+        start.wait()
+        jobs.append(cache.render("m1", version))
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len({id(job) for job in jobs}) == 1
+    jobs[0].result(timeout=5)
+    assert renders == ["m1"]
+
+
+@pytest.mark.parametrize("mid", ["..", "../etc/passwd", "/tmp/x", "a/b"])
+def test_unsafe_meeting_id_is_rejected(tmp_path, mid):
+    with pytest.raises(ValueError):
+        PdfCache(str(tmp_path))._path(mid, "v")
@@ -0,0 +1,118 @@
+import random
+import threading
+import time
+
+import pytest
+
+from pipeline import BoundedQueue, Pipeline, Stage
+
+
+def _collector():
+    out, lock = [], threading.Lock()
+
+    def persist(item):
+        with lock:
+            out.append(item)
+        return item
+
+    return out, persist
+
+
+def _slow_identity(item):
+    time.sleep(random.uniform(0, 0.01))
+    return item
+
+
+def _merge(a, b):
+    return a + b
+
+
+def _run(stages, items):
+    pipeline = Pipeline(stages)
+    pipeline.start()
+    for item in items:
+        pipeline.put(item)
+    pipeline.stop(drain_timeout=10)
+    return pipeline
+
+
+def test_last_stage_gets_capture_order_with_parallel_workers():
+    out, persist = _collector()
+    _run([
+        Stage("asr", _slow_identity, workers=3, maxsize=100),
+        Stage("translation", _slow_identity, workers=3, maxsize=100),
+        Stage("persistence", persist, workers=1, maxsize=100),
+    ], [[i] for i in range(60)])
+    assert out == [[i] for i in range(60)]
+
+
+def test_coalescing_stage_merges_in_capture_order():
+    out, persist = _collector()
+    _run([
+        Stage("asr", _slow_identity, workers=3, maxsize=100),
+        # petite file qui fusionne : les fusions doivent garder l'ordre de capture
+        Stage("translation", _slow_identity, workers=1, maxsize=1, policy="coalesce", coalesce=_merge),
+        Stage("persistence", persist, workers=1, maxsize=100),
+    ], [[i] for i in range(60)])
+    flat = [i for item in out for i in item]
+    assert flat == list(range(60))
+
+
+def test_dropped_items_do_not_block_ordering():
+    out, persist = _collector()
+
+    def drop_odd(item):
+        time.sleep(random.uniform(0, 0.005))
+        return None if item[0] % 2 else item
+
+    _run([
+        Stage("asr", drop_odd, workers=3, maxsize=100),
+        Stage("translation", _slow_identity, workers=2, maxsize=100, policy="coalesce", coalesce=_merge),
+        Stage("persistence", persist, workers=1, maxsize=100),
+    ], [[i] for i in range(40)])
+    flat = [i for item in out for i in item]
+    assert flat == list(range(0, 40, 2))
+
+
+def test_stage_coalesce_orders_payloads_by_sequence():
+    from pipeline import _Job
+
+    stage = Stage("translation", _slow_identity, policy="coalesce", coalesce=_merge)
+    later, earlier = _Job([5], ["b"], 2.0), _Job([4], ["a"], 1.0)
+    merged = stage._coalesce_jobs(later, earlier)
+    assert merged.payload == ["a", "b"]
+    assert merged.seqs == [4, 5]
+    assert merged.created == 1.0
+
+
+def test_bounded_queue_policies():
+    q = BoundedQueue(2, "drop_oldest")
+    for i in range(4):
+        q.put(i)
+    assert [q.get(0), q.get(0)] == [2, 3]
+    assert q.dropped == 2
+
+    q = BoundedQueue(2, "coalesce", coalesce=lambda a, b: a + b)
+    for i in range(4):
+        q.put([i])
+    assert [q.get(0), q.get(0)] == [[0], [1, 2, 3]]
+    assert q.coalesced == 2
+
+    with pytest.raises(ValueError):
+        BoundedQueue(2, "coalesce")
+
+
+def test_capture_order_holds_under_contention_with_small_queues():
+    out, persist = _collector()
+
+    def jitter(item):
+        if random.random() < 0.3:
+            time.sleep(random.uniform(0, 0.002))
+        return item
+
+    _run([
+        Stage("asr", jitter, workers=4, maxsize=4),
+        Stage("translation", jitter, workers=4, maxsize=4),
+        Stage("persistence", persist, workers=1, maxsize=4),
+    ], [[i] for i in range(2000)])
+    assert out == [[i] for i in range(2000)]
@@ -0,0 +1,36 @@
+import numpy as np
+
+from recorder import RingBuffer, resample_to_asr, ASR_SAMPLERATE
+
+
+def _ramp(start, end):
+    return np.arange(start, end, dtype=np.float32)
+
+
+def test_ring_buffer_reads_absolute_ranges():
+    ring = RingBuffer(8)
+    ring.write(_ramp(0, 5))
+    ring.write(_ramp(5, 11))  # wraps around
+    np.testing.assert_array_equal(ring.read(4, 11), _ramp(4, 11))
+
+
+def test_ring_buffer_write_larger_than_capacity_stays_aligned():
+    ring = RingBuffer(10)
+    ring.write(_ramp(0, 3))
+    ring.write(_ramp(3, 15))  # n >= capacity
+    np.testing.assert_array_equal(ring.read(10, 15), _ramp(10, 15))
+    ring.write(_ramp(15, 18))
+    np.testing.assert_array_equal(ring.read(8, 18), _ramp(8, 18))
+
+
+def test_ring_buffer_overrun_skips_lost_samples():
+    ring = RingBuffer(4)
+    ring.write(_ramp(0, 3))
+    ring.write(_ramp(3, 7))
+    np.testing.assert_array_equal(ring.read(0, 7), _ramp(3, 7))
+
+
+def test_resample_to_asr_length():
+    audio = np.zeros(48000, dtype=np.float32)
+    assert len(resample_to_asr(audio, 48000)) == ASR_SAMPLERATE
+    assert len(resample_to_asr(audio[:ASR_SAMPLERATE], ASR_SAMPLERATE)) == ASR_SAMPLERATE
@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+import retrieval
+from meeting_store import MemoryMeetingStore, set_meeting_store
+from retrieval import BM25Index, MeetingIndex, tokenize
+
+
+@pytest.fixture
+def store():
+    store = MemoryMeetingStore()
+    set_meeting_store(store)
+    yield store
+    set_meeting_store(None)
+
+
+def _fill(store, texts, mid="m1"):
+    for text in texts:
+        store.append_chunk(text, None, mid=mid)
+
+
+def test_tokenize_folds_accents_and_drops_stopwords():
+    assert tokenize("La Réunion est à 10h") == ["reunion", "10h"]
+
+
+def test_bm25_ranks_matching_document_first():
+    index = BM25Index()
+    for text in ("budget review for Q3", "lunch plans", "budget budget budget"):
+        index.add(text)
+    scores = index.scores("budget")
+    assert set(scores) == {0, 2}
+    assert scores[2] > scores[0]
+
+
+def test_search_returns_top_chunks_in_chronological_order(store):
+    _fill(store, ["the budget is late", "weather talk", "hiring plan", "budget approved"])
+    index = MeetingIndex("m1", use_embeddings=False)
+    results = index.search("budget", k=2)
+    assert [c["text"] for c in results] == ["the budget is late", "budget approved"]
+    assert index.search("budget", k=2, exclude_ids={results[0]["id"]})[0]["text"] == "budget approved"
+
+
+def test_embeddings_are_batched_outside_the_lock(store, monkeypatch):
+    _fill(store, [f"chunk number {i}" for i in range(10)])
+    index = MeetingIndex("m1", use_embeddings=True, embed_batch_size=4)
+    batches = []
+
+    def fake_embed(texts):
+        # add() (étape de persistance) doit pouvoir prendre le verrou pendant l'appel réseau
+        free = []
+        t = threading.Thread(target=lambda: free.append(index._lock.acquire(timeout=0)))
+        t.start()
+        t.join()
+        if free[0]:
+            index._lock.release()
+        batches.append((len(texts), free[0]))
+        return [[1.0, float(len(t))] for t in texts]
+
+    monkeypatch.setattr(retrieval, "embed_texts", fake_embed)
+    index.search("chunk", k=3)
+
+    assert batches == [(1, True), (4, True), (4, True), (2, True)]
+    assert all(v is not None for v in index._vectors)
+
+
+def test_embedding_failure_falls_back_to_bm25(store, monkeypatch):
+    _fill(store, ["budget approved", "lunch"])
+    index = MeetingIndex("m1", use_embeddings=True)
+    monkeypatch.setattr(retrieval, "embed_texts", lambda texts: None)
+    assert [c["text"] for c in index.search("budget")] == ["budget approved"]
@@ -0,0 +1,64 @@
+import numpy as np
+
+from segmenter import EnergySegmenter, frame_rms
+
+SR = 16000
+FRAME = 480  # 30 ms
+
+
+def _tone(seconds, level=0.1):
+    return np.full(int(seconds * SR), level, dtype=np.float32)
+
+
+def _silence(seconds):
+    return np.zeros(int(seconds * SR), dtype=np.float32)
+
+
+def test_frame_rms_ignores_trailing_partial_frame():
+    audio = np.concatenate((np.full(480, 0.5), np.zeros(480), np.ones(100))).astype(np.float32)
+    assert np.allclose(frame_rms(audio, 480), [0.5, 0.0])
+    assert len(frame_rms(audio[:100], 480)) == 0
+
+
+def test_segment_closed_at_pause_with_preroll_and_trimmed_tail():
+    seg = EnergySegmenter(min_seconds=1.0, silence_seconds=0.6, pre_roll_seconds=0.3)
+    out = seg.feed(np.concatenate((_silence(2.0), _tone(1.5), _silence(1.5))))
+
+    assert len(out) == 1
+    # 0.3 s de pre-roll + 1.5 s de parole + la pause (0.6 s), à une trame près
+    assert abs(len(out[0]) - 2.4 * SR) <= FRAME
+    assert seg.flush() is None
+
+
+def test_short_utterance_waits_for_min_seconds():
+    seg = EnergySegmenter(min_seconds=2.0, silence_seconds=0.3)
+    assert seg.feed(np.concatenate((_tone(0.5), _silence(0.5)))) == []
+    out = seg.feed(np.concatenate((_tone(1.5), _silence(0.5))))
+    assert len(out) == 1 and len(out[0]) / SR >= 2.0
+
+
+def test_continuous_speech_is_cut_at_max_seconds():
+    seg = EnergySegmenter(max_seconds=5.0)
+    out = seg.feed(_tone(12.0))
+    # coupé à la première trame complète au-delà de 5 s
+    assert [len(s) for s in out] == [-(-5 * SR // FRAME) * FRAME] * 2
+    assert len(seg.flush()) / SR >= 1.9
+
+
+def test_feeding_in_small_blocks_matches_one_shot():
+    audio = np.concatenate((_silence(1.0), _tone(2.5), _silence(1.0), _tone(3.0), _silence(1.0)))
+    one_shot = EnergySegmenter().feed(audio)
+
+    seg = EnergySegmenter()
+    streamed = []
+    for i in range(0, len(audio), 1234):
+        streamed += seg.feed(audio[i:i + 1234])
+
+    assert [len(s) for s in streamed] == [len(s) for s in one_shot]
+    assert all(np.array_equal(a, b) for a, b in zip(streamed, one_shot))
+
+
+def test_silence_only_is_dropped():
+    seg = EnergySegmenter()
+    assert seg.feed(_silence(30.0)) == []
+    assert seg.flush() is None
@@ -0,0 +1,50 @@
+import numpy as np
+
+from recorder import ASR_SAMPLERATE
+from speech_gate import SpeechGate
+
+
+class _EnergyVad:
+    """VAD de test : une trame est "parlée" si son amplitude dépasse un seuil."""
+
+    def is_speech(self, frame: bytes, samplerate: int) -> bool:
+        return np.abs(np.frombuffer(frame, dtype=np.int16)).max() > 3000
+
+
+def _audio(seconds, speech_seconds=0.0, level=0.3):
+    audio = np.zeros(int(seconds * ASR_SAMPLERATE), dtype=np.float32)
+    audio[:int(speech_seconds * ASR_SAMPLERATE)] = level
+    return audio
+
+
+def test_rms_gate():
+    gate = SpeechGate(rms_threshold=0.01)
+    assert not gate.has_speech(_audio(2))
+    assert gate.has_speech(_audio(2, 0.5))
+    assert gate.stats()["skipped"] == 1
+
+
+def test_vad_ratio_is_measured_over_loud_frames():
+    # 1 s de parole dans 20 s : toutes les trames fortes sont parlées => chunk gardé
+    gate = SpeechGate(rms_threshold=0.01, min_speech_ratio=0.5)
+    gate._vad = _EnergyVad()
+    assert gate.has_speech(_audio(20, 1.0))
+
+
+def test_vad_rejects_loud_noise():
+    gate = SpeechGate(rms_threshold=0.01, min_speech_ratio=0.5)
+    gate._vad = _EnergyVad()
+    # fort pour le RMS, mais sous le seuil du VAD de test
+    assert not gate.has_speech(_audio(5, 5, level=0.05))
+
+
+def test_keep_segments_drops_likely_silence():
+    gate = SpeechGate(max_no_speech_prob=0.6)
+    segments = [
+        {"text": "hello", "no_speech_prob": 0.1},
+        {"text": "uh", "no_speech_prob": 0.9},
+        {"text": "", "no_speech_prob": 0.0},
+        {"text": "world", "no_speech_prob": None},
+    ]
+    assert [s["text"] for s in gate.keep_segments(segments)] == ["hello", "world"]
+    assert gate.stats()["segments_dropped"] == 1
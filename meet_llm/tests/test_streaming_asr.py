@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+import streaming_asr
+from speech_gate import SpeechGate
+from streaming_asr import StreamingTranscriber
+
+SR = 16000
+
+
+class _FakePool:
+    """Faux Whisper : chaque plage non nulle de la fenêtre devient un segment "w<niveau>"."""
+
+    def __init__(self):
+        self.decoded = []  # durée (s) de chaque fenêtre décodée
+
+    def transcribe(self, audio, **options):
+        self.decoded.append(len(audio) / SR)
+        loud = np.abs(audio) > 0.005
+        segments, i = [], 0
+        while i < len(audio):
+            if not loud[i]:
+                i += 1
+                continue
+            j = i
+            while j < len(audio) and loud[j]:
+                j += 1
+            segments.append({"start": i / SR, "end": j / SR, "text": f"w{round(audio[i] * 100)}",
+                             "no_speech_prob": 0.0, "avg_logprob": -0.1})
+            i = j
+        return " ".join(s["text"] for s in segments), 0.0, segments
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = _FakePool()
+    monkeypatch.setattr(streaming_asr, "get_asr_pool", lambda: pool)
+    return pool
+
+
+def _word(level, seconds=0.5):
+    return np.full(int(seconds * SR), level / 100, dtype=np.float32)
+
+
+def _silence(seconds):
+    return np.zeros(int(seconds * SR), dtype=np.float32)
+
+
+def _feed(transcriber, audio, block=SR // 2):
+    committed, partial = [], ""
+    for i in range(0, len(audio), block):
+        c, partial = transcriber.feed(audio[i:i + block])
+        committed += c
+    return committed, partial
+
+
+def test_decodes_every_step_and_commits_only_stable_segments(pool):
+    t = StreamingTranscriber(step_seconds=1.0, commit_margin_seconds=1.0)
+    committed, partial = _feed(t, np.concatenate((_word(10), _silence(0.5), _word(20), _silence(0.5))))
+
+    # 2 s d'audio, un décodage par seconde ; w10 finit 1.5 s avant la fin, w20 est le dernier
+    assert pool.decoded == [1.0, 2.0]
+    assert [(s["text"], s["start"], s["end"]) for s in committed] == [("w10", 0.0, 0.5)]
+    assert partial == "w20"
+
+    # l'audio commité quitte la fenêtre, les temps restent ceux du flux
+    committed, partial = _feed(t, np.concatenate((_silence(1.0), _word(30), _silence(1.0))))
+    assert [(s["text"], s["start"], s["end"]) for s in committed] == [("w20", 1.0, 1.5)]
+    assert partial == "w30"
+    assert max(pool.decoded) <= 4.0
+
+
+def test_full_window_is_committed(pool):
+    t = StreamingTranscriber(step_seconds=1.0, max_window_seconds=3.0, commit_margin_seconds=10.0)
+    committed, partial = _feed(t, np.concatenate([np.concatenate((_word(10 + i), _silence(0.5))) for i in range(3)]))
+
+    assert [s["text"] for s in committed] == ["w10", "w11", "w12"]
+    assert committed[2]["start"] == pytest.approx(2.0)
+    assert partial == ""
+    assert max(pool.decoded) <= 3.0
+
+
+def test_flush_commits_the_rest(pool):
+    t = StreamingTranscriber(step_seconds=1.0)
+    _, partial = _feed(t, np.concatenate((_word(10), _silence(0.5))))
+    assert partial == "w10"
+    assert [s["text"] for s in t.flush()] == ["w10"]
+    assert t.partial == "" and t.flush() == []
+
+
+def test_gate_skips_silent_steps_and_keeps_stream_time(pool):
+    t = StreamingTranscriber(step_seconds=1.0, commit_margin_seconds=0.5, gate=SpeechGate(rms_threshold=0.01))
+    _feed(t, _silence(10.0))
+
+    assert pool.decoded == []
+    assert len(t._window) <= StreamingTranscriber.SILENCE_TAIL_SECONDS * SR
+
+    committed, partial = _feed(t, np.concatenate((_word(10), _silence(1.0), _word(20), _silence(1.0))))
+    assert [(s["text"], s["start"]) for s in committed] == [("w10", 10.0)]
+    assert partial == "w20"
+    # la fenêtre décodée ne contient pas les 10 s de silence
+    assert max(pool.decoded) < 4.0
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+import mistral_client
+from translation_cache import TranslationCache, normalize_text
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+def test_normalize_text_ignores_case_and_spacing():
+    assert normalize_text("  Okay.\n\tThanks ") == normalize_text("okay. thanks")
+
+
+def test_key_depends_on_model_and_prompt_version():
+    cache = TranslationCache()
+    assert cache.key("Okay.", "m1") == cache.key(" okay. ", "m1")
+    assert cache.key("Okay.", "m1") != cache.key("Okay.", "m2")
+    assert cache.key("Okay.", "m1") != cache.key("Okay.", "m1", prompt_version="other")
+
+
+def test_lru_evicts_least_recently_used():
+    cache = TranslationCache(max_items=2)
+    cache.put("a", "m", "A")
+    cache.put("b", "m", "B")
+    assert cache.get("a", "m") == "A"
+    cache.put("c", "m", "C")
+
+    assert cache.get("b", "m") is None
+    assert cache.get("a", "m") == "A"
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"]) == (2, 2, 1)
+
+
+def test_redis_level_is_shared_between_caches():
+    redis = _FakeRedis()
+    TranslationCache(redis_conn=redis).put("hello", "m", "bonjour")
+
+    other = TranslationCache(redis_conn=redis)
+    assert other.get("Hello", "m") == "bonjour"
+    assert other.get("hello", "m") == "bonjour"
+    assert (other.stats()["redis_hits"], other.stats()["hits"]) == (1, 1)
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    cache = TranslationCache()
+    monkeypatch.setattr(mistral_client, "get_translation_cache", lambda: cache)
+    return cache
+
+
+def test_translate_batch_sends_each_normalized_text_once(fresh_cache, monkeypatch):
+    prompts = []
+
+    def fake_ask(prompt, temperature=0.0, json_mode=False):
+        prompts.append(prompt)
+        segments = json.loads(prompt.split("Segments :\n", 1)[1])
+        return json.dumps({"translations": [{"id": s["id"], "text": s["text"].upper()} for s in segments]})
+
+    monkeypatch.setattr(mistral_client, "ask_mistral", fake_ask)
+    fresh_cache.put("thanks", mistral_client.MISTRAL_MODEL, "merci")
+
+    out = mistral_client.translate_batch(["Okay.", "yes", " okay. ", "Thanks", "YES"])
+
+    assert len(prompts) == 1
+    sent = [s["text"] for s in json.loads(prompts[0].split("Segments :\n", 1)[1])]
+    assert sent == ["Okay.", "yes"]
+    assert out == ["OKAY.", "YES", "OKAY.", "merci", "YES"]
+
+
+def test_translate_batch_duplicates_of_one_text_use_single_request(fresh_cache, monkeypatch):
+    calls = []
+    monkeypatch.setattr(mistral_client, "translate_and_summarize",
+                        lambda text, target_lang="fr": calls.append(text) or "d'accord")
+
+    assert mistral_client.translate_batch(["Okay.", "okay."]) == ["d'accord", "d'accord"]
+    assert calls == ["Okay."]
+
+
+def test_translate_batch_falls_back_to_sources_for_every_duplicate(fresh_cache, monkeypatch):
+    monkeypatch.setattr(mistral_client, "ask_mistral", lambda *a, **k: None)
+
+    assert mistral_client.translate_batch(["a", "b", "A"]) == ["a", "b", "A"]
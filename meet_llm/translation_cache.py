@@ -0,0 +1,111 @@
+# translation_cache.py
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+from config import TRANSLATION_CACHE_SIZE, TRANSLATION_CACHE_REDIS, TRANSLATION_CACHE_TTL
+
+# À incrémenter dès que le prompt de traduction change : les anciennes entrées sont ignorées
+PROMPT_VERSION = "translate-fr-v1"
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Espaces compactés + casse ignorée : "Okay." et " okay. " partagent la même entrée."""
+    return _WS.sub(" ", text or "").strip().casefold()
+
+
+class TranslationCache:
+    """
+    Cache de traductions adressé par contenu :
+    clé = sha256(texte normalisé + modèle + version du prompt).
+    - niveau 1 : LRU en mémoire (OrderedDict)
+    - niveau 2 (optionnel) : Redis avec TTL, partagé entre process/redémarrages
+    """
+
+    def __init__(self, max_items: int = 2048, redis_conn=None, ttl: int = 7 * 24 * 3600,
+                 prefix: str = "translation_cache"):
+        self.max_items = max_items
+        self.redis = redis_conn
+        self.ttl = ttl
+        self.prefix = prefix
+        self._lru: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def key(self, text: str, model: str, prompt_version: str = PROMPT_VERSION) -> str:
+        raw = f"{prompt_version}\x00{model}\x00{normalize_text(text)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, text: str, model: str, prompt_version: str = PROMPT_VERSION) -> str | None:
+        k = self.key(text, model, prompt_version)
+        with self._lock:
+            if k in self._lru:
+                self._lru.move_to_end(k)
+                self.hits += 1
+                return self._lru[k]
+
+        if self.redis is not None:
+            try:
+                value = self.redis.get(f"{self.prefix}:{k}")
+            except Exception as e:
+                print("[translation_cache] redis get error:", e)
+                value = None
+            if value is not None:
+                self._remember(k, value)
+                with self._lock:
+                    self.redis_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, text: str, model: str, translation: str, prompt_version: str = PROMPT_VERSION):
+        k = self.key(text, model, prompt_version)
+        self._remember(k, translation)
+        if self.redis is not None:
+            try:
+                self.redis.set(f"{self.prefix}:{k}", translation, ex=self.ttl)
+            except Exception as e:
+                print("[translation_cache] redis set error:", e)
+
+    def _remember(self, k: str, value: str):
+        with self._lock:
+            self._lru[k] = value
+            self._lru.move_to_end(k)
+            while len(self._lru) > self.max_items:
+                self._lru.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.redis_hits + self.misses
+            return {
+                "size": len(self._lru),
+                "max_items": self.max_items,
+                "redis": self.redis is not None,
+                "hits": self.hits,
+                "redis_hits": self.redis_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.redis_hits) / lookups, 3) if lookups else 0.0,
+            }
+
+
+_cache: TranslationCache | None = None
+
+
+def get_translation_cache() -> TranslationCache:
+    global _cache
+    if _cache is None:
+        redis_conn = None
+        if TRANSLATION_CACHE_REDIS:
+            try:
+                from redis_client import r as redis_conn
+            except Exception as e:
+                print("[translation_cache] Redis indisponible, cache mémoire seulement:", e)
+        _cache = TranslationCache(TRANSLATION_CACHE_SIZE, redis_conn, TRANSLATION_CACHE_TTL)
+    return _cache